@@ -3,15 +3,21 @@ from .v1.kura import (
     generate_base_clusters_from_conversation_summaries,
     reduce_clusters_from_base_clusters,
     reduce_dimensionality_from_clusters,
+    run_pipeline,
+    assign_new_conversations,
     CheckpointManager,
 )
 from .cluster import ClusterModel
+from .dedup import ConversationDeduplicator
+from .embedding_store import EmbeddingStore
 from .meta_cluster import MetaClusterModel
 from .summarisation import SummaryModel
 from .types import Conversation
 
 __all__ = [
     "ClusterModel",
+    "ConversationDeduplicator",
+    "EmbeddingStore",
     "MetaClusterModel",
     "SummaryModel",
     "Conversation",
@@ -19,5 +25,7 @@ __all__ = [
     "generate_base_clusters_from_conversation_summaries",
     "reduce_clusters_from_base_clusters",
     "reduce_dimensionality_from_clusters",
+    "run_pipeline",
+    "assign_new_conversations",
     "CheckpointManager",
 ]
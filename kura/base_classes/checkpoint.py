@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class BaseCheckpointBackend(ABC):
+    @property
+    @abstractmethod
+    def file_extension(self) -> str:
+        """The file extension used for checkpoints written by this backend."""
+        pass
+
+    @abstractmethod
+    def load(self, path: str, model_class: type[T]) -> list[T]:
+        """Load every record stored at ``path`` as ``model_class`` instances"""
+        pass
+
+    @abstractmethod
+    def save(self, path: str, data: list[T]) -> None:
+        """Overwrite the checkpoint at ``path`` with ``data``"""
+        pass
+
+    @abstractmethod
+    def load_columns(
+        self, path: str, columns: Optional[list[str]] = None
+    ) -> dict[str, Any]:
+        """Load selected columns without building model instances.
+
+        Embedding columns are returned as 2D float32 numpy arrays, every other
+        column as a list of values.
+        """
+        pass
@@ -1,5 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Union
+from typing import TYPE_CHECKING, TypeVar, Union
+
+from kura.types.embedding import EmbeddingMatrix
+from kura.utils.executor import run_in_executor
+
+if TYPE_CHECKING:
+    import numpy as np
 
 T = TypeVar("T")
 
@@ -10,3 +16,62 @@ class BaseClusteringMethod(ABC):
         self, items: list[dict[str, Union[T, list[float]]]]
     ) -> dict[int, list[T]]:
         pass
+
+    async def cluster_async(
+        self, items: list[dict[str, Union[T, list[float]]]]
+    ) -> dict[int, list[T]]:
+        """Run ``cluster`` off the event loop using the active executor.
+
+        The embeddings are stacked into a matrix and passed to
+        ``cluster_matrix``, so the items themselves never leave this process.
+        """
+        if not items:
+            return {}
+        embeddings = EmbeddingMatrix(
+            [item["embedding"] for item in items]  # pyright: ignore
+        )
+        data: list[T] = [item["item"] for item in items]  # pyright: ignore
+        return await self.cluster_matrix(embeddings, data)
+
+    async def cluster_matrix(
+        self, embeddings: EmbeddingMatrix, items: list[T]
+    ) -> dict[int, list[T]]:
+        """Cluster ``items`` given their embeddings as rows of ``embeddings``.
+
+        Only the matrix is sent to the executor, where ``cluster`` groups row
+        numbers instead of the items. The items are grouped here by the
+        returned labels, so they keep their identity even when the executor
+        runs in a process pool. Items that ``cluster`` leaves out of every
+        cluster are dropped. Subclasses that work on a dense matrix can
+        override this to use ``embeddings.vectors`` directly.
+        """
+        from kura.k_means import group_by_label
+
+        if len(embeddings) != len(items):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(items)} items")
+        if not items:
+            return {}
+
+        cluster_ids, labels = await run_in_executor(
+            _label_rows, self, embeddings.vectors
+        )
+        # The extra label collects the rows that are in no cluster
+        groups = group_by_label(labels, items, len(cluster_ids) + 1)
+        return {
+            cluster_id: groups[label] for label, cluster_id in enumerate(cluster_ids)
+        }
+
+
+def _label_rows(
+    method: BaseClusteringMethod, vectors: "np.ndarray"
+) -> tuple[list[int], "np.ndarray"]:
+    """Run ``method.cluster`` on row numbers and return the cluster ids and a label per row."""
+    import numpy as np
+
+    groups = method.cluster(
+        [{"item": row, "embedding": vector} for row, vector in enumerate(vectors)]
+    )
+    labels = np.full(len(vectors), len(groups), dtype=np.int64)
+    for label, rows in enumerate(groups.values()):
+        labels[list(rows)] = label
+    return list(groups), labels
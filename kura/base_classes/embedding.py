@@ -1,8 +1,23 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Sequence, Union
+
+from kura.types.embedding import EmbeddingMatrix
 
 
 class BaseEmbeddingModel(ABC):
     @abstractmethod
-    async def embed(self, texts: list[str]) -> list[list[float]]:
-        """Embed a list of texts into a list of lists of floats"""
+    async def embed(
+        self, texts: list[str]
+    ) -> Union[list[list[float]], EmbeddingMatrix]:
+        """Embed a list of texts into a list of lists of floats or an ``EmbeddingMatrix``"""
         pass
+
+    async def embed_matrix(
+        self, texts: list[str], ids: Optional[Sequence[str]] = None
+    ) -> EmbeddingMatrix:
+        """Embed texts into a float32 ``EmbeddingMatrix`` with one row per text.
+
+        Models that produce arrays natively should override this to skip the
+        round trip through Python lists.
+        """
+        return EmbeddingMatrix.from_embeddings(await self.embed(texts), ids)
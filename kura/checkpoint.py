@@ -0,0 +1,167 @@
+from kura.base_classes import BaseCheckpointBackend
+from pydantic import BaseModel, TypeAdapter
+from typing import Any, Optional, TypeVar
+import importlib.util
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Columns holding dense vectors, stored as fixed-size float32 lists
+EMBEDDING_COLUMNS = {"embedding"}
+
+# Schema metadata key listing columns that were JSON encoded on save
+_JSON_COLUMNS_KEY = b"kura.json_columns"
+
+
+class ParquetCheckpointBackend(BaseCheckpointBackend):
+    """Stores checkpoints as Parquet files using pyarrow.
+
+    Embeddings are written as fixed-size float32 list columns and free-form
+    dictionaries such as ``metadata`` are written as JSON strings. Loading is
+    columnar, so ``load_columns`` can read e.g. ``chat_id`` and ``embedding``
+    without touching the other columns or building pydantic objects.
+    """
+
+    def __init__(self, compression: str = "zstd"):
+        if importlib.util.find_spec("pyarrow") is None:  # type: ignore
+            raise ImportError(
+                "Please install pyarrow to use Parquet checkpoints: pip install pyarrow"
+            )
+        self.compression = compression
+        logger.info(
+            f"Initialized ParquetCheckpointBackend with compression={compression}"
+        )
+
+    @property
+    def file_extension(self) -> str:
+        return ".parquet"
+
+    def save(self, path: str, data: list[T]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        records = [item.model_dump(mode="json") for item in data]
+        column_names = list(records[0].keys()) if records else []
+
+        arrays = []
+        json_columns = []
+        for name in column_names:
+            values = [record.get(name) for record in records]
+            if name in EMBEDDING_COLUMNS:
+                arrays.append(_embedding_array(values))
+            elif any(isinstance(v, dict) for v in values):
+                json_columns.append(name)
+                arrays.append(
+                    pa.array(
+                        [None if v is None else json.dumps(v) for v in values],
+                        type=pa.string(),
+                    )
+                )
+            else:
+                arrays.append(pa.array(values))
+
+        table = pa.Table.from_arrays(arrays, names=column_names)
+        table = table.replace_schema_metadata(
+            {_JSON_COLUMNS_KEY: json.dumps(json_columns).encode()}
+        )
+        pq.write_table(table, path, compression=self.compression)
+        logger.debug(f"Wrote {len(records)} rows to {path}")
+
+    def _read_table(self, path: str, columns: Optional[list[str]] = None):
+        import pyarrow.parquet as pq
+
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [c for c in columns if c in available]
+        return pq.read_table(path, columns=columns, memory_map=True)
+
+    def load_columns(
+        self, path: str, columns: Optional[list[str]] = None
+    ) -> dict[str, Any]:
+        table = self._read_table(path, columns)
+        metadata = table.schema.metadata or {}
+        json_columns = set(json.loads(metadata.get(_JSON_COLUMNS_KEY, b"[]")))
+
+        result: dict[str, Any] = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if name in EMBEDDING_COLUMNS:
+                result[name] = _embedding_matrix(column)
+            elif name in json_columns:
+                result[name] = [
+                    None if v is None else json.loads(v) for v in column.to_pylist()
+                ]
+            else:
+                result[name] = column.to_pylist()
+        return result
+
+    def load(self, path: str, model_class: type[T]) -> list[T]:
+        import numpy as np
+
+        columns = self.load_columns(path)
+        if not columns:
+            return []
+
+        for name in EMBEDDING_COLUMNS & columns.keys():
+            matrix = columns[name]
+            # Rows saved without an embedding come back as NaN
+            missing = (
+                np.isnan(matrix).all(axis=1)
+                if matrix.shape[1]
+                else np.ones(len(matrix), dtype=bool)
+            )
+            columns[name] = [
+                None if is_missing else row
+                for is_missing, row in zip(missing.tolist(), matrix.tolist())
+            ]
+
+        names = list(columns.keys())
+        rows = [dict(zip(names, values)) for values in zip(*columns.values())]
+        return TypeAdapter(list[model_class]).validate_python(rows)
+
+
+def _embedding_array(values: list[Optional[list[float]]]):
+    """Build a fixed-size float32 list array, keeping missing embeddings null."""
+    import numpy as np
+    import pyarrow as pa
+
+    present = [v for v in values if v is not None]
+    if not present:
+        return pa.nulls(len(values), type=pa.list_(pa.float32()))
+
+    dim = len(present[0])
+    flat = np.zeros((len(values), dim), dtype=np.float32)
+    mask = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if value is None:
+            mask[i] = True
+        else:
+            flat[i] = value
+    return pa.FixedSizeListArray.from_arrays(
+        pa.array(flat.reshape(-1)), dim, mask=pa.array(mask)
+    )
+
+
+def _embedding_matrix(column):
+    """Convert a fixed-size list column into an (n, dim) float32 array.
+
+    Null rows are filled with NaN so the matrix stays dense.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    column = column.combine_chunks()
+    if not pa.types.is_fixed_size_list(column.type):
+        return np.empty((len(column), 0), dtype=np.float32)
+
+    dim = column.type.list_size
+    matrix = np.full((len(column), dim), np.nan, dtype=np.float32)
+    valid = np.asarray(column.is_valid().to_numpy(zero_copy_only=False), dtype=bool)
+    if valid.any():
+        matrix[valid] = (
+            column.filter(pa.array(valid)).flatten().to_numpy().reshape(-1, dim)
+        )
+    return matrix
@@ -0,0 +1,335 @@
+import hashlib
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+from kura.cluster_tree import ClusterTree
+from kura.types import Cluster, Conversation, ConversationSummary
+from kura.types.dimensionality import ProjectedCluster
+from kura.v1.kura import CheckpointManager
+
+if TYPE_CHECKING:
+    from kura.sqlite_store import ClusterRecord, SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# Cluster checkpoints in order of preference: the projected clusters carry
+# the map coordinates, the others are used when the pipeline stopped earlier
+CLUSTER_CHECKPOINTS = [
+    ("dimensionality.jsonl", ProjectedCluster),
+    ("meta_clusters.jsonl", Cluster),
+    ("clusters.jsonl", Cluster),
+]
+# A SQLiteStore at this path in the checkpoint directory is queried instead
+# of the checkpoint files
+DATABASE_FILENAME = "kura.db"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class CheckpointIndex:
+    """Read-only, in-memory indexes over a checkpoint directory.
+
+    Everything is loaded once and serialised up front, so each request is a
+    dictionary lookup and a slice. The index is a snapshot of the files at
+    startup and does not follow later changes to them; restart the server
+    to pick up new checkpoints. ``version`` is computed from the modification
+    times and sizes of the loaded files at that point, so a restarted server
+    only invalidates cached responses if the files changed, and is used as
+    the ETag of every response.
+    """
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        *,
+        summaries_filename: str = "summaries.jsonl",
+        conversations_filename: str = "conversations.json",
+    ):
+        """
+        Args:
+            checkpoint_dir: Directory holding the pipeline checkpoints
+            summaries_filename: Summary checkpoint to index by chat id
+            conversations_filename: Conversation dump (``.json`` from
+                ``Conversation.generate_conversation_dump`` or ``.jsonl``); optional
+        """
+        self.checkpoint_dir = checkpoint_dir
+        manager = CheckpointManager(
+            checkpoint_dir, enabled=os.path.isdir(checkpoint_dir)
+        )
+        loaded = []
+
+        clusters: list[Cluster] = []
+        for filename, model in CLUSTER_CHECKPOINTS:
+            clusters = manager.load_checkpoint(filename, model) or []
+            if clusters:
+                loaded.append(filename)
+                break
+        self.tree = ClusterTree(clusters)
+        self.clusters_by_position = [
+            self._cluster_record(i, cluster) for i, cluster in enumerate(clusters)
+        ]
+
+        summaries = manager.load_checkpoint(summaries_filename, ConversationSummary)
+        if summaries:
+            loaded.append(summaries_filename)
+        self.summaries = {
+            summary.chat_id: summary.model_dump(mode="json", exclude={"embedding"})
+            for summary in summaries or []
+        }
+
+        self.conversations: dict[str, Conversation] = {}
+        conversations_path = os.path.join(checkpoint_dir, conversations_filename)
+        if os.path.exists(conversations_path):
+            conversations = (
+                Conversation.iter_conversation_jsonl(conversations_path)
+                if conversations_filename.endswith(".jsonl")
+                else Conversation.iter_conversation_dump(conversations_path)
+            )
+            self.conversations = {c.chat_id: c for c in conversations}
+            loaded.append(conversations_filename)
+
+        digest = hashlib.sha1()
+        for filename in loaded:
+            stat = os.stat(manager.get_checkpoint_path(filename))
+            digest.update(f"{filename}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        self.version = digest.hexdigest()[:16]
+        logger.info(
+            f"Indexed {len(self.clusters_by_position)} clusters, {len(self.summaries)} summaries and {len(self.conversations)} conversations from {checkpoint_dir}"
+        )
+
+    def _cluster_record(self, i: int, cluster: Cluster) -> dict[str, Any]:
+        record = cluster.model_dump(mode="json", exclude={"chat_ids"})
+        record["child_count"] = len(self.tree.children[i])
+        record["subtree_size"] = self.tree.subtree_sizes[i]
+        return record
+
+    def _position(self, cluster_id: str) -> int:
+        if cluster_id not in self.tree.index:
+            raise KeyError(cluster_id)
+        return self.tree.index[cluster_id]
+
+    def clusters(
+        self, parent_id: Optional[str], offset: int, limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        positions = (
+            self.tree.roots
+            if parent_id is None
+            else self.tree.children[self._position(parent_id)]
+        )
+        return [
+            self.clusters_by_position[i] for i in positions[offset : offset + limit]
+        ], len(positions)
+
+    def cluster(self, cluster_id: str) -> dict[str, Any]:
+        return self.clusters_by_position[self._position(cluster_id)]
+
+    def cluster_conversations(
+        self, cluster_id: str, offset: int, limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        chat_ids = self.tree.clusters[self._position(cluster_id)].chat_ids
+        return [
+            self.summaries.get(chat_id, {"chat_id": chat_id})
+            for chat_id in chat_ids[offset : offset + limit]
+        ], len(chat_ids)
+
+    def summary(self, chat_id: str) -> dict[str, Any]:
+        return self.summaries[chat_id]
+
+    def conversation(self, chat_id: str) -> dict[str, Any]:
+        return self.conversations[chat_id].model_dump(mode="json")
+
+
+class SQLiteIndex:
+    """Serves the same queries as ``CheckpointIndex`` from a ``SQLiteStore``.
+
+    Nothing is loaded up front; each request runs indexed queries. The
+    version follows the database file, so responses are revalidated after
+    a pipeline run writes to it.
+    """
+
+    def __init__(self, store: "SQLiteStore"):
+        self.store = store
+
+    @property
+    def version(self) -> str:
+        digest = hashlib.sha1()
+        for path in (self.store.path, f"{self.store.path}-wal"):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+        return digest.hexdigest()[:16]
+
+    def _record(self, record: "ClusterRecord") -> dict[str, Any]:
+        data = record.model_dump(mode="json", exclude={"position"})
+        for field in ("x_coord", "y_coord", "level"):
+            if data[field] is None:
+                del data[field]
+        return data
+
+    def _require(self, cluster_id: str) -> "ClusterRecord":
+        record = self.store.cluster(cluster_id)
+        if record is None:
+            raise KeyError(cluster_id)
+        return record
+
+    def clusters(
+        self, parent_id: Optional[str], offset: int, limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        if parent_id is not None:
+            self._require(parent_id)
+        records = self.store.clusters(parent_id, offset=offset, limit=limit)
+        return [self._record(r) for r in records], self.store.count_clusters(parent_id)
+
+    def cluster(self, cluster_id: str) -> dict[str, Any]:
+        return self._record(self._require(cluster_id))
+
+    def cluster_conversations(
+        self, cluster_id: str, offset: int, limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        total = self._require(cluster_id).count
+        chat_ids = self.store.cluster_chat_ids(cluster_id, offset=offset, limit=limit)
+        summaries = {
+            s.chat_id: s.model_dump(mode="json", exclude={"embedding"})
+            for s in self.store.summaries(chat_ids)
+        }
+        return [
+            summaries.get(chat_id, {"chat_id": chat_id}) for chat_id in chat_ids
+        ], total
+
+    def summary(self, chat_id: str) -> dict[str, Any]:
+        summary = self.store.summary(chat_id)
+        if summary is None:
+            raise KeyError(chat_id)
+        return summary.model_dump(mode="json", exclude={"embedding"})
+
+    def conversation(self, chat_id: str) -> dict[str, Any]:
+        conversation = self.store.conversation(chat_id)
+        if conversation is None:
+            raise KeyError(chat_id)
+        return conversation.model_dump(mode="json")
+
+
+def load_index(checkpoint_dir: str) -> Union[CheckpointIndex, SQLiteIndex]:
+    """Serve the SQLite store in ``checkpoint_dir`` if there is one, else the checkpoints."""
+    database_path = os.path.join(checkpoint_dir, DATABASE_FILENAME)
+    if os.path.exists(database_path):
+        from kura.sqlite_store import SQLiteStore
+
+        logger.info(f"Serving queries from {database_path}")
+        return SQLiteIndex(SQLiteStore(database_path))
+    return CheckpointIndex(checkpoint_dir)
+
+
+def _page(items: list, total: int, page: int, page_size: int) -> dict[str, Any]:
+    return {"items": items, "page": page, "page_size": page_size, "total": total}
+
+
+def _respond(request: Request, version: str, payload: Any) -> Response:
+    """Return ``payload`` as JSON, or 304 if the client already has this version.
+
+    The ETag is weak because the body may be gzipped on the way out.
+    """
+    etag = f'W/"{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
+
+
+def _not_found(kind: str, id: str) -> HTTPException:
+    return HTTPException(status_code=404, detail=f"Unknown {kind} {id}")
+
+
+def get_index(request: Request) -> Union[CheckpointIndex, SQLiteIndex]:
+    index = getattr(request.app.state, "index", None)
+    if index is None:
+        raise HTTPException(status_code=503, detail="Checkpoint index not loaded")
+    return index
+
+
+router = APIRouter(prefix="/api")
+
+
+@router.get("/clusters")
+def list_clusters(
+    request: Request,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    """Top-level clusters, without their chat ids."""
+    index = get_index(request)
+    version = index.version
+    items, total = index.clusters(None, (page - 1) * page_size, page_size)
+    return _respond(request, version, _page(items, total, page, page_size))
+
+
+@router.get("/clusters/{cluster_id}")
+def get_cluster(request: Request, cluster_id: str) -> Response:
+    index = get_index(request)
+    version = index.version
+    try:
+        return _respond(request, version, index.cluster(cluster_id))
+    except KeyError:
+        raise _not_found("cluster", cluster_id)
+
+
+@router.get("/clusters/{cluster_id}/children")
+def list_children(
+    request: Request,
+    cluster_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    index = get_index(request)
+    version = index.version
+    try:
+        items, total = index.clusters(cluster_id, (page - 1) * page_size, page_size)
+    except KeyError:
+        raise _not_found("cluster", cluster_id)
+    return _respond(request, version, _page(items, total, page, page_size))
+
+
+@router.get("/clusters/{cluster_id}/conversations")
+def list_cluster_conversations(
+    request: Request,
+    cluster_id: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> Response:
+    """Summaries of the conversations in a cluster, one page at a time.
+
+    Conversations without a summary are listed with just their chat id.
+    """
+    index = get_index(request)
+    version = index.version
+    try:
+        items, total = index.cluster_conversations(
+            cluster_id, (page - 1) * page_size, page_size
+        )
+    except KeyError:
+        raise _not_found("cluster", cluster_id)
+    return _respond(request, version, _page(items, total, page, page_size))
+
+
+@router.get("/summaries/{chat_id}")
+def get_summary(request: Request, chat_id: str) -> Response:
+    index = get_index(request)
+    version = index.version
+    try:
+        return _respond(request, version, index.summary(chat_id))
+    except KeyError:
+        raise _not_found("conversation", chat_id)
+
+
+@router.get("/conversations/{chat_id}")
+def get_conversation(request: Request, chat_id: str) -> Response:
+    index = get_index(request)
+    version = index.version
+    try:
+        return _respond(request, version, index.conversation(chat_id))
+    except KeyError:
+        raise _not_found("conversation", chat_id)
@@ -1,6 +1,4 @@
 import typer
-import uvicorn
-from kura.cli.server import api
 from rich import print
 import os
 
@@ -15,6 +13,10 @@ def start_app(
     ),
 ):
     """Start the FastAPI server"""
+    # Imported here so other commands (and --help) don't load the web stack
+    import uvicorn
+    from kura.cli.server import api
+
     os.environ["KURA_CHECKPOINT_DIR"] = dir
     print(
         "\n[bold green]🚀 Access website at[/bold green] [bold blue][http://localhost:8000](http://localhost:8000)[/bold blue]\n"
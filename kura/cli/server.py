@@ -1,8 +1,21 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, staticfiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pathlib import Path
+import os
 
-api = FastAPI()
+from kura.cli.api import load_index, router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the query indexes once, before the first request is served
+    app.state.index = load_index(os.environ.get("KURA_CHECKPOINT_DIR", "./checkpoints"))
+    yield
+
+
+api = FastAPI(lifespan=lifespan)
 
 # Configure CORS
 api.add_middleware(
@@ -12,6 +25,10 @@ api.add_middleware(
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
+api.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Query endpoints have to be registered before the static files take over "/"
+api.include_router(router)
 
 # Serve static files from web/dist
 web_dir = Path(__file__).parent.parent / "static" / "dist"
@@ -1,22 +1,110 @@
+from __future__ import annotations
+
 from kura.base_classes import BaseClusterModel, BaseClusteringMethod, BaseEmbeddingModel
 from kura.embedding import OpenAIEmbeddingModel
-from kura.k_means import KmeansClusteringMethod
-from kura.types import ConversationSummary, Cluster, GeneratedCluster, ClusteringError
+from kura.types import (
+    ConversationSummary,
+    Cluster,
+    EmbeddingMatrix,
+    GeneratedCluster,
+    ClusteringError,
+)
 from tqdm.asyncio import tqdm_asyncio
-import numpy as np
 from asyncio import Semaphore
-from kura.utils.openai_utils import create_instructor_client
+from kura.utils.openai_utils import create_http_client, create_instructor_client
+from kura.utils.concurrency import get_semaphore
+from kura.utils.metrics import InstrumentedClient
+from kura.utils.rate_limit import RateLimiter
 import asyncio
 import logging
+import math
 
-from typing import TYPE_CHECKING, Optional, Callable
+from typing import TYPE_CHECKING, Literal, Optional, Callable, Union
 
 if TYPE_CHECKING:
+    import numpy as np
     from rich.console import Console
 
 logger = logging.getLogger(__name__)
 
 
+class NearestClusterContrastiveSelector:
+    """Selects contrastive examples from the clusters nearest to each cluster.
+
+    Cluster centroids are computed once and a single nearest-neighbour query
+    finds the ``n_neighbours`` closest clusters for every cluster, so picking
+    examples for one cluster only touches those neighbours instead of every
+    summary in every other cluster.
+
+    The query is an exact brute-force k-NN over the centroids, which costs
+    O(k²·d) for k clusters of dimension d. Tree indexes give no speed-up at
+    embedding dimensions, and k is the number of clusters rather than
+    summaries, so this stays small next to the labelling requests.
+    """
+
+    def __init__(
+        self,
+        cluster_id_to_summaries: dict[int, list[ConversationSummary]],
+        cluster_id_to_embeddings: dict[int, np.ndarray],
+        n_neighbours: int = 5,
+        seed: Optional[int] = None,
+    ):
+        import numpy as np
+        from sklearn.neighbors import NearestNeighbors
+
+        self.cluster_id_to_summaries = cluster_id_to_summaries
+        self._rng = np.random.default_rng(seed)
+        self._neighbours: dict[int, list[int]] = {}
+
+        cluster_ids = [
+            cluster_id
+            for cluster_id, embeddings in cluster_id_to_embeddings.items()
+            if len(embeddings)
+        ]
+        if len(cluster_ids) < 2:
+            return
+
+        centroids = np.stack(
+            [cluster_id_to_embeddings[c].mean(axis=0) for c in cluster_ids]
+        )
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids = centroids / np.where(norms == 0, 1, norms)
+
+        k = min(n_neighbours + 1, len(cluster_ids))
+        _, indices = (
+            NearestNeighbors(n_neighbors=k, algorithm="brute")
+            .fit(centroids)
+            .kneighbors(centroids)
+        )
+        for row, cluster_id in enumerate(cluster_ids):
+            self._neighbours[cluster_id] = [
+                cluster_ids[i] for i in indices[row] if cluster_ids[i] != cluster_id
+            ]
+        logger.debug(
+            f"Built contrastive neighbour index over {len(cluster_ids)} cluster centroids"
+        )
+
+    def neighbours(self, cluster_id: int) -> list[int]:
+        """Ids of the nearest other clusters, closest first."""
+        return self._neighbours.get(cluster_id, [])
+
+    def select(self, cluster_id: int, limit: int = 10) -> list[ConversationSummary]:
+        neighbours = self.neighbours(cluster_id)
+        if not neighbours:
+            return []
+
+        per_cluster = max(1, math.ceil(limit / len(neighbours)))
+        selected: list[ConversationSummary] = []
+        for neighbour in neighbours:
+            candidates = self.cluster_id_to_summaries[neighbour]
+            take = min(per_cluster, len(candidates), limit - len(selected))
+            if take <= 0:
+                break
+            indices = self._rng.choice(len(candidates), size=take, replace=False)
+            selected.extend(candidates[i] for i in indices)
+        return selected
+
+
 class ClusterModel(BaseClusterModel):
     @property
     def checkpoint_filename(self) -> str:
@@ -32,24 +120,77 @@ class ClusterModel(BaseClusterModel):
 
     def __init__(
         self,
-        clustering_method: BaseClusteringMethod = KmeansClusteringMethod(),
-        embedding_model: BaseEmbeddingModel = OpenAIEmbeddingModel(),
+        clustering_method: Optional[BaseClusteringMethod] = None,
+        embedding_model: Optional[BaseEmbeddingModel] = None,
         max_concurrent_requests: int = 50,
         model: str = "openai/gpt-4o-mini",
         console: Optional["Console"] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        contrastive_strategy: Literal["nearest", "random"] = "nearest",
+        n_contrastive_neighbours: int = 5,
+        concurrency_key: Optional[str] = None,
         **kwargs,  # For future use
     ):
+        if clustering_method is None:
+            from kura.k_means import KmeansClusteringMethod
+
+            clustering_method = KmeansClusteringMethod()
         self.clustering_method = clustering_method
-        self.embedding_model = embedding_model
+        self.contrastive_strategy = contrastive_strategy
+        self.n_contrastive_neighbours = n_contrastive_neighbours
+        self._embedding_model = embedding_model
         self.max_concurrent_requests = max_concurrent_requests
-        self.sem = Semaphore(max_concurrent_requests)
-        self.client = create_instructor_client(model)
+        self.concurrency_key = concurrency_key
+        self.rate_limiter = rate_limiter
+        self.model = model
+        self._client = None
         self.console = console
         self.errors: list[ClusteringError] = []
         logger.info(
-            f"Initialized ClusterModel with clustering_method={type(clustering_method).__name__}, embedding_model={type(embedding_model).__name__}, max_concurrent_requests={max_concurrent_requests}, model={model}"
+            f"Initialized ClusterModel with clustering_method={type(clustering_method).__name__}, embedding_model={type(embedding_model).__name__ if embedding_model is not None else 'OpenAIEmbeddingModel'}, max_concurrent_requests={max_concurrent_requests}, model={model}"
         )
 
+    @property
+    def embedding_model(self) -> BaseEmbeddingModel:
+        """The embedding model, an ``OpenAIEmbeddingModel`` created on first use by default."""
+        if self._embedding_model is None:
+            self._embedding_model = OpenAIEmbeddingModel()
+        return self._embedding_model
+
+    @embedding_model.setter
+    def embedding_model(self, embedding_model: BaseEmbeddingModel) -> None:
+        self._embedding_model = embedding_model
+
+    @property
+    def sem(self) -> Semaphore:
+        """Limits in-flight requests, shared by every model with the same ``concurrency_key``."""
+        return get_semaphore(self.concurrency_key or self, self.max_concurrent_requests)
+
+    @property
+    def client(self):
+        """The instructor client, created on first use."""
+        if self._client is None:
+            self._client = InstrumentedClient(
+                create_instructor_client(
+                    self.model,
+                    http_client=create_http_client(
+                        max_connections=self.max_concurrent_requests,
+                        rate_limiter=self.rate_limiter,
+                    )
+                    if self.rate_limiter
+                    else None,
+                ),
+                model=self.model,
+                operation="cluster",
+            )
+            if self.rate_limiter is not None:
+                self._client = self.rate_limiter.wrap_client(self._client, self.model)
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
     def get_contrastive_examples(
         self,
         cluster_id: int,
@@ -83,7 +224,10 @@ class ClusterModel(BaseClusterModel):
             return all_examples
 
         # Otherwise sample without replacement
-        selected = list(np.random.choice(all_examples, size=limit, replace=False))
+        import numpy as np
+
+        indices = np.random.choice(len(all_examples), size=limit, replace=False)
+        selected = [all_examples[i] for i in indices]
         logger.debug(
             f"Randomly selected {len(selected)} contrastive examples from {len(all_examples)} available"
         )
@@ -181,37 +325,37 @@ Do not elaborate beyond what you say in the tags. Remember to analyze both the s
 
     async def _embed_summaries(
         self, summaries: list[ConversationSummary]
-    ) -> list[list[float]]:
-        """Embeds a list of conversation summaries."""
+    ) -> EmbeddingMatrix:
+        """Embeds a list of conversation summaries into a matrix keyed by chat id."""
         if not summaries:
             logger.debug("Empty summaries list provided for embedding")
-            return []
+            return EmbeddingMatrix([])
 
         logger.info(f"Starting embedding of {len(summaries)} conversation summaries")
         texts_to_embed = [str(item) for item in summaries]
 
         try:
-            embeddings = await self.embedding_model.embed(texts_to_embed)
-            logger.debug(
-                f"Received {len(embeddings) if embeddings else 0} embeddings from embedding model"
-            )
+            embeddings = await self.embedding_model.embed_matrix(texts_to_embed)
+            logger.debug(f"Received {len(embeddings)} embeddings from embedding model")
         except Exception as e:
             logger.error(f"Failed to embed {len(summaries)} summaries: {e}")
             raise
 
-        if not embeddings or len(embeddings) != len(summaries):
+        if not len(embeddings) or len(embeddings) != len(summaries):
             logger.error(
-                f"Error: Number of embeddings ({len(embeddings) if embeddings else 0}) does not match number of summaries ({len(summaries)}) or embeddings are empty."
+                f"Error: Number of embeddings ({len(embeddings)}) does not match number of summaries ({len(summaries)}) or embeddings are empty."
             )
-            return []
+            return EmbeddingMatrix([])
 
         logger.info(f"Successfully embedded {len(summaries)} summaries")
-        return embeddings
+        return EmbeddingMatrix.from_embeddings(
+            embeddings, [summary.chat_id for summary in summaries]
+        )
 
     async def _generate_clusters_from_embeddings(
         self,
         summaries: list[ConversationSummary],
-        embeddings: list[list[float]],
+        embeddings: EmbeddingMatrix,
         *,
         processed_keys: set[tuple[str, ...]] | None = None,
         batch_size: int = 100,
@@ -225,18 +369,24 @@ Do not elaborate beyond what you say in the tags. Remember to analyze both the s
             f"Generating clusters from {len(summaries)} summaries with embeddings"
         )
 
-        # Set embeddings on the summary objects
-        items_with_embeddings = [
-            {"item": summary, "embedding": embedding}
-            for summary, embedding in zip(summaries, embeddings)
-        ]
-
-        logger.debug("Set embeddings on summary objects, starting clustering")
-        cluster_id_to_summaries = self.clustering_method.cluster(items_with_embeddings)
+        cluster_id_to_summaries = await self.clustering_method.cluster_matrix(
+            embeddings, summaries
+        )
         logger.info(
             f"Clustering method produced {len(cluster_id_to_summaries)} clusters"
         )
 
+        selector = None
+        if self.contrastive_strategy == "nearest":
+            selector = NearestClusterContrastiveSelector(
+                cluster_id_to_summaries,
+                {
+                    cluster_id: embeddings.rows([s.chat_id for s in group])
+                    for cluster_id, group in cluster_id_to_summaries.items()
+                },
+                n_neighbours=self.n_contrastive_neighbours,
+            )
+
         tasks_data = []
         for cluster_id, conversation_summaries in cluster_id_to_summaries.items():
             key = tuple(sorted(s.chat_id for s in conversation_summaries))
@@ -250,11 +400,14 @@ Do not elaborate beyond what you say in the tags. Remember to analyze both the s
                 f"Preparing cluster generation for cluster {cluster_id} with {len(conversation_summaries)} summaries"
             )
 
-            contrastive_examples = self.get_contrastive_examples(
-                cluster_id=cluster_id,
-                cluster_id_to_summaries=cluster_id_to_summaries,
-                limit=10,
-            )
+            if selector is not None:
+                contrastive_examples = selector.select(cluster_id, limit=10)
+            else:
+                contrastive_examples = self.get_contrastive_examples(
+                    cluster_id=cluster_id,
+                    cluster_id_to_summaries=cluster_id_to_summaries,
+                    limit=10,
+                )
 
             tasks_data.append((conversation_summaries, contrastive_examples))
 
@@ -301,7 +454,14 @@ Do not elaborate beyond what you say in the tags. Remember to analyze both the s
         on_batch_complete: Optional[
             Callable[[list[Cluster], list[ClusteringError]], None]
         ] = None,
+        embeddings: Optional[Union[EmbeddingMatrix, list[list[float]]]] = None,
     ) -> list[Cluster]:
+        """Embed, cluster and name ``summaries``.
+
+        ``embeddings`` can be passed when the summaries were already embedded
+        (e.g. by ``run_pipeline`` while summarisation was still running); they
+        must line up with ``summaries``.
+        """
         if not summaries:
             logger.warning("Empty summaries list provided to cluster_summaries")
             return []
@@ -311,8 +471,17 @@ Do not elaborate beyond what you say in the tags. Remember to analyze both the s
         )
 
         self.errors = []
-        embeddings = await self._embed_summaries(summaries)
-        if not embeddings:
+        if embeddings is None:
+            embeddings = await self._embed_summaries(summaries)
+        elif len(embeddings) != len(summaries):
+            raise ValueError(
+                f"Got {len(embeddings)} embeddings for {len(summaries)} summaries"
+            )
+        else:
+            embeddings = EmbeddingMatrix.from_embeddings(
+                embeddings, [summary.chat_id for summary in summaries]
+            )
+        if not len(embeddings):
             logger.error(
                 "Failed to generate embeddings, cannot proceed with clustering"
             )
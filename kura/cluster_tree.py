@@ -0,0 +1,242 @@
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence, TextIO, TypeVar, Union
+
+from kura.types import Cluster
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Trees loaded from checkpoints, keyed by resolved path and invalidated when
+# the file's modification time or size changes
+_checkpoint_trees: dict[str, tuple[tuple[int, int], "ClusterTree"]] = {}
+_MAX_CACHED_TREES = 8
+
+
+class ClusterTree:
+    """Index over a cluster hierarchy, built in a single pass.
+
+    Clusters are addressed by their position in ``clusters``. ``children[i]``
+    lists the positions of the children of cluster ``i`` in checkpoint order,
+    ``parents[i]`` is the position of its parent (-1 for roots) and
+    ``subtree_sizes[i]`` is the number of clusters in its subtree, itself
+    included. Nothing here recurses, so hierarchies of any depth can be
+    indexed and rendered.
+
+    ``counts`` overrides the conversation count of each cluster, for
+    clusters loaded without their chat ids.
+    """
+
+    def __init__(
+        self, clusters: Sequence[Cluster], counts: Optional[Sequence[int]] = None
+    ):
+        self.clusters = list(clusters)
+        self.index = {cluster.id: i for i, cluster in enumerate(self.clusters)}
+        if counts is not None and len(counts) != len(self.clusters):
+            raise ValueError(
+                f"Got {len(counts)} counts for {len(self.clusters)} clusters"
+            )
+        self.counts = (
+            list(counts)
+            if counts is not None
+            else [len(cluster.chat_ids) for cluster in self.clusters]
+        )
+        self.parents = [-1] * len(self.clusters)
+        self.children: list[list[int]] = [[] for _ in self.clusters]
+        self.roots: list[int] = []
+
+        for i, cluster in enumerate(self.clusters):
+            if not cluster.parent_id:
+                self.roots.append(i)
+                continue
+            parent = self.index.get(cluster.parent_id)
+            if parent is None:
+                raise ValueError(
+                    f"Cluster {cluster.id} has unknown parent {cluster.parent_id}"
+                )
+            self.parents[i] = parent
+            self.children[parent].append(i)
+
+        # Children come after their parents in breadth-first order, so walking
+        # it backwards folds every subtree into its parent exactly once
+        self.subtree_sizes = [1] * len(self.clusters)
+        order = list(self.roots)
+        for i in order:
+            order.extend(self.children[i])
+        if len(order) != len(self.clusters):
+            raise ValueError("Cluster hierarchy contains a cycle")
+        for i in reversed(order):
+            parent = self.parents[i]
+            if parent >= 0:
+                self.subtree_sizes[parent] += self.subtree_sizes[i]
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path: Union[str, Path]) -> "ClusterTree":
+        """Load the tree for a checkpoint, reusing it while the file is unchanged.
+
+        Raises:
+            FileNotFoundError: If checkpoint file doesn't exist
+            ValueError: If checkpoint file is malformed
+        """
+        path = Path(checkpoint_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Checkpoint file not found: {path}")
+
+        key = str(path.resolve())
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = _checkpoint_trees.get(key)
+        if cached is not None and cached[0] == version:
+            logger.debug(f"Reusing cluster tree for {path}")
+            return cached[1]
+
+        try:
+            with open(path) as f:
+                clusters = [Cluster.model_validate_json(line) for line in f]
+        except Exception as e:
+            raise ValueError(f"Failed to load clusters from {path}: {e}")
+        logger.info(f"Loaded {len(clusters)} clusters from {path}")
+
+        tree = cls(clusters)
+        _checkpoint_trees.pop(key, None)
+        while len(_checkpoint_trees) >= _MAX_CACHED_TREES:
+            _checkpoint_trees.pop(next(iter(_checkpoint_trees)))
+        _checkpoint_trees[key] = (version, tree)
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.clusters)
+
+    @property
+    def total_conversations(self) -> int:
+        """Conversations across the root clusters."""
+        return sum(self.counts[i] for i in self.roots)
+
+    def _children_of(self, i: int) -> list[int]:
+        return self.roots if i < 0 else self.children[i]
+
+    def children_of(self, cluster_id: str) -> list[Cluster]:
+        return [self.clusters[i] for i in self.children[self.index[cluster_id]]]
+
+    def subtree_size(self, cluster_id: str) -> int:
+        return self.subtree_sizes[self.index[cluster_id]]
+
+
+def walk_tree(
+    root: T,
+    children: Callable[[T], Sequence[T]],
+    *,
+    level: int = 0,
+    is_last: bool = True,
+    prefix: str = "",
+) -> Iterator[tuple[T, int, bool, str]]:
+    """Visit a tree depth first, yielding ``(node, level, is_last, prefix)``.
+
+    ``prefix`` is the run of tree-drawing characters that goes before the
+    node's connector, matching what the text visualisations print.
+
+    Args:
+        root: Node to start from
+        children: Returns the children of a node, in display order
+        level: Depth of ``root``; connectors are only drawn below level 0
+        is_last: Whether ``root`` is the last child of its parent
+        prefix: Prefix inherited by ``root``
+    """
+    stack = [(root, level, is_last, prefix)]
+    while stack:
+        node, level, is_last, prefix = stack.pop()
+        yield node, level, is_last, prefix
+
+        child_prefix = prefix
+        if level > 0:
+            child_prefix += "    " if is_last else "║   "
+        nodes = children(node)
+        last = len(nodes) - 1
+        for i in range(last, -1, -1):
+            stack.append((nodes[i], level + 1, i == last, child_prefix))
+
+
+def format_tree_line(
+    name: str, count: int, level: int, is_last: bool, prefix: str
+) -> str:
+    """One line of the basic tree view."""
+    if level > 0:
+        prefix += "╚══ " if is_last else "╠══ "
+    return f"{prefix}{name} ({count} conversations)\n"
+
+
+def format_enhanced_tree_lines(
+    name: str,
+    count: int,
+    description: Optional[str],
+    level: int,
+    is_last: bool,
+    prefix: str,
+    total_conversations: int,
+) -> str:
+    """The block of lines for one node in the enhanced tree view."""
+    current_prefix = prefix
+    if level > 0:
+        current_prefix += "╚══ " if is_last else "╠══ "
+    detail_prefix = prefix + ("║   " if not is_last and level > 0 else "    ")
+
+    percentage = (count / total_conversations * 100) if total_conversations > 0 else 0
+    bar_width = 20
+    filled_width = (
+        int((count / total_conversations) * bar_width) if total_conversations > 0 else 0
+    )
+    progress_bar = "█" * filled_width + "░" * (bar_width - filled_width)
+
+    result = f"{current_prefix}🔸 {name}\n"
+    result += f"{detail_prefix}📊 {count:,} conversations ({percentage:.1f}%) [{progress_bar}]\n"
+    if description and len(description) < 100:
+        result += f"{detail_prefix}💭 {description}\n"
+    return result + "\n"
+
+
+def render_tree(
+    tree: ClusterTree, writer: TextIO, *, root_name: str = "Clusters"
+) -> None:
+    """Write the basic tree view of ``tree`` to ``writer`` line by line.
+
+    Args:
+        tree: Cluster hierarchy to render
+        writer: Anything with a ``write`` method, e.g. ``sys.stdout`` or ``io.StringIO``
+        root_name: Label of the synthetic node above the root clusters
+    """
+    total = tree.total_conversations
+    clusters = tree.clusters
+    for i, level, is_last, prefix in walk_tree(-1, tree._children_of, is_last=False):
+        if i < 0:
+            writer.write(format_tree_line(root_name, total, level, is_last, prefix))
+        else:
+            writer.write(
+                format_tree_line(
+                    clusters[i].name, tree.counts[i], level, is_last, prefix
+                )
+            )
+
+
+def render_enhanced_tree(tree: ClusterTree, writer: TextIO) -> None:
+    """Write the enhanced tree view of ``tree``, with shares and descriptions.
+
+    Args:
+        tree: Cluster hierarchy to render
+        writer: Anything with a ``write`` method, e.g. ``sys.stdout`` or ``io.StringIO``
+    """
+    total = tree.total_conversations
+    clusters = tree.clusters
+    for i, level, is_last, prefix in walk_tree(-1, tree._children_of, is_last=False):
+        if i < 0:
+            name = f"📚 All Clusters ({total:,} total conversations)"
+            count, description = total, "Hierarchical conversation clustering results"
+        else:
+            name, count = clusters[i].name, tree.counts[i]
+            description = clusters[i].description
+        writer.write(
+            format_enhanced_tree_lines(
+                name, count, description, level, is_last, prefix, total
+            )
+        )
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from typing import TYPE_CHECKING, Optional
+
+from kura.types import Conversation
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Largest Mersenne prime below 2**64, the usual modulus for MinHash permutations
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ConversationDeduplicator:
+    """Groups identical and near-identical conversations before summarisation.
+
+    Each conversation is normalised (roles kept, content lowercased and
+    whitespace collapsed). Conversations with the same normalised text are
+    exact duplicates. With ``near_duplicates`` enabled, the remaining ones are
+    compared with MinHash signatures over word shingles: locality sensitive
+    hashing (LSH) on ``num_bands`` bands of the signature finds candidates, and a
+    candidate counts as a duplicate when its estimated Jaccard similarity is at
+    least ``threshold``.
+
+    The first conversation seen in a group is its representative. The
+    deduplicator keeps its index between calls, so duplicates are also found
+    across batches of a streamed input.
+    """
+
+    def __init__(
+        self,
+        *,
+        near_duplicates: bool = True,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        num_bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+        if num_perm % num_bands != 0:
+            raise ValueError(
+                f"num_perm ({num_perm}) must be divisible by num_bands ({num_bands})"
+            )
+
+        self.near_duplicates = near_duplicates
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+
+        self._exact: dict[str, str] = {}
+        self._bands: list[dict[bytes, list[str]]] = [{} for _ in range(num_bands)]
+        self._signatures: dict[str, np.ndarray] = {}
+        self._permutations = None
+        self.group_sizes: dict[str, int] = {}
+        logger.info(
+            f"Initialized ConversationDeduplicator with near_duplicates={near_duplicates}, threshold={threshold}, num_perm={num_perm}, num_bands={num_bands}"
+        )
+
+    @staticmethod
+    def normalise(conversation: Conversation) -> str:
+        """The text two conversations must share to be exact duplicates."""
+        return "\n".join(
+            f"{message.role}: {_WHITESPACE.sub(' ', message.content).strip().lower()}"
+            for message in conversation.messages
+        )
+
+    def find_representative(self, conversation: Conversation) -> Optional[str]:
+        """Return the ``chat_id`` this conversation duplicates, if any.
+
+        Conversations that don't duplicate an earlier one become the
+        representative of a new group.
+        """
+        text = self.normalise(conversation)
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        representative = self._exact.get(digest)
+
+        signature = None
+        if representative is None and self.near_duplicates:
+            signature = self._signature(text)
+            representative = self._near_duplicate(signature)
+
+        if representative is not None:
+            self._exact.setdefault(digest, representative)
+            self.group_sizes[representative] += 1
+            return representative
+
+        chat_id = conversation.chat_id
+        self._exact[digest] = chat_id
+        self.group_sizes[chat_id] = 1
+        if signature is not None:
+            self._signatures[chat_id] = signature
+            for band, key in zip(self._bands, self._band_keys(signature)):
+                band.setdefault(key, []).append(chat_id)
+        return None
+
+    def split(
+        self, conversations: list[Conversation]
+    ) -> tuple[list[Conversation], list[tuple[Conversation, str]]]:
+        """Split conversations into representatives and ``(duplicate, representative_id)`` pairs."""
+        unique: list[Conversation] = []
+        duplicates: list[tuple[Conversation, str]] = []
+        for conversation in conversations:
+            representative = self.find_representative(conversation)
+            if representative is None:
+                unique.append(conversation)
+            else:
+                duplicates.append((conversation, representative))
+        if duplicates:
+            logger.info(
+                f"Found {len(duplicates)} duplicates in {len(conversations)} conversations"
+            )
+        return unique, duplicates
+
+    def _shingles(self, text: str) -> list[str]:
+        words = text.split()
+        if len(words) <= self.shingle_size:
+            return [text]
+        return [
+            " ".join(words[i : i + self.shingle_size])
+            for i in range(len(words) - self.shingle_size + 1)
+        ]
+
+    def _signature(self, text: str) -> np.ndarray:
+        import numpy as np
+
+        if self._permutations is None:
+            rng = np.random.default_rng(self.seed)
+            self._permutations = (
+                rng.integers(1, _MAX_HASH, size=self.num_perm, dtype=np.uint64),
+                rng.integers(0, _MAX_HASH, size=self.num_perm, dtype=np.uint64),
+            )
+        a, b = self._permutations
+
+        hashes = np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(shingle.encode(), digest_size=4).digest(), "little"
+                )
+                for shingle in set(self._shingles(text))
+            ),
+            dtype=np.uint64,
+        )
+        # a, b and the hashes are below 2**32, so this never overflows uint64
+        permuted = (np.outer(hashes, a) + b) % np.uint64(_MERSENNE_PRIME)
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        rows = self.num_perm // self.num_bands
+        return [
+            signature[i * rows : (i + 1) * rows].tobytes()
+            for i in range(self.num_bands)
+        ]
+
+    def _near_duplicate(self, signature: np.ndarray) -> Optional[str]:
+        candidates: dict[str, None] = {}
+        for band, key in zip(self._bands, self._band_keys(signature)):
+            for chat_id in band.get(key, ()):
+                candidates[chat_id] = None
+
+        best, best_similarity = None, self.threshold
+        for chat_id in candidates:
+            similarity = float((self._signatures[chat_id] == signature).mean())
+            if similarity >= best_similarity:
+                best, best_similarity = chat_id, similarity
+        return best
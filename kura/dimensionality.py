@@ -1,7 +1,9 @@
 from kura.base_classes import BaseDimensionalityReduction, BaseEmbeddingModel
 from kura.types import Cluster, ProjectedCluster
 from kura.embedding import OpenAIEmbeddingModel
-from typing import Union
+from kura.utils.executor import run_in_executor
+from kura.utils.metrics import timer
+from typing import Optional, Union
 import numpy as np
 import logging
 
@@ -16,27 +18,35 @@ class HDBUMAP(BaseDimensionalityReduction):
 
     def __init__(
         self,
-        embedding_model: BaseEmbeddingModel = OpenAIEmbeddingModel(),
+        embedding_model: Optional[BaseEmbeddingModel] = None,
         n_components: int = 2,
         min_dist: float = 0.1,
         metric: str = "cosine",
         n_neighbors: Union[int, None] = None,
     ):
-        self.embedding_model = embedding_model
+        self._embedding_model = embedding_model
         self.n_components = n_components
         self.min_dist = min_dist
         self.metric = metric
         self.n_neighbors = n_neighbors
         logger.info(
-            f"Initialized HDBUMAP with embedding_model={type(embedding_model).__name__}, n_components={n_components}, min_dist={min_dist}, metric={metric}, n_neighbors={n_neighbors}"
+            f"Initialized HDBUMAP with embedding_model={type(embedding_model).__name__ if embedding_model is not None else 'OpenAIEmbeddingModel'}, n_components={n_components}, min_dist={min_dist}, metric={metric}, n_neighbors={n_neighbors}"
         )
 
+    @property
+    def embedding_model(self) -> BaseEmbeddingModel:
+        """The embedding model, an ``OpenAIEmbeddingModel`` created on first use by default."""
+        if self._embedding_model is None:
+            self._embedding_model = OpenAIEmbeddingModel()
+        return self._embedding_model
+
+    @embedding_model.setter
+    def embedding_model(self, embedding_model: BaseEmbeddingModel) -> None:
+        self._embedding_model = embedding_model
+
     async def reduce_dimensionality(
         self, clusters: list[Cluster]
     ) -> list[ProjectedCluster]:
-        # Embed all clusters
-        from umap import UMAP
-
         if not clusters:
             logger.warning("Empty clusters list provided to reduce_dimensionality")
             return []
@@ -45,19 +55,23 @@ class HDBUMAP(BaseDimensionalityReduction):
         texts_to_embed = [str(c) for c in clusters]
 
         try:
-            cluster_embeddings = await self.embedding_model.embed(texts_to_embed)
+            cluster_embeddings = await self.embedding_model.embed_matrix(
+                texts_to_embed, [c.id for c in clusters]
+            )
             logger.debug(f"Generated embeddings for {len(clusters)} clusters")
         except Exception as e:
             logger.error(f"Failed to generate embeddings for clusters: {e}")
             raise
 
-        if not cluster_embeddings or len(cluster_embeddings) != len(texts_to_embed):
+        if not len(cluster_embeddings) or len(cluster_embeddings) != len(
+            texts_to_embed
+        ):
             logger.error(
-                f"Error: Number of embeddings ({len(cluster_embeddings) if cluster_embeddings else 0}) does not match number of clusters ({len(texts_to_embed)}) or embeddings are empty."
+                f"Error: Number of embeddings ({len(cluster_embeddings)}) does not match number of clusters ({len(texts_to_embed)}) or embeddings are empty."
             )
             return []
 
-        embeddings = np.array(cluster_embeddings)
+        embeddings = cluster_embeddings.vectors
         logger.debug(f"Created embedding matrix of shape {embeddings.shape}")
 
         # Project to 2D using UMAP
@@ -69,13 +83,15 @@ class HDBUMAP(BaseDimensionalityReduction):
         )
 
         try:
-            umap_reducer = UMAP(
-                n_components=self.n_components,
-                n_neighbors=n_neighbors_actual,
-                min_dist=self.min_dist,
-                metric=self.metric,
-            )
-            reduced_embeddings = umap_reducer.fit_transform(embeddings)
+            with timer("kura_umap_fit_seconds"):
+                reduced_embeddings = await run_in_executor(
+                    _umap_fit_transform,
+                    embeddings,
+                    self.n_components,
+                    n_neighbors_actual,
+                    self.min_dist,
+                    self.metric,
+                )
             logger.info(
                 f"UMAP dimensionality reduction completed: {embeddings.shape} -> {reduced_embeddings.shape}"  # type: ignore
             )
@@ -103,3 +119,21 @@ class HDBUMAP(BaseDimensionalityReduction):
 
         logger.info(f"Successfully created {len(res)} projected clusters")
         return res
+
+
+def _umap_fit_transform(
+    embeddings: np.ndarray,
+    n_components: int,
+    n_neighbors: int,
+    min_dist: float,
+    metric: str,
+) -> np.ndarray:
+    """Module level so it can be sent to a process pool."""
+    from umap import UMAP
+
+    return UMAP(
+        n_components=n_components,
+        n_neighbors=n_neighbors,
+        min_dist=min_dist,
+        metric=metric,
+    ).fit_transform(embeddings)  # type: ignore
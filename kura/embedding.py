@@ -1,14 +1,38 @@
+from __future__ import annotations
+
 from kura.base_classes import BaseEmbeddingModel
-from asyncio import Semaphore, gather
+from kura.types.embedding import EmbeddingMatrix
+from asyncio import Semaphore
 import asyncio
 from tenacity import retry, wait_fixed, stop_after_attempt
-from kura.utils.openai_utils import create_openai_client, use_azure_openai
+from kura.utils.openai_utils import (
+    create_http_client,
+    create_openai_client,
+    use_azure_openai,
+)
+from kura.utils.rate_limit import RateLimiter, estimate_tokens
+from kura.utils.concurrency import get_semaphore
+from kura.utils.executor import run_in_executor
+from kura.utils.metrics import inc, timer
+from typing import TYPE_CHECKING, Optional, Sequence
+import hashlib
 import os
+import sqlite3
+import threading
+import time
 import logging
 
+if TYPE_CHECKING:
+    import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
+def _count_retry(retry_state) -> None:
+    model = retry_state.args[0]
+    inc("kura_embedding_retries_total", model=model.model_name)
+
+
 class OpenAIEmbeddingModel(BaseEmbeddingModel):
     def __init__(
         self,
@@ -17,8 +41,12 @@ class OpenAIEmbeddingModel(BaseEmbeddingModel):
         n_concurrent_jobs: int = 5,
         *,
         sleep_seconds: float = 0.0,
+        max_batch_tokens: Optional[int] = 100_000,
+        concurrency_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
-        self.client = create_openai_client()
+        self._client = None
+        self.rate_limiter = rate_limiter
         if use_azure_openai():
             self.model_name = os.environ.get(
                 "AZURE_EMBEDDING_DEPLOYMENT_NAME",
@@ -28,16 +56,39 @@ class OpenAIEmbeddingModel(BaseEmbeddingModel):
             self.model_name = model_name
         self._model_batch_size = model_batch_size
         self._n_concurrent_jobs = n_concurrent_jobs
-        self._semaphore = Semaphore(n_concurrent_jobs)
+        self.concurrency_key = concurrency_key
         self._sleep_seconds = sleep_seconds
+        self._max_batch_tokens = max_batch_tokens
         logger.info(
-            f"Initialized OpenAIEmbeddingModel with model={model_name}, batch_size={model_batch_size}, concurrent_jobs={n_concurrent_jobs}, sleep_seconds={sleep_seconds}"
+            f"Initialized OpenAIEmbeddingModel with model={model_name}, batch_size={model_batch_size}, concurrent_jobs={n_concurrent_jobs}, sleep_seconds={sleep_seconds}, max_batch_tokens={max_batch_tokens}"
         )
 
+    @property
+    def _semaphore(self) -> Semaphore:
+        return get_semaphore(self.concurrency_key or self, self._n_concurrent_jobs)
+
+    @property
+    def client(self):
+        """The OpenAI client, created on first use."""
+        if self._client is None:
+            self._client = create_openai_client(
+                http_client=create_http_client(
+                    max_connections=self._n_concurrent_jobs,
+                    rate_limiter=self.rate_limiter,
+                )
+                if self.rate_limiter
+                else None
+            )
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
     def slug(self):
         return f"openai:{self.model_name}-batchsize:{self._model_batch_size}-concurrent:{self._n_concurrent_jobs}"
 
-    @retry(wait=wait_fixed(3), stop=stop_after_attempt(3))
+    @retry(wait=wait_fixed(3), stop=stop_after_attempt(3), before_sleep=_count_retry)
     async def _embed_batch(self, texts: list[str]) -> list[list[float]]:
         """Embed a single batch of texts."""
         async with self._semaphore:
@@ -45,15 +96,25 @@ class OpenAIEmbeddingModel(BaseEmbeddingModel):
                 logger.debug(
                     f"Embedding batch of {len(texts)} texts using model {self.model_name}"
                 )
-                resp = await self.client.embeddings.create(
-                    input=texts, model=self.model_name
-                )
+                with timer("kura_embedding_request_seconds", model=self.model_name):
+                    resp = await self.client.embeddings.create(
+                        input=texts, model=self.model_name
+                    )
+                inc("kura_embedded_texts_total", len(texts), model=self.model_name)
+                usage = getattr(resp, "usage", None)
+                if usage is not None and getattr(usage, "prompt_tokens", None):
+                    inc(
+                        "kura_embedding_tokens_total",
+                        usage.prompt_tokens,
+                        model=self.model_name,
+                    )
                 embeddings = [item.embedding for item in resp.data]
                 logger.debug(
                     f"Successfully embedded batch of {len(texts)} texts, got {len(embeddings)} embeddings"
                 )
                 return embeddings
             except Exception as e:
+                inc("kura_embedding_errors_total", model=self.model_name)
                 logger.error(f"Failed to embed batch of {len(texts)} texts: {e}")
                 raise
 
@@ -65,36 +126,56 @@ class OpenAIEmbeddingModel(BaseEmbeddingModel):
         logger.info(f"Starting embedding of {len(texts)} texts using {self.model_name}")
 
         # Create batches
-        batches = _batch_texts(texts, self._model_batch_size)
+        batches = _batch_texts_by_tokens(
+            texts, self._model_batch_size, self._max_batch_tokens
+        )
         logger.debug(
-            f"Split {len(texts)} texts into {len(batches)} batches of size {self._model_batch_size}"
+            f"Split {len(texts)} texts into {len(batches)} batches (max {self._model_batch_size} texts, ~{self._max_batch_tokens} tokens per batch)"
         )
 
-        results_list_of_lists = []
+        # Keep n_concurrent_jobs requests in flight at all times so a single
+        # slow request never holds back the batches queued behind it.
+        results: list[list[list[float]]] = [[] for _ in batches]
+        in_flight: dict[asyncio.Future, int] = {}
+        next_batch = 0
         processed_texts = 0
         total_texts = len(texts)
-        for start in range(0, len(batches), self._n_concurrent_jobs):
-            batch_group = batches[start : start + self._n_concurrent_jobs]
-            tasks = [self._embed_batch(b) for b in batch_group]
-            try:
-                batch_results = await gather(*tasks)
-                results_list_of_lists.extend(batch_results)
-            except Exception as e:
-                logger.error(f"Failed to embed texts: {e}")
-                raise
-            processed_texts += sum(len(b) for b in batch_group)
-            logger.info(f"Embedded {processed_texts}/{total_texts} texts")
-            if self._sleep_seconds > 0 and start + self._n_concurrent_jobs < len(
-                batches
-            ):
-                logger.info(
-                    f"Sleeping for {self._sleep_seconds} seconds between embedding batches"
+        try:
+            while next_batch < len(batches) or in_flight:
+                while (
+                    next_batch < len(batches)
+                    and len(in_flight) < self._n_concurrent_jobs
+                ):
+                    task = asyncio.ensure_future(self._embed_batch(batches[next_batch]))
+                    in_flight[task] = next_batch
+                    next_batch += 1
+                    if (
+                        self._sleep_seconds > 0
+                        and next_batch % self._n_concurrent_jobs == 0
+                        and next_batch < len(batches)
+                    ):
+                        logger.info(
+                            f"Sleeping for {self._sleep_seconds} seconds between embedding batches"
+                        )
+                        await asyncio.sleep(self._sleep_seconds)
+
+                done, _ = await asyncio.wait(
+                    in_flight, return_when=asyncio.FIRST_COMPLETED
                 )
-                await asyncio.sleep(self._sleep_seconds)
+                for task in done:
+                    index = in_flight.pop(task)
+                    results[index] = task.result()
+                    processed_texts += len(batches[index])
+                    logger.info(f"Embedded {processed_texts}/{total_texts} texts")
+        except Exception as e:
+            logger.error(f"Failed to embed texts: {e}")
+            for task in in_flight:
+                task.cancel()
+            raise
 
-        # Flatten results
+        # Flatten results back into input order
         embeddings = []
-        for result_batch in results_list_of_lists:
+        for result_batch in results:
             embeddings.extend(result_batch)
 
         logger.info(
@@ -103,6 +184,33 @@ class OpenAIEmbeddingModel(BaseEmbeddingModel):
         return embeddings
 
 
+def _batch_texts_by_tokens(
+    texts: list[str], max_batch_size: int, max_batch_tokens: Optional[int]
+) -> list[list[str]]:
+    """Divide texts into batches bounded by both item count and estimated tokens.
+
+    A single text larger than ``max_batch_tokens`` gets a batch of its own.
+    """
+    if max_batch_tokens is None:
+        return _batch_texts(texts, max_batch_size)
+
+    batches: list[list[str]] = []
+    batch: list[str] = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (
+            len(batch) >= max_batch_size or batch_tokens + tokens > max_batch_tokens
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 def _batch_texts(texts: list[str], batch_size: int) -> list[list[str]]:
     """Helper function to divide a list of texts into batches."""
     if not texts:
@@ -128,17 +236,28 @@ class SentenceTransformerEmbeddingModel(BaseEmbeddingModel):
         )
         try:
             self.model = SentenceTransformer(model_name)
+            self.model_name = model_name
             self._model_batch_size = model_batch_size
             logger.info(f"Successfully loaded SentenceTransformer model: {model_name}")
         except Exception as e:
             logger.error(f"Failed to load SentenceTransformer model {model_name}: {e}")
             raise
 
-    @retry(wait=wait_fixed(3), stop=stop_after_attempt(3))
     async def embed(self, texts: list[str]) -> list[list[float]]:
         if not texts:
             logger.debug("Empty text list provided, returning empty embeddings")
             return []
+        return (await self.embed_matrix(texts)).tolist()
+
+    @retry(wait=wait_fixed(3), stop=stop_after_attempt(3))
+    async def embed_matrix(
+        self, texts: list[str], ids: Optional[Sequence[str]] = None
+    ) -> EmbeddingMatrix:
+        import numpy as np
+
+        if not texts:
+            logger.debug("Empty text list provided, returning empty embeddings")
+            return EmbeddingMatrix([], ids)
 
         logger.info(
             f"Starting embedding of {len(texts)} texts using SentenceTransformer"
@@ -150,22 +269,214 @@ class SentenceTransformerEmbeddingModel(BaseEmbeddingModel):
             f"Split {len(texts)} texts into {len(batches)} batches of size {self._model_batch_size}"
         )
 
-        # Process all batches
+        # Process all batches, keeping the encoder's arrays as they are
         embeddings = []
         try:
             for i, batch in enumerate(batches):
                 logger.debug(
                     f"Processing batch {i + 1}/{len(batches)} with {len(batch)} texts"
                 )
-                batch_embeddings = self.model.encode(batch).tolist()
-                embeddings.extend(batch_embeddings)
+                # Encode in a worker thread so the event loop keeps serving
+                # in-flight requests; the model itself is not worth pickling
+                with timer("kura_embedding_request_seconds", model=self.model_name):
+                    batch_embeddings = await run_in_executor(
+                        self.model.encode, batch, process_safe=False
+                    )
+                inc("kura_embedded_texts_total", len(batch), model=self.model_name)
+                embeddings.append(np.asarray(batch_embeddings, dtype=np.float32))
                 logger.debug(f"Completed batch {i + 1}/{len(batches)}")
 
             logger.info(
-                f"Successfully embedded {len(texts)} texts using SentenceTransformer, produced {len(embeddings)} embeddings"
+                f"Successfully embedded {len(texts)} texts using SentenceTransformer, produced {len(texts)} embeddings"
             )
         except Exception as e:
             logger.error(f"Failed to embed texts using SentenceTransformer: {e}")
             raise
 
-        return embeddings
+        return EmbeddingMatrix(np.concatenate(embeddings), ids)
+
+
+class CachedEmbeddingModel(BaseEmbeddingModel):
+    """Wraps any embedding model with a persistent, content-addressed cache.
+
+    Vectors are keyed by ``(model slug, sha256(text))`` and stored as float32
+    blobs in a SQLite database. Only texts that miss the cache are sent to the
+    wrapped model. Once the cache grows beyond ``max_entries`` the least
+    recently used vectors are evicted.
+
+    Database reads and writes run in a worker thread so they never block the
+    event loop; a lock serialises them on the shared connection.
+    """
+
+    def __init__(
+        self,
+        embedding_model: BaseEmbeddingModel,
+        cache_dir: str = "./.kura_cache",
+        *,
+        max_entries: int = 1_000_000,
+        model_slug: Optional[str] = None,
+    ):
+        self.embedding_model = embedding_model
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.model_slug = model_slug or _embedding_model_slug(embedding_model)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, "embeddings.sqlite")
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used "
+            "ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        # Kept up to date on every write so enforcing max_entries needs no scan
+        (self._count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()
+        logger.info(
+            f"Initialized CachedEmbeddingModel for {self.model_slug} at {self.cache_path} with max_entries={max_entries}"
+        )
+
+    def slug(self):
+        return self.model_slug
+
+    def _cache_key(self, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model_slug}:{digest}"
+
+    def _lookup(self, keys: list[str]) -> dict[str, np.ndarray]:
+        import numpy as np
+
+        found: dict[str, np.ndarray] = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+        return found
+
+    def _store(self, entries: dict[str, Sequence[float]]) -> None:
+        import numpy as np
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in entries.items()
+        ]
+        with self._lock:
+            # Keys are content hashes, so a key stored concurrently by another
+            # call already holds the same vector and can be left as it is
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (key, vector, last_used) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._count += cursor.rowcount
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        overflow = self._count - self.max_entries
+        if overflow <= 0:
+            return
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (overflow,),
+        )
+        self._count -= cursor.rowcount
+        logger.debug(f"Evicted {overflow} least recently used embeddings from cache")
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            logger.debug("Empty text list provided, returning empty embeddings")
+            return []
+        return (await self.embed_matrix(texts)).tolist()
+
+    async def embed_matrix(
+        self, texts: list[str], ids: Optional[Sequence[str]] = None
+    ) -> EmbeddingMatrix:
+        import numpy as np
+
+        if not texts:
+            logger.debug("Empty text list provided, returning empty embeddings")
+            return EmbeddingMatrix([], ids)
+
+        keys = [self._cache_key(text) for text in texts]
+        cached = await run_in_executor(
+            self._lookup, list(dict.fromkeys(keys)), process_safe=False
+        )
+
+        # Deduplicate misses so repeated texts are only embedded once
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        hits = len(texts) - sum(1 for key in keys if key not in cached)
+        self.hits += hits
+        self.misses += len(texts) - hits
+        inc("kura_embedding_cache_total", hits, model=self.model_slug, result="hit")
+        inc(
+            "kura_embedding_cache_total",
+            len(texts) - hits,
+            model=self.model_slug,
+            result="miss",
+        )
+        logger.info(
+            f"Embedding cache for {self.model_slug}: {hits} hits, {len(texts) - hits} misses ({len(missing)} unique texts to embed)"
+        )
+
+        if missing:
+            new_embeddings = await self.embedding_model.embed_matrix(
+                list(missing.values())
+            )
+            if len(new_embeddings) != len(missing):
+                raise ValueError(
+                    f"Embedding model returned {len(new_embeddings)} embeddings for {len(missing)} texts"
+                )
+            fresh = dict(zip(missing.keys(), new_embeddings))
+            await run_in_executor(self._store, fresh, process_safe=False)
+            cached.update(fresh)
+
+        return EmbeddingMatrix(np.stack([cached[key] for key in keys]), ids)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _embedding_model_slug(model: BaseEmbeddingModel) -> str:
+    """Derive a stable cache namespace for an embedding model.
+
+    Prefer the model name over ``slug()`` since slugs may include settings such
+    as batch size that do not change the resulting vectors.
+    """
+    model_name = getattr(model, "model_name", None)
+    if model_name:
+        return f"{type(model).__name__}:{model_name}"
+    slug = getattr(model, "slug", None)
+    if callable(slug):
+        return str(slug())
+    return type(model).__name__
@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+from typing import Optional, Sequence, Union
+
+from kura.types.embedding import EmbeddingMatrix
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """Append-only on-disk embedding store keyed by chat id or cluster id.
+
+    Vectors are appended to a raw float32 file as they are computed and read
+    back through a read-only memory map, so a corpus larger than RAM can be
+    clustered: only the pages that are being used are loaded. Pair it with
+    ``KmeansClusteringMethod(minibatch=True)`` to fit k-means over the store in
+    chunks.
+
+    The store is a directory holding ``embeddings.f32`` (the vectors, one
+    row per id), ``ids.jsonl`` (the id of every row) and ``meta.json``. The
+    metadata file is rewritten atomically after each append and records how
+    much of the other two files is committed. Bytes left behind by an
+    interrupted append are ignored and overwritten by the next one.
+    """
+
+    def __init__(self, directory: str, *, dim: Optional[int] = None):
+        """
+        Args:
+            directory: Directory holding the store, created if missing
+            dim: Expected embedding dimension; taken from the first append if
+                not given
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.vectors_path = os.path.join(directory, "embeddings.f32")
+        self.ids_path = os.path.join(directory, "ids.jsonl")
+        self.meta_path = os.path.join(directory, "meta.json")
+
+        self._meta = {"dim": dim, "count": 0, "ids_bytes": 0}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self._meta = json.load(f)
+            if dim is not None and self._meta["dim"] not in (None, dim):
+                raise ValueError(
+                    f"Embedding store at {directory} has dimension {self._meta['dim']}, expected {dim}"
+                )
+
+        self._ids: list[str] = []
+        if self._meta["count"]:
+            with open(self.ids_path, "rb") as f:
+                content = f.read(self._meta["ids_bytes"])
+            self._ids = [json.loads(line) for line in content.splitlines()]
+        self._index = {id: row for row, id in enumerate(self._ids)}
+        logger.info(
+            f"Opened EmbeddingStore at {directory} with {len(self._ids)} embeddings (dim={self._meta['dim']})"
+        )
+
+    @property
+    def dim(self) -> Optional[int]:
+        return self._meta["dim"]
+
+    @property
+    def ids(self) -> list[str]:
+        return list(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self._index
+
+    def missing(self, ids: Sequence[str]) -> list[str]:
+        """The ids that don't have an embedding in the store yet."""
+        return [id for id in ids if id not in self._index]
+
+    def append(
+        self, ids: Sequence[str], embeddings: Union[EmbeddingMatrix, Sequence]
+    ) -> int:
+        """Store embeddings for ``ids``, skipping ids that are already stored.
+
+        Returns:
+            The number of embeddings added
+        """
+        import numpy as np
+
+        matrix = EmbeddingMatrix.from_embeddings(embeddings)
+        if len(matrix) != len(ids):
+            raise ValueError(f"Got {len(matrix)} embeddings for {len(ids)} ids")
+
+        rows = []
+        new_ids = []
+        seen = set()
+        for row, id in enumerate(ids):
+            if id not in self._index and id not in seen:
+                seen.add(id)
+                rows.append(row)
+                new_ids.append(id)
+        if not new_ids:
+            return 0
+
+        if self.dim is None:
+            self._meta["dim"] = matrix.dim
+        elif matrix.dim != self.dim:
+            raise ValueError(
+                f"Got embeddings of dimension {matrix.dim}, the store has dimension {self.dim}"
+            )
+
+        vectors = np.ascontiguousarray(matrix.vectors[rows])
+        id_payload = "".join(json.dumps(id) + "\n" for id in new_ids).encode()
+        vectors_bytes = self._meta["count"] * self.dim * 4
+        for path, committed, payload in (
+            (self.vectors_path, vectors_bytes, vectors.tobytes()),
+            (self.ids_path, self._meta["ids_bytes"], id_payload),
+        ):
+            with open(path, "ab") as f:
+                # Drop anything written by an interrupted append
+                f.truncate(committed)
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._meta["count"] += len(new_ids)
+        self._meta["ids_bytes"] += len(id_payload)
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.meta_path)
+
+        for id in new_ids:
+            self._index[id] = len(self._ids)
+            self._ids.append(id)
+        logger.debug(
+            f"Appended {len(new_ids)} embeddings to {self.directory} ({len(self._ids)} total)"
+        )
+        return len(new_ids)
+
+    def matrix(self) -> EmbeddingMatrix:
+        """Every stored embedding as a read-only, memory-mapped ``EmbeddingMatrix``."""
+        import numpy as np
+
+        if not self._ids:
+            return EmbeddingMatrix(np.empty((0, self.dim or 0), dtype=np.float32), [])
+        vectors = np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self._ids), self.dim),
+        )
+        return EmbeddingMatrix(vectors, self._ids)
+
+    def rows(self, ids: Sequence[str]) -> EmbeddingMatrix:
+        """Embeddings for ``ids``, in that order, copied into memory."""
+        return EmbeddingMatrix(self.matrix().rows(ids), ids)
@@ -0,0 +1,227 @@
+from kura.base_classes import BaseClusteringMethod
+from kura.k_means import group_by_label
+from kura.types.embedding import EmbeddingMatrix
+from kura.utils.executor import run_in_executor
+from typing import Literal, Optional, TypeVar
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HDBSCANClusteringMethod(BaseClusteringMethod):
+    """Density-based clustering that picks the number of clusters itself.
+
+    Unlike ``KmeansClusteringMethod`` which always produces
+    ``ceil(n / clusters_per_group)`` clusters, HDBSCAN only creates as many
+    clusters as there are dense regions in the data. Fewer, denser base
+    clusters mean fewer ``ClusterModel.generate_cluster`` calls.
+    """
+
+    def __init__(
+        self,
+        min_cluster_size: int = 10,
+        min_samples: Optional[int] = None,
+        *,
+        reduce_dimensionality: Optional[Literal["umap", "pca"]] = None,
+        n_components: int = 10,
+        metric: str = "euclidean",
+        cluster_selection_method: Literal["eom", "leaf"] = "eom",
+        core_dist_n_jobs: int = -1,
+        noise_strategy: Literal["nearest", "outlier"] = "nearest",
+    ):
+        """
+        Args:
+            min_cluster_size: Smallest group HDBSCAN will consider a cluster
+            min_samples: How conservative clustering is; defaults to min_cluster_size
+            reduce_dimensionality: Optionally project embeddings with UMAP or PCA
+                before clustering, which HDBSCAN handles far better than raw
+                high-dimensional embeddings
+            n_components: Target dimensionality when reducing
+            metric: Distance metric used by HDBSCAN
+            cluster_selection_method: HDBSCAN cluster selection method
+            core_dist_n_jobs: Parallel jobs for core distance computation (-1 uses all cores)
+            noise_strategy: "nearest" assigns noise points to the cluster with the
+                closest centroid, "outlier" groups them in one extra cluster
+        """
+        if reduce_dimensionality not in (None, "umap", "pca"):
+            raise ValueError(
+                f"Unknown reduce_dimensionality {reduce_dimensionality!r}, expected 'umap', 'pca' or None"
+            )
+        if noise_strategy not in ("nearest", "outlier"):
+            raise ValueError(
+                f"Unknown noise_strategy {noise_strategy!r}, expected 'nearest' or 'outlier'"
+            )
+
+        self.min_cluster_size = min_cluster_size
+        self.min_samples = min_samples
+        self.reduce_dimensionality = reduce_dimensionality
+        self.n_components = n_components
+        self.metric = metric
+        self.cluster_selection_method = cluster_selection_method
+        self.core_dist_n_jobs = core_dist_n_jobs
+        self.noise_strategy = noise_strategy
+        logger.info(
+            f"Initialized HDBSCANClusteringMethod with min_cluster_size={min_cluster_size}, min_samples={min_samples}, reduce_dimensionality={reduce_dimensionality}, n_components={n_components}, noise_strategy={noise_strategy}"
+        )
+
+    def _reduce(self, X: np.ndarray) -> np.ndarray:
+        n_components = min(self.n_components, X.shape[1])
+        if self.reduce_dimensionality is None or n_components >= X.shape[1]:
+            return X
+
+        if self.reduce_dimensionality == "pca":
+            from sklearn.decomposition import PCA
+
+            n_components = min(n_components, X.shape[0])
+            reduced = PCA(n_components=n_components).fit_transform(X)
+        else:
+            from umap import UMAP
+
+            reduced = UMAP(
+                n_components=n_components,
+                n_neighbors=min(15, X.shape[0] - 1),
+                min_dist=0.0,
+                metric="cosine",
+            ).fit_transform(X)
+
+        logger.debug(
+            f"Reduced embeddings with {self.reduce_dimensionality}: {X.shape} -> {reduced.shape}"  # type: ignore
+        )
+        return np.asarray(reduced, dtype=np.float32)
+
+    def cluster(self, items: list[T]) -> dict[int, list[T]]:
+        """
+        Cluster items in the same ``{"item": ..., "embedding": ...}`` format used
+        by ``KmeansClusteringMethod``.
+        """
+        if not items:
+            logger.warning("Empty items list provided to cluster method")
+            return {}
+
+        logger.info(f"Starting HDBSCAN clustering of {len(items)} items")
+
+        try:
+            data: list[T] = [item["item"] for item in items]  # pyright: ignore
+            X = np.asarray(
+                [item["embedding"] for item in items],  # pyright: ignore
+                dtype=np.float32,
+            )
+
+            if len(data) <= self.min_cluster_size:
+                logger.info(
+                    f"Only {len(data)} items (min_cluster_size={self.min_cluster_size}), returning a single cluster"
+                )
+                return {0: data}
+
+            labels, n_clusters = self.fit_predict(X)
+            return self._group(labels, data, n_clusters)
+
+        except Exception as e:
+            logger.error(
+                f"Failed to perform HDBSCAN clustering on {len(items)} items: {e}"
+            )
+            raise
+
+    async def cluster_async(self, items: list[T]) -> dict[int, list[T]]:
+        """Like ``cluster`` but runs HDBSCAN on the active executor."""
+        if not items:
+            logger.warning("Empty items list provided to cluster method")
+            return {}
+
+        embeddings = EmbeddingMatrix(
+            [item["embedding"] for item in items]  # pyright: ignore
+        )
+        data: list[T] = [item["item"] for item in items]  # pyright: ignore
+        return await self.cluster_matrix(embeddings, data)
+
+    async def cluster_matrix(
+        self, embeddings: EmbeddingMatrix, items: list[T]
+    ) -> dict[int, list[T]]:
+        """Cluster ``items`` using the rows of ``embeddings`` as their vectors.
+
+        Only the float32 embedding matrix is sent to the executor.
+        """
+        if not items:
+            logger.warning("Empty items list provided to cluster method")
+            return {}
+        if len(embeddings) != len(items):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(items)} items")
+
+        logger.info(f"Starting HDBSCAN clustering of {len(items)} items")
+        if len(items) <= self.min_cluster_size:
+            logger.info(
+                f"Only {len(items)} items (min_cluster_size={self.min_cluster_size}), returning a single cluster"
+            )
+            return {0: list(items)}
+
+        try:
+            labels, n_clusters = await run_in_executor(
+                self.fit_predict, embeddings.vectors
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to perform HDBSCAN clustering on {len(items)} items: {e}"
+            )
+            raise
+        return self._group(labels, items, n_clusters)
+
+    def fit_predict(self, X: np.ndarray) -> tuple[np.ndarray, int]:
+        """Return a cluster label for every row of ``X`` and the number of clusters.
+
+        Noise points are already resolved according to ``noise_strategy``.
+        """
+        from hdbscan import HDBSCAN
+
+        X = self._reduce(X)
+        labels = HDBSCAN(
+            min_cluster_size=self.min_cluster_size,
+            min_samples=self.min_samples,
+            metric=self.metric,
+            cluster_selection_method=self.cluster_selection_method,
+            core_dist_n_jobs=self.core_dist_n_jobs,
+        ).fit_predict(X)
+        return self._resolve_noise(X, np.asarray(labels))
+
+    def _group(
+        self, labels: np.ndarray, data: list[T], n_clusters: int
+    ) -> dict[int, list[T]]:
+        result = group_by_label(labels, data, n_clusters)
+
+        cluster_sizes = [len(cluster_items) for cluster_items in result.values()]
+        logger.info(
+            f"HDBSCAN clustering completed: {len(result)} clusters created with sizes {cluster_sizes}"
+        )
+        return result
+
+    def _resolve_noise(
+        self, X: np.ndarray, labels: np.ndarray
+    ) -> tuple[np.ndarray, int]:
+        """Replace HDBSCAN's -1 noise label according to ``noise_strategy``."""
+        noise = labels < 0
+        n_clusters = int(labels.max()) + 1 if (~noise).any() else 0
+        if not noise.any():
+            return labels, n_clusters
+
+        logger.info(
+            f"HDBSCAN found {n_clusters} clusters and {int(noise.sum())} noise points"
+        )
+        labels = labels.copy()
+        if n_clusters == 0 or self.noise_strategy == "outlier":
+            labels[noise] = n_clusters
+            return labels, n_clusters + 1
+
+        # Assign each noise point to the closest cluster centroid
+        counts = np.bincount(labels[~noise], minlength=n_clusters)
+        centroids = np.zeros((n_clusters, X.shape[1]), dtype=np.float64)
+        np.add.at(centroids, labels[~noise], X[~noise])
+        centroids /= counts[:, None]
+        distances = (
+            (X[noise] ** 2).sum(axis=1)[:, None]
+            - 2 * X[noise] @ centroids.T
+            + (centroids**2).sum(axis=1)[None, :]
+        )
+        labels[noise] = distances.argmin(axis=1)
+        return labels, n_clusters
@@ -1,7 +1,8 @@
 from kura.base_classes import BaseClusteringMethod
-from sklearn.cluster import KMeans
+from kura.types.embedding import EmbeddingMatrix
+from kura.utils.executor import run_in_executor
 import math
-from typing import TypeVar
+from typing import Sequence, TypeVar
 import numpy as np
 import logging
 
@@ -11,10 +12,28 @@ T = TypeVar("T")
 
 
 class KmeansClusteringMethod(BaseClusteringMethod):
-    def __init__(self, clusters_per_group: int = 10):
+    def __init__(
+        self,
+        clusters_per_group: int = 10,
+        *,
+        minibatch: bool = False,
+        batch_size: int = 4096,
+        n_epochs: int = 3,
+    ):
+        """
+        Args:
+            clusters_per_group: Target number of items per cluster
+            minibatch: Fit a MiniBatchKMeans incrementally over chunks of the
+                embeddings instead of running KMeans on the full dense matrix
+            batch_size: Number of embeddings per chunk in minibatch mode
+            n_epochs: Number of passes over the embeddings in minibatch mode
+        """
         self.clusters_per_group = clusters_per_group
+        self.minibatch = minibatch
+        self.batch_size = batch_size
+        self.n_epochs = n_epochs
         logger.info(
-            f"Initialized KmeansClusteringMethod with clusters_per_group={clusters_per_group}"
+            f"Initialized KmeansClusteringMethod with clusters_per_group={clusters_per_group}, minibatch={minibatch}, batch_size={batch_size}"
         )
 
     def cluster(self, items: list[T]) -> dict[int, list[T]]:
@@ -27,7 +46,7 @@ class KmeansClusteringMethod(BaseClusteringMethod):
         - the item itself stored in the "item" key.
 
         {
-            "embedding": list[float],
+            "embedding": list[float] | np.ndarray,
             "item": any,
         }
         """
@@ -46,34 +65,127 @@ class KmeansClusteringMethod(BaseClusteringMethod):
                 f"Calculated {n_clusters} clusters for {len(data)} items (target: {self.clusters_per_group} items per cluster)"
             )
 
-            X = np.array(embeddings)
-            logger.debug(f"Created embedding matrix of shape {X.shape}")
-
-            kmeans = KMeans(n_clusters=n_clusters)
-            cluster_labels = kmeans.fit_predict(X)
+            cluster_labels = self.fit_predict(embeddings, n_clusters)
+            return self._group(cluster_labels, data, n_clusters)
 
-            logger.debug(
-                f"K-means clustering completed, assigned {len(set(cluster_labels))} unique cluster labels"
+        except Exception as e:
+            logger.error(
+                f"Failed to perform K-means clustering on {len(items)} items: {e}"
             )
+            raise
 
-            result = {
-                i: [data[j] for j in range(len(data)) if cluster_labels[j] == i]
-                for i in range(n_clusters)
-            }
+    async def cluster_async(self, items: list[T]) -> dict[int, list[T]]:
+        """Like ``cluster`` but fits k-means on the active executor."""
+        if not items:
+            logger.warning("Empty items list provided to cluster method")
+            return {}
 
-            # Log cluster size distribution
-            cluster_sizes = [len(cluster_items) for cluster_items in result.values()]
-            logger.info(
-                f"K-means clustering completed: {len(result)} clusters created with sizes {cluster_sizes}"
-            )
-            logger.debug(
-                f"Cluster size stats - min: {min(cluster_sizes)}, max: {max(cluster_sizes)}, avg: {sum(cluster_sizes) / len(cluster_sizes):.1f}"
-            )
+        embeddings = EmbeddingMatrix(
+            [item["embedding"] for item in items]  # pyright: ignore
+        )
+        data: list[T] = [item["item"] for item in items]  # pyright: ignore
+        return await self.cluster_matrix(embeddings, data)
 
-            return result
+    async def cluster_matrix(
+        self, embeddings: EmbeddingMatrix, items: list[T]
+    ) -> dict[int, list[T]]:
+        """Cluster ``items`` using the rows of ``embeddings`` as their vectors.
 
+        Only the float32 matrix is sent to the executor, through shared memory
+        when it runs in a process pool.
+        """
+        if not items:
+            logger.warning("Empty items list provided to cluster method")
+            return {}
+        if len(embeddings) != len(items):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(items)} items")
+
+        logger.info(f"Starting K-means clustering of {len(items)} items")
+        if isinstance(embeddings.vectors, np.memmap) and not self.minibatch:
+            logger.warning(
+                "Fitting KMeans on a memory-mapped matrix reads it fully into memory, use minibatch=True to stream over it in chunks"
+            )
+        n_clusters = math.ceil(len(items) / self.clusters_per_group)
+        try:
+            cluster_labels = await run_in_executor(
+                self.fit_predict, embeddings.vectors, n_clusters
+            )
         except Exception as e:
             logger.error(
                 f"Failed to perform K-means clustering on {len(items)} items: {e}"
             )
             raise
+        return self._group(cluster_labels, items, n_clusters)
+
+    def fit_predict(self, embeddings: Sequence, n_clusters: int) -> np.ndarray:
+        """Return a cluster label for every embedding."""
+        if self.minibatch:
+            return self._fit_predict_minibatch(embeddings, n_clusters)
+
+        from sklearn.cluster import KMeans
+
+        X = np.asarray(embeddings, dtype=np.float32)
+        logger.debug(f"Created embedding matrix of shape {X.shape}")
+        return KMeans(n_clusters=n_clusters).fit_predict(X)
+
+    def _group(
+        self, cluster_labels: np.ndarray, data: list[T], n_clusters: int
+    ) -> dict[int, list[T]]:
+        logger.debug(
+            f"K-means clustering completed, assigned {len(np.unique(cluster_labels))} unique cluster labels"
+        )
+
+        result = group_by_label(cluster_labels, data, n_clusters)
+
+        # Log cluster size distribution
+        cluster_sizes = [len(cluster_items) for cluster_items in result.values()]
+        logger.info(
+            f"K-means clustering completed: {len(result)} clusters created with sizes {cluster_sizes}"
+        )
+        logger.debug(
+            f"Cluster size stats - min: {min(cluster_sizes)}, max: {max(cluster_sizes)}, avg: {sum(cluster_sizes) / len(cluster_sizes):.1f}"
+        )
+
+        return result
+
+    def _fit_predict_minibatch(
+        self, embeddings: Sequence, n_clusters: int
+    ) -> np.ndarray:
+        """Fit MiniBatchKMeans chunk by chunk so only one chunk is dense at a time."""
+        from sklearn.cluster import MiniBatchKMeans
+
+        # The first partial_fit call needs at least n_clusters samples
+        chunk_size = max(self.batch_size, n_clusters)
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=chunk_size)
+
+        for epoch in range(self.n_epochs):
+            for start in range(0, len(embeddings), chunk_size):
+                chunk = np.asarray(
+                    embeddings[start : start + chunk_size], dtype=np.float32
+                )
+                kmeans.partial_fit(chunk)
+            logger.debug(f"Completed minibatch k-means epoch {epoch + 1}")
+
+        labels = np.empty(len(embeddings), dtype=np.int64)
+        for start in range(0, len(embeddings), chunk_size):
+            chunk = np.asarray(embeddings[start : start + chunk_size], dtype=np.float32)
+            labels[start : start + len(chunk)] = kmeans.predict(chunk)
+        return labels
+
+
+def group_by_label(
+    labels: np.ndarray, data: Sequence[T], n_clusters: int
+) -> dict[int, list[T]]:
+    """Group items by cluster label in O(n log n) using a stable argsort.
+
+    Items keep their original relative order within each cluster and every
+    label in ``range(n_clusters)`` gets an entry, even if it is empty.
+    """
+    labels = np.asarray(labels)
+    order = np.argsort(labels, kind="stable")
+    counts = np.bincount(labels, minlength=n_clusters)
+    boundaries = np.cumsum(counts)[:-1]
+    return {
+        i: [data[j] for j in indices]
+        for i, indices in enumerate(np.split(order, boundaries))
+    }
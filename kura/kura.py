@@ -55,7 +55,7 @@ class Kura:
         summarisation_model: Union[BaseSummaryModel, None] = None,
         cluster_model: Union[BaseClusterModel, None] = None,
         meta_cluster_model: Union[BaseMetaClusterModel, None] = None,
-        dimensionality_reduction: BaseDimensionalityReduction = HDBUMAP(),
+        dimensionality_reduction: Union[BaseDimensionalityReduction, None] = None,
         checkpoint_dir: str = "./checkpoints",
         conversation_checkpoint_name: str = "conversations.json",
         disable_checkpoints: bool = False,
@@ -124,6 +124,8 @@ class Kura:
             )
         else:
             self.meta_cluster_model = meta_cluster_model
+        if dimensionality_reduction is None:
+            dimensionality_reduction = HDBUMAP()
         self.dimensionality_reduction = dimensionality_reduction
 
         # Define Checkpoints
@@ -8,14 +8,17 @@ from kura.base_classes import (
 import math
 from kura.types.cluster import Cluster, GeneratedCluster, MetaClusteringError
 from kura.embedding import OpenAIEmbeddingModel
-from kura.utils.openai_utils import create_instructor_client
+from kura.utils.openai_utils import create_http_client, create_instructor_client
+from kura.utils.concurrency import get_semaphore
+from kura.utils.metrics import InstrumentedClient
+from kura.utils.rate_limit import RateLimiter
 from asyncio import Semaphore
 from pydantic import BaseModel, field_validator, ValidationInfo
 import re
 from thefuzz import fuzz
 import asyncio
 import logging
-from typing import Optional, Union
+from typing import Awaitable, Optional, TypeVar, Union
 
 # Rich imports handled by Kura base class
 from typing import TYPE_CHECKING
@@ -25,6 +28,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class CandidateClusters(BaseModel):
     candidate_cluster_names: list[str]
@@ -69,6 +74,22 @@ class ClusterLabel(BaseModel):
         return v
 
 
+class BatchClusterLabel(BaseModel):
+    cluster_id: int
+    higher_level_cluster: str
+
+
+class BatchClusterLabels(BaseModel):
+    """Raw labels for a batch of clusters.
+
+    Candidate names are deliberately not validated here so that a single bad
+    label doesn't make the whole batch retry; ``label_cluster_batch`` checks
+    each item against ``ClusterLabel`` and only re-sends the failures.
+    """
+
+    labels: list[BatchClusterLabel]
+
+
 class MetaClusterModel(BaseMetaClusterModel):
     @property
     def checkpoint_filename(self) -> str:
@@ -79,34 +100,42 @@ class MetaClusterModel(BaseMetaClusterModel):
         self,
         max_concurrent_requests: int = 50,
         model: str = "openai/gpt-4o-mini",
-        embedding_model: BaseEmbeddingModel = OpenAIEmbeddingModel(),
+        embedding_model: Optional[BaseEmbeddingModel] = None,
         clustering_model: Union[BaseClusteringMethod, None] = None,
         max_clusters: int = 10,
         console: Optional["Console"] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        label_batch_size: int = 1,
+        max_label_retries: int = 3,
+        embedding_label_margin: Optional[float] = None,
+        concurrency_key: Optional[str] = None,
         **kwargs,  # For future use
     ):
+        if label_batch_size < 1:
+            raise ValueError("label_batch_size must be at least 1")
         if clustering_model is None:
             from kura.k_means import KmeansClusteringMethod
 
             clustering_model = KmeansClusteringMethod(12)
 
         self.max_concurrent_requests = max_concurrent_requests
-        self.sem = Semaphore(max_concurrent_requests)
-        self.client = create_instructor_client(model)
+        self.label_batch_size = label_batch_size
+        self.max_label_retries = max_label_retries
+        self.embedding_label_margin = embedding_label_margin
+        self.concurrency_key = concurrency_key
+        self.rate_limiter = rate_limiter
+        self._client = None
         self.console = console
         self.max_clusters = max_clusters
 
-        if embedding_model is None:
-            embedding_model = OpenAIEmbeddingModel()
-
-        self.embedding_model = embedding_model
+        self._embedding_model = embedding_model
         self.clustering_model = clustering_model
         self.model = model
         self.console = console
         self.errors: list[MetaClusteringError] = []
 
         logger.info(
-            f"Initialized MetaClusterModel with model={model}, max_concurrent_requests={max_concurrent_requests}, embedding_model={type(embedding_model).__name__}, clustering_model={type(clustering_model).__name__}, max_clusters={max_clusters}"
+            f"Initialized MetaClusterModel with model={model}, max_concurrent_requests={max_concurrent_requests}, embedding_model={type(embedding_model).__name__ if embedding_model is not None else 'OpenAIEmbeddingModel'}, clustering_model={type(clustering_model).__name__}, max_clusters={max_clusters}, label_batch_size={label_batch_size}"
         )
 
         # Debug: Check if console is set
@@ -115,6 +144,47 @@ class MetaClusterModel(BaseMetaClusterModel):
         else:
             logger.debug("Console is None - Rich progress bars will not be available")
 
+    @property
+    def embedding_model(self) -> BaseEmbeddingModel:
+        """The embedding model, an ``OpenAIEmbeddingModel`` created on first use by default."""
+        if self._embedding_model is None:
+            self._embedding_model = OpenAIEmbeddingModel()
+        return self._embedding_model
+
+    @embedding_model.setter
+    def embedding_model(self, embedding_model: BaseEmbeddingModel) -> None:
+        self._embedding_model = embedding_model
+
+    @property
+    def sem(self) -> Semaphore:
+        """Limits in-flight requests, shared by every model with the same ``concurrency_key``."""
+        return get_semaphore(self.concurrency_key or self, self.max_concurrent_requests)
+
+    @property
+    def client(self):
+        """The instructor client, created on first use."""
+        if self._client is None:
+            self._client = InstrumentedClient(
+                create_instructor_client(
+                    self.model,
+                    http_client=create_http_client(
+                        max_connections=self.max_concurrent_requests,
+                        rate_limiter=self.rate_limiter,
+                    )
+                    if self.rate_limiter
+                    else None,
+                ),
+                model=self.model,
+                operation="meta_cluster",
+            )
+            if self.rate_limiter is not None:
+                self._client = self.rate_limiter.wrap_client(self._client, self.model)
+        return self._client
+
+    @client.setter
+    def client(self, client) -> None:
+        self._client = client
+
     async def _gather_with_progress(
         self,
         tasks,
@@ -393,6 +463,190 @@ Based on this information, determine the most appropriate higher-level cluster a
                 # Use a placeholder label to keep pipeline moving
                 return {"cluster": cluster, "label": f"unlabeled_{cluster.id}"}
 
+    async def label_cluster_batch(
+        self, clusters: list[Cluster], candidate_clusters: list[str]
+    ) -> list[dict]:
+        """Assign several clusters to candidate names with one request per round.
+
+        Every label is validated with ``ClusterLabel``'s fuzzy matching on its
+        own. Clusters whose label is missing or invalid are re-sent in a smaller
+        batch, up to ``max_label_retries`` times, and then fall back to a
+        placeholder label like ``label_cluster`` does.
+        """
+        labels: dict[int, str] = {}
+        pending = list(range(len(clusters)))
+        last_error = "No label returned"
+
+        for attempt in range(self.max_label_retries + 1):
+            if not pending:
+                break
+            batch = [clusters[i] for i in pending]
+            try:
+                async with self.sem:
+                    resp = await self.client.chat.completions.create(
+                        messages=[
+                            {
+                                "role": "user",
+                                "content": """
+You are tasked with categorizing several specific clusters into the provided higher-level clusters for observability, monitoring, and content moderation. Your goal is to determine which higher-level cluster best fits each specific cluster based on its name and description.
+
+First, here are the ONLY valid higher-level clusters you may select from:
+<higher_level_clusters>
+{% for cluster in candidate_clusters %}
+<higher_level_cluster>{{ cluster }}</higher_level_cluster>
+{% endfor %}
+</higher_level_clusters>
+
+Here are the specific clusters to categorize:
+<specific_clusters>
+{% for cluster in clusters %}
+<specific_cluster id="{{ loop.index0 }}">
+Name: {{ cluster.name }}
+Description: {{ cluster.description }}
+</specific_cluster>
+{% endfor %}
+</specific_clusters>
+
+RULES:
+1. You MUST return exactly one label for every specific cluster, using its id as cluster_id
+2. You MUST select EXACTLY ONE higher-level cluster from the provided list for each specific cluster
+3. You MUST output the higher-level cluster name EXACTLY as written - no modifications allowed
+4. You MUST NOT create new cluster names or combinations
+5. You MUST NOT use partial matches or approximate names
+
+For each specific cluster, compare its key characteristics against each valid higher-level cluster and select the single most appropriate one that encompasses it.
+                            """,
+                            }
+                        ],
+                        response_model=BatchClusterLabels,
+                        context={
+                            "clusters": batch,
+                            "candidate_clusters": candidate_clusters,
+                        },
+                        max_retries=1,
+                    )
+            except Exception as e:
+                last_error = str(e)
+                logger.warning(
+                    f"Batch labelling of {len(batch)} clusters failed on attempt {attempt + 1}: {e}"
+                )
+                continue
+
+            failed = []
+            returned = {item.cluster_id: item for item in resp.labels}
+            for batch_index, cluster_index in enumerate(pending):
+                item = returned.get(batch_index)
+                if item is None:
+                    failed.append(cluster_index)
+                    continue
+                try:
+                    validated = ClusterLabel.model_validate(
+                        {"higher_level_cluster": item.higher_level_cluster},
+                        context={"candidate_clusters": candidate_clusters},
+                    )
+                except ValueError as e:
+                    last_error = str(e)
+                    failed.append(cluster_index)
+                    continue
+                labels[cluster_index] = validated.higher_level_cluster
+
+            if failed:
+                logger.debug(
+                    f"{len(failed)} of {len(batch)} batch labels were missing or invalid on attempt {attempt + 1}"
+                )
+            pending = failed
+
+        results = []
+        for i, cluster in enumerate(clusters):
+            if i in labels:
+                results.append({"cluster": cluster, "label": labels[i]})
+                continue
+            logger.error(f"Failed to label cluster {cluster.id}: {last_error}")
+            self.errors.append(
+                MetaClusteringError(cluster_ids=[cluster.id], error=last_error)
+            )
+            results.append({"cluster": cluster, "label": f"unlabeled_{cluster.id}"})
+        return results
+
+    async def assign_labels_by_embedding(
+        self, clusters: list[Cluster], candidate_clusters: list[str]
+    ) -> tuple[list[dict], list[Cluster]]:
+        """Assign clusters to candidate names by cosine similarity.
+
+        Both the candidate names and ``str(cluster)`` are embedded with
+        ``embedding_model``. A cluster is assigned to its most similar
+        candidate when it beats the runner-up by at least
+        ``embedding_label_margin``; the remaining ambiguous clusters are
+        returned so they can be labelled by the LLM.
+
+        Returns:
+            The assigned ``{"cluster", "label"}`` dicts and the ambiguous clusters
+        """
+        if self.embedding_label_margin is None or not clusters:
+            return [], list(clusters)
+
+        try:
+            embeddings = await self.embedding_model.embed_matrix(
+                list(candidate_clusters) + [str(cluster) for cluster in clusters]
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to embed clusters for label assignment, falling back to the LLM: {e}"
+            )
+            return [], list(clusters)
+
+        if len(embeddings) != len(candidate_clusters) + len(clusters):
+            logger.warning(
+                "Embedding count does not match candidates and clusters, falling back to the LLM"
+            )
+            return [], list(clusters)
+
+        import numpy as np
+
+        X = embeddings.vectors
+        X = X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+        candidates, items = X[: len(candidate_clusters)], X[len(candidate_clusters) :]
+        similarities = items @ candidates.T
+
+        best = similarities.argmax(axis=1)
+        if len(candidate_clusters) > 1:
+            top_two = np.sort(similarities, axis=1)[:, -2:]
+            confident = top_two[:, 1] - top_two[:, 0] >= self.embedding_label_margin
+        else:
+            confident = np.ones(len(clusters), dtype=bool)
+
+        assigned, ambiguous = [], []
+        for cluster, label_index, is_confident in zip(
+            clusters, best.tolist(), confident.tolist()
+        ):
+            if is_confident:
+                assigned.append(
+                    {"cluster": cluster, "label": candidate_clusters[label_index]}
+                )
+            else:
+                ambiguous.append(cluster)
+
+        logger.info(
+            f"Assigned {len(assigned)}/{len(clusters)} clusters by embedding similarity, {len(ambiguous)} ambiguous clusters left for the LLM"
+        )
+        return assigned, ambiguous
+
+    def _labelling_jobs(
+        self, clusters: list[Cluster], candidate_clusters: list[str]
+    ) -> list[Awaitable[list[dict]]]:
+        """One awaitable per labelling request, each returning labels in input order."""
+        if self.label_batch_size == 1:
+            return [
+                _as_list(self.label_cluster(cluster, candidate_clusters))
+                for cluster in clusters
+            ]
+        return [
+            self.label_cluster_batch(
+                clusters[start : start + self.label_batch_size], candidate_clusters
+            )
+            for start in range(0, len(clusters), self.label_batch_size)
+        ]
+
     async def rename_cluster_group(self, clusters: list[Cluster]) -> list[Cluster]:
         async with self.sem:
             try:
@@ -512,18 +766,31 @@ Based on this information, determine the most appropriate higher-level cluster a
                     with Live(layout, console=self.console, refresh_per_second=4):
                         # Step 1: Generate candidate clusters
                         candidate_labels = await self.generate_candidate_clusters(
-                            clusters, Semaphore(self.max_concurrent_requests)
+                            clusters, self.sem
                         )
 
                         # Step 2: Label clusters with progress
                         label_task_id = progress.add_task(
                             "[cyan]Labeling clusters...", total=len(clusters)
                         )
-                        cluster_labels = []
-                        for i, cluster in enumerate(clusters):
-                            result = await self.label_cluster(cluster, candidate_labels)
-                            cluster_labels.append(result)
-                            progress.update(label_task_id, completed=i + 1)
+                        # Run labelling concurrently (bounded by self.sem) and
+                        # update progress as each request completes
+                        assigned, ambiguous = await self.assign_labels_by_embedding(
+                            clusters, candidate_labels
+                        )
+                        progress.advance(label_task_id, len(assigned))
+                        jobs = self._labelling_jobs(ambiguous, candidate_labels)
+                        job_results: list[list[dict]] = [assigned] + [[] for _ in jobs]
+                        for task in asyncio.as_completed(
+                            [_indexed(j, job) for j, job in enumerate(jobs)]
+                        ):
+                            index, result = await task
+                            job_results[index + 1] = result
+                            progress.advance(label_task_id, len(result))
+                        cluster_labels = _in_input_order(
+                            clusters,
+                            [label for result in job_results for label in result],
+                        )
 
                         # Group clusters by label
                         label_to_clusters = {}
@@ -537,10 +804,18 @@ Based on this information, determine the most appropriate higher-level cluster a
                             "[cyan]Renaming cluster groups...",
                             total=len(label_to_clusters),
                         )
-                        new_clusters = []
-                        for i, cluster_group in enumerate(label_to_clusters.values()):
-                            result = await self.rename_cluster_group(cluster_group)
-                            new_clusters.append(result)
+                        groups = list(label_to_clusters.values())
+                        new_clusters = [[] for _ in groups]
+                        for i, task in enumerate(
+                            asyncio.as_completed(
+                                [
+                                    _indexed(j, self.rename_cluster_group(group))
+                                    for j, group in enumerate(groups)
+                                ]
+                            )
+                        ):
+                            index, result = await task
+                            new_clusters[index] = result
                             progress.update(rename_task_id, completed=i + 1)
 
                             # Update preview with new meta clusters
@@ -602,16 +877,20 @@ Based on this information, determine the most appropriate higher-level cluster a
         self, clusters: list[Cluster]
     ) -> list[Cluster]:
         """Fallback method for generate_meta_clusters when Live display is not available"""
-        candidate_labels = await self.generate_candidate_clusters(
-            clusters, Semaphore(self.max_concurrent_requests)
-        )
+        candidate_labels = await self.generate_candidate_clusters(clusters, self.sem)
 
-        cluster_labels = await self._gather_with_progress(
-            [self.label_cluster(cluster, candidate_labels) for cluster in clusters],
+        assigned, ambiguous = await self.assign_labels_by_embedding(
+            clusters, candidate_labels
+        )
+        job_results = await self._gather_with_progress(
+            self._labelling_jobs(ambiguous, candidate_labels),
             desc="Labeling clusters",
             disable=False,
             show_preview=False,  # Disable preview to avoid nested Live displays
         )
+        cluster_labels = _in_input_order(
+            clusters, assigned + [label for result in job_results for label in result]
+        )
 
         label_to_clusters = {}
         for label in cluster_labels:
@@ -662,25 +941,19 @@ Based on this information, determine the most appropriate higher-level cluster a
             f"Embedding {len(texts_to_embed)} clusters for meta-clustering using {type(self.embedding_model).__name__}..."
         )
 
-        cluster_embeddings = await self.embedding_model.embed(texts_to_embed)
+        cluster_embeddings = await self.embedding_model.embed_matrix(
+            texts_to_embed, [cluster.id for cluster in clusters]
+        )
 
-        if not cluster_embeddings or len(cluster_embeddings) != len(clusters):
+        if not len(cluster_embeddings) or len(cluster_embeddings) != len(clusters):
             logger.error(
                 "Error: Number of embeddings does not match number of clusters or embeddings are empty for meta-clustering."
             )
             return []
 
-        clusters_and_embeddings = [
-            {
-                "item": cluster,
-                "embedding": embedding,
-            }
-            for cluster, embedding in zip(clusters, cluster_embeddings)
-        ]
-
-        cluster_id_to_clusters: dict[int, list[Cluster]] = (
-            self.clustering_model.cluster(clusters_and_embeddings)
-        )  # type: ignore
+        cluster_id_to_clusters: dict[
+            int, list[Cluster]
+        ] = await self.clustering_model.cluster_matrix(cluster_embeddings, clusters)  # type: ignore
 
         new_clusters = await self._gather_with_progress(
             [
@@ -698,3 +971,18 @@ Based on this information, determine the most appropriate higher-level cluster a
             res.extend(new_cluster)
 
         return res
+
+
+async def _indexed(index: int, coro: Awaitable[T]) -> tuple[int, T]:
+    """Await ``coro`` and tag the result with its position for as_completed."""
+    return index, await coro
+
+
+async def _as_list(coro: Awaitable[T]) -> list[T]:
+    return [await coro]
+
+
+def _in_input_order(clusters: list[Cluster], labels: list[dict]) -> list[dict]:
+    """Sort ``{"cluster", "label"}`` dicts back into the order of ``clusters``."""
+    position = {id(cluster): i for i, cluster in enumerate(clusters)}
+    return sorted(labels, key=lambda label: position[id(label["cluster"])])
@@ -0,0 +1,490 @@
+import json
+import logging
+from typing import Any, Iterable, Iterator, Optional, Sequence, TypeVar
+
+from sqlalchemy import Index, delete, event, func, insert
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+from kura.cluster_tree import ClusterTree
+from kura.types import Cluster, Conversation, ConversationSummary, Message
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+_MAX_VARIABLES = 500
+
+
+class ConversationRecord(SQLModel, table=True):
+    """A conversation without its messages.
+
+    Timestamps are stored as ISO 8601 text so naive and timezone-aware
+    datetimes both round-trip unchanged.
+    """
+
+    __tablename__ = "conversations"
+
+    chat_id: str = Field(primary_key=True)
+    created_at: str = Field(index=True)
+    metadata_json: str = "{}"
+
+
+class MessageRecord(SQLModel, table=True):
+    __tablename__ = "messages"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    chat_id: str = Field(index=True)
+    position: int
+    created_at: str
+    role: str
+    content: str
+
+
+class SummaryRecord(SQLModel, table=True):
+    __tablename__ = "summaries"
+
+    chat_id: str = Field(primary_key=True)
+    summary: str
+    data: str
+
+
+class ClusterRecord(SQLModel, table=True):
+    """A cluster without its chat ids, which live in ``cluster_members``.
+
+    ``child_count`` and ``subtree_size`` are stored with the hierarchy so
+    listings don't have to walk it.
+    """
+
+    __tablename__ = "clusters"
+
+    id: str = Field(primary_key=True)
+    name: str
+    description: str
+    slug: str
+    parent_id: Optional[str] = Field(default=None, index=True)
+    count: int
+    child_count: int = 0
+    subtree_size: int = 1
+    position: int = Field(index=True)
+    x_coord: Optional[float] = None
+    y_coord: Optional[float] = None
+    level: Optional[int] = None
+
+
+class ClusterMemberRecord(SQLModel, table=True):
+    __tablename__ = "cluster_members"
+    __table_args__ = (Index("ix_cluster_members_chat_id", "chat_id"),)
+
+    cluster_id: str = Field(primary_key=True)
+    position: int = Field(primary_key=True)
+    chat_id: str
+
+
+class MetadataRecord(SQLModel, table=True):
+    """One metadata value of a conversation or summary, for indexed lookups.
+
+    List values are stored one element per row, so a lookup matches any
+    element. Values are JSON encoded so ``1``, ``"1"`` and ``true`` stay distinct.
+    """
+
+    __tablename__ = "metadata_values"
+    __table_args__ = (Index("ix_metadata_values_key_value", "key", "value"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    chat_id: str = Field(index=True)
+    source: str
+    key: str
+    value: str
+
+
+def _chunks(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _metadata_rows(chat_id: str, source: str, metadata: dict) -> list[dict[str, Any]]:
+    rows = []
+    for key, value in metadata.items():
+        for item in value if isinstance(value, list) else [value]:
+            rows.append(
+                {
+                    "chat_id": chat_id,
+                    "source": source,
+                    "key": key,
+                    "value": json.dumps(item),
+                }
+            )
+    return rows
+
+
+class SQLiteStore:
+    """SQLite database of conversations, summaries and the cluster hierarchy.
+
+    Unlike the JSONL checkpoints, lookups by chat id, cluster id, parent id
+    or metadata value use indexes and only read the rows they return, so the
+    web server and visualisations don't have to load a whole run into memory.
+    ``run_pipeline(..., sqlite_store=store)`` fills the store as it goes.
+
+    Example:
+        >>> store = SQLiteStore("./checkpoints/kura.db")
+        >>> store.add_conversations(conversations)
+        >>> store.cluster_chat_ids(cluster_id, limit=20)
+        >>> store.chat_ids_where("language", "python")
+    """
+
+    def __init__(self, path: str, *, echo: bool = False):
+        """
+        Args:
+            path: Database file, created with its tables if missing
+            echo: Log every SQL statement, for debugging
+        """
+        self.path = path
+        self.engine = create_engine(f"sqlite:///{path}", echo=echo)
+
+        @event.listens_for(self.engine, "connect")
+        def _configure(connection, _record):
+            cursor = connection.cursor()
+            # WAL lets the server read while a pipeline run is writing
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.close()
+
+        SQLModel.metadata.create_all(
+            self.engine,
+            tables=[
+                model.__table__
+                for model in (
+                    ConversationRecord,
+                    MessageRecord,
+                    SummaryRecord,
+                    ClusterRecord,
+                    ClusterMemberRecord,
+                    MetadataRecord,
+                )
+            ],
+        )
+        logger.info(f"Opened SQLiteStore at {path}")
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def add_conversations(
+        self, conversations: Iterable[Conversation], *, batch_size: int = 1000
+    ) -> int:
+        """Insert conversations and their messages, replacing any with the same chat id.
+
+        Returns:
+            The number of conversations written
+        """
+        total = 0
+        batch: list[Conversation] = []
+        for conversation in conversations:
+            batch.append(conversation)
+            if len(batch) >= batch_size:
+                total += self._write_conversations(batch)
+                batch = []
+        if batch:
+            total += self._write_conversations(batch)
+        logger.info(f"Wrote {total} conversations to {self.path}")
+        return total
+
+    def _write_conversations(self, conversations: list[Conversation]) -> int:
+        # Later duplicates win, as they would with one insert at a time
+        by_id = {c.chat_id: c for c in conversations}
+        chat_ids = list(by_id)
+        with Session(self.engine) as session:
+            for chunk in _chunks(chat_ids, _MAX_VARIABLES):
+                session.execute(
+                    delete(MessageRecord).where(MessageRecord.chat_id.in_(chunk))
+                )
+                session.execute(
+                    delete(MetadataRecord).where(
+                        MetadataRecord.chat_id.in_(chunk),
+                        MetadataRecord.source == "conversation",
+                    )
+                )
+            session.execute(
+                insert(ConversationRecord).prefix_with("OR REPLACE"),
+                [
+                    {
+                        "chat_id": c.chat_id,
+                        "created_at": c.created_at.isoformat(),
+                        "metadata_json": json.dumps(c.metadata),
+                    }
+                    for c in by_id.values()
+                ],
+            )
+            messages = [
+                {
+                    "chat_id": c.chat_id,
+                    "position": position,
+                    "created_at": message.created_at.isoformat(),
+                    "role": message.role,
+                    "content": message.content,
+                }
+                for c in by_id.values()
+                for position, message in enumerate(c.messages)
+            ]
+            if messages:
+                session.execute(insert(MessageRecord), messages)
+            self._insert_metadata(
+                session,
+                [
+                    row
+                    for c in by_id.values()
+                    for row in _metadata_rows(c.chat_id, "conversation", c.metadata)
+                ],
+            )
+            session.commit()
+        return len(by_id)
+
+    def add_summaries(
+        self, summaries: Iterable[ConversationSummary], *, batch_size: int = 1000
+    ) -> int:
+        """Insert summaries (without embeddings), replacing any with the same chat id.
+
+        Returns:
+            The number of summaries written
+        """
+        total = 0
+        batch: list[ConversationSummary] = []
+        for summary in summaries:
+            batch.append(summary)
+            if len(batch) >= batch_size:
+                total += self._write_summaries(batch)
+                batch = []
+        if batch:
+            total += self._write_summaries(batch)
+        logger.info(f"Wrote {total} summaries to {self.path}")
+        return total
+
+    def _write_summaries(self, summaries: list[ConversationSummary]) -> int:
+        by_id = {s.chat_id: s for s in summaries}
+        with Session(self.engine) as session:
+            for chunk in _chunks(list(by_id), _MAX_VARIABLES):
+                session.execute(
+                    delete(MetadataRecord).where(
+                        MetadataRecord.chat_id.in_(chunk),
+                        MetadataRecord.source == "summary",
+                    )
+                )
+            session.execute(
+                insert(SummaryRecord).prefix_with("OR REPLACE"),
+                [
+                    {
+                        "chat_id": s.chat_id,
+                        "summary": s.summary,
+                        "data": s.model_dump_json(exclude={"embedding"}),
+                    }
+                    for s in by_id.values()
+                ],
+            )
+            self._insert_metadata(
+                session,
+                [
+                    row
+                    for s in by_id.values()
+                    for row in _metadata_rows(s.chat_id, "summary", s.metadata)
+                ],
+            )
+            session.commit()
+        return len(by_id)
+
+    def _insert_metadata(self, session: Session, rows: list[dict[str, Any]]) -> None:
+        if rows:
+            session.execute(insert(MetadataRecord), rows)
+
+    def set_clusters(self, clusters: Sequence[Cluster]) -> None:
+        """Replace the stored cluster hierarchy with ``clusters``.
+
+        Pass the whole hierarchy (e.g. the meta clusters, or the projected
+        clusters to keep their coordinates), not just the changed clusters.
+        """
+        tree = ClusterTree(clusters)
+        with Session(self.engine) as session:
+            session.execute(delete(ClusterMemberRecord))
+            session.execute(delete(ClusterRecord))
+            if clusters:
+                session.execute(
+                    insert(ClusterRecord),
+                    [
+                        {
+                            "id": cluster.id,
+                            "name": cluster.name,
+                            "description": cluster.description,
+                            "slug": cluster.slug,
+                            "parent_id": cluster.parent_id or None,
+                            "count": tree.counts[i],
+                            "child_count": len(tree.children[i]),
+                            "subtree_size": tree.subtree_sizes[i],
+                            "position": i,
+                            "x_coord": getattr(cluster, "x_coord", None),
+                            "y_coord": getattr(cluster, "y_coord", None),
+                            "level": getattr(cluster, "level", None),
+                        }
+                        for i, cluster in enumerate(tree.clusters)
+                    ],
+                )
+            members = [
+                {"cluster_id": cluster.id, "position": position, "chat_id": chat_id}
+                for cluster in clusters
+                for position, chat_id in enumerate(cluster.chat_ids)
+            ]
+            if members:
+                session.execute(insert(ClusterMemberRecord), members)
+            session.commit()
+        logger.info(f"Wrote {len(clusters)} clusters to {self.path}")
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def conversation(self, chat_id: str) -> Optional[Conversation]:
+        with Session(self.engine) as session:
+            record = session.get(ConversationRecord, chat_id)
+            if record is None:
+                return None
+            messages = session.exec(
+                select(MessageRecord)
+                .where(MessageRecord.chat_id == chat_id)
+                .order_by(MessageRecord.position)
+            ).all()
+            return Conversation(
+                chat_id=record.chat_id,
+                created_at=record.created_at,
+                messages=[
+                    Message(
+                        created_at=message.created_at,
+                        role=message.role,
+                        content=message.content,
+                    )
+                    for message in messages
+                ],
+                metadata=json.loads(record.metadata_json),
+            )
+
+    def summary(self, chat_id: str) -> Optional[ConversationSummary]:
+        with Session(self.engine) as session:
+            record = session.get(SummaryRecord, chat_id)
+        if record is None:
+            return None
+        return ConversationSummary.model_validate_json(record.data)
+
+    def summaries(self, chat_ids: Sequence[str]) -> list[ConversationSummary]:
+        """Summaries for ``chat_ids``, in that order, skipping ids without one."""
+        found: dict[str, str] = {}
+        with Session(self.engine) as session:
+            for chunk in _chunks(list(chat_ids), _MAX_VARIABLES):
+                for chat_id, data in session.execute(
+                    select(SummaryRecord.chat_id, SummaryRecord.data).where(
+                        SummaryRecord.chat_id.in_(chunk)
+                    )
+                ):
+                    found[chat_id] = data
+        return [
+            ConversationSummary.model_validate_json(found[chat_id])
+            for chat_id in chat_ids
+            if chat_id in found
+        ]
+
+    def cluster(self, cluster_id: str) -> Optional[ClusterRecord]:
+        with Session(self.engine) as session:
+            return session.get(ClusterRecord, cluster_id)
+
+    def clusters(
+        self,
+        parent_id: Optional[str] = None,
+        *,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> list[ClusterRecord]:
+        """Children of ``parent_id`` (top-level clusters if None), in order."""
+        with Session(self.engine) as session:
+            query = (
+                select(ClusterRecord)
+                .where(ClusterRecord.parent_id == parent_id)
+                .order_by(ClusterRecord.position)
+                .offset(offset)
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            return list(session.exec(query).all())
+
+    def count_clusters(self, parent_id: Optional[str] = None) -> int:
+        with Session(self.engine) as session:
+            return session.exec(
+                select(func.count())
+                .select_from(ClusterRecord)
+                .where(ClusterRecord.parent_id == parent_id)
+            ).one()
+
+    def cluster_chat_ids(
+        self, cluster_id: str, *, offset: int = 0, limit: Optional[int] = None
+    ) -> list[str]:
+        with Session(self.engine) as session:
+            query = (
+                select(ClusterMemberRecord.chat_id)
+                .where(ClusterMemberRecord.cluster_id == cluster_id)
+                .order_by(ClusterMemberRecord.position)
+                .offset(offset)
+            )
+            if limit is not None:
+                query = query.limit(limit)
+            return list(session.exec(query).all())
+
+    def clusters_for_chat(self, chat_id: str) -> list[str]:
+        """Ids of every cluster, at any level, that contains ``chat_id``."""
+        with Session(self.engine) as session:
+            return list(
+                session.exec(
+                    select(ClusterMemberRecord.cluster_id).where(
+                        ClusterMemberRecord.chat_id == chat_id
+                    )
+                ).all()
+            )
+
+    def chat_ids_where(
+        self, key: str, value: Any, *, source: Optional[str] = None
+    ) -> list[str]:
+        """Chat ids whose metadata has ``value`` under ``key``.
+
+        Args:
+            key: Metadata field
+            value: Value to match; list fields match if any element equals it
+            source: ``"conversation"`` or ``"summary"`` to only search one kind
+                of metadata; both by default
+        """
+        with Session(self.engine) as session:
+            query = select(MetadataRecord.chat_id).where(
+                MetadataRecord.key == key, MetadataRecord.value == json.dumps(value)
+            )
+            if source is not None:
+                query = query.where(MetadataRecord.source == source)
+            return list(dict.fromkeys(session.exec(query).all()))
+
+    def cluster_tree(self) -> ClusterTree:
+        """The stored hierarchy as a ``ClusterTree``, without loading chat ids.
+
+        The clusters in the tree have empty ``chat_ids``; their sizes are in
+        ``ClusterTree.counts``.
+        """
+        with Session(self.engine) as session:
+            records = session.exec(
+                select(ClusterRecord).order_by(ClusterRecord.position)
+            ).all()
+        return ClusterTree(
+            [
+                Cluster(
+                    id=record.id,
+                    name=record.name,
+                    description=record.description,
+                    slug=record.slug,
+                    chat_ids=[],
+                    parent_id=record.parent_id,
+                )
+                for record in records
+            ],
+            counts=[record.count for record in records],
+        )
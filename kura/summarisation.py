@@ -1,7 +1,15 @@
 from asyncio import Semaphore, gather
 from typing import Callable, Optional, Union
 
-from kura.utils.openai_utils import create_instructor_client
+from kura.utils.openai_utils import (
+    close_stale_http_client,
+    create_http_client,
+    create_instructor_client,
+    require_http2,
+)
+from kura.utils.concurrency import get_semaphore
+from kura.utils.metrics import InstrumentedClient
+from kura.utils.rate_limit import RateLimiter
 from tqdm.asyncio import tqdm_asyncio
 import asyncio
 import logging
@@ -36,18 +44,88 @@ class SummaryModel(BaseSummaryModel):
             ]
         ] = [],
         console: Optional["Console"] = None,
+        *,
+        http2: bool = False,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency_key: Optional[str] = None,
         **kwargs,  # For future use
     ):
+        if http2:
+            require_http2()
         self.sems = None
         self.extractors = extractors
         self.max_concurrent_requests = max_concurrent_requests
+        self.concurrency_key = concurrency_key
         self.model = model
         self.console = console
         self.errors: list[SummarisationError] = []
+        self.http2 = http2
+        self.max_connections = max_connections or max_concurrent_requests
+        self.max_keepalive_connections = max_keepalive_connections
+        self.rate_limiter = rate_limiter
+        self._client = None
+        self._http_client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         logger.info(
-            f"Initialized SummaryModel with model={model}, max_concurrent_requests={max_concurrent_requests}, extractors={len(extractors)}"
+            f"Initialized SummaryModel with model={model}, max_concurrent_requests={max_concurrent_requests}, extractors={len(extractors)}, http2={http2}, max_connections={self.max_connections}"
         )
 
+    @property
+    def semaphore(self) -> Semaphore:
+        """Limits in-flight requests on the running event loop.
+
+        Shared by every model with the same ``concurrency_key``, so the
+        same model can be used across ``asyncio.run`` calls and concurrent runs.
+        """
+        return get_semaphore(self.concurrency_key or self, self.max_concurrent_requests)
+
+    def _get_client(self):
+        """Return the pooled instructor client bound to the running event loop.
+
+        The client and its HTTP connection pool are created on first use and
+        reused for every conversation. A new pool is created if the model is
+        reused from a different event loop, since connections cannot be shared
+        across loops; the old pool is closed if its loop is still running.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            if self._http_client is not None and self._client_loop is not None:
+                logger.debug(
+                    "Event loop changed, creating a new client connection pool"
+                )
+                close_stale_http_client(self._http_client, self._client_loop)
+            self._http_client = create_http_client(
+                http2=self.http2,
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                rate_limiter=self.rate_limiter,
+            )
+            self._client = InstrumentedClient(
+                create_instructor_client(self.model, http_client=self._http_client),
+                model=self.model,
+                operation="summarise",
+            )
+            if self.rate_limiter is not None:
+                self._client = self.rate_limiter.wrap_client(self._client, self.model)
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections held by this model."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._client = None
+        self._http_client = None
+        self._client_loop = None
+
+    async def __aenter__(self) -> "SummaryModel":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
     async def _gather_with_progress(
         self,
         tasks,
@@ -232,9 +310,6 @@ class SummaryModel(BaseSummaryModel):
     async def summarise(
         self, conversations: list[Conversation]
     ) -> list[ConversationSummary]:
-        # Initialise the Semaphore on each run so that it's attached to the same event loop
-        self.semaphore = asyncio.Semaphore(self.max_concurrent_requests)
-
         logger.info(
             f"Starting summarization of {len(conversations)} conversations using model {self.model}"
         )
@@ -332,7 +407,7 @@ class SummaryModel(BaseSummaryModel):
             f"Starting summarization of conversation {conversation.chat_id} with {len(conversation.messages)} messages"
         )
 
-        client = create_instructor_client(self.model)
+        client = self._get_client()
         async with self.semaphore:  # type: ignore
             try:
                 resp = await client.chat.completions.create(  # type: ignore
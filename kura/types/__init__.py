@@ -1,17 +1,21 @@
 from .conversation import Conversation, Message
 from .cluster import (
     Cluster,
+    ClusterCentroid,
     GeneratedCluster,
     ClusterTreeNode,
     ClusteringError,
     MetaClusteringError,
 )
 from .dimensionality import ProjectedCluster
+from .embedding import EmbeddingMatrix
 from .summarisation import ExtractedProperty, GeneratedSummary, ConversationSummary
 
 __all__ = [
     "Cluster",
+    "ClusterCentroid",
     "Conversation",
+    "EmbeddingMatrix",
     "Message",
     "GeneratedCluster",
     "ProjectedCluster",
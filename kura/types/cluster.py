@@ -39,6 +39,18 @@ class GeneratedCluster(BaseModel):
     )
 
 
+class ClusterCentroid(BaseModel):
+    """Mean embedding of the summaries in a base cluster.
+
+    ``count`` is the number of summaries the mean covers, so the centroid can
+    be updated as new conversations are assigned to the cluster.
+    """
+
+    cluster_id: str
+    centroid: list[float]
+    count: int
+
+
 class ClusterTreeNode(BaseModel):
     id: str
     name: str
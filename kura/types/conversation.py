@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Literal, Union, Callable
+from typing import IO, Any, Callable, Iterable, Iterator, Literal, Union
 import json
 import importlib
 from tqdm import tqdm
@@ -9,6 +9,9 @@ metadata_dict = dict[
     str, Union[str, int, float, bool, list[str], list[int], list[float]]
 ]
 
+# Bytes read at a time when streaming JSON exports
+_JSON_CHUNK_SIZE = 1 << 20
+
 
 class Message(BaseModel):
     created_at: datetime
@@ -37,8 +40,35 @@ class Conversation(BaseModel):
 
     @classmethod
     def from_conversation_dump(cls, file_path: str) -> list["Conversation"]:
+        return list(cls.iter_conversation_dump(file_path))
+
+    @classmethod
+    def iter_conversation_dump(cls, file_path: str) -> Iterator["Conversation"]:
+        """Yield conversations from a ``generate_conversation_dump`` file one at a time."""
+        with open(file_path, "r") as f:
+            for conversation in _iter_json_array(f):
+                yield Conversation(**conversation)
+
+    @classmethod
+    def generate_conversation_jsonl(
+        cls, conversations: Iterable["Conversation"], file_path: str
+    ) -> None:
+        """Write one conversation per line, without holding them all in memory."""
+        with open(file_path, "w") as f:
+            for conversation in conversations:
+                f.write(conversation.model_dump_json())
+                f.write("\n")
+
+    @classmethod
+    def from_conversation_jsonl(cls, file_path: str) -> list["Conversation"]:
+        return list(cls.iter_conversation_jsonl(file_path))
+
+    @classmethod
+    def iter_conversation_jsonl(cls, file_path: str) -> Iterator["Conversation"]:
         with open(file_path, "r") as f:
-            return [Conversation(**conversation) for conversation in json.load(f)]
+            for line in f:
+                if line.strip():
+                    yield Conversation.model_validate_json(line)
 
     @classmethod
     def from_hf_dataset(
@@ -51,6 +81,33 @@ class Conversation(BaseModel):
         messages_fn=lambda x: x["messages"],
         metadata_fn=lambda x: {},
     ) -> list["Conversation"]:
+        return list(
+            tqdm(
+                cls.iter_hf_dataset(
+                    dataset_name,
+                    split=split,
+                    max_conversations=max_conversations,
+                    chat_id_fn=chat_id_fn,
+                    created_at_fn=created_at_fn,
+                    messages_fn=messages_fn,
+                    metadata_fn=metadata_fn,
+                ),
+                desc="Loading Conversations",
+            )
+        )
+
+    @classmethod
+    def iter_hf_dataset(
+        cls,
+        dataset_name: str,
+        split: str = "train",
+        max_conversations: Union[int, None] = None,
+        chat_id_fn=lambda x: x["chat_id"],
+        created_at_fn=lambda x: x["created_at"],
+        messages_fn=lambda x: x["messages"],
+        metadata_fn=lambda x: {},
+    ) -> Iterator["Conversation"]:
+        """Yield conversations from a streamed Hugging Face dataset."""
         if importlib.util.find_spec("datasets") is None:  # type: ignore
             raise ImportError(
                 "Please install hf datasets to load conversations from a dataset"
@@ -64,15 +121,13 @@ class Conversation(BaseModel):
         else:
             dataset = load_dataset(dataset_name, split=split, streaming=True)
 
-        return [
-            Conversation(
+        for item in dataset:
+            yield Conversation(
                 chat_id=chat_id_fn(item),
                 created_at=created_at_fn(item),
                 messages=messages_fn(item),
                 metadata=metadata_fn(item),
             )
-            for item in tqdm(dataset, desc="Loading Conversations")
-        ]
 
     @classmethod
     def from_claude_conversation_dump(
@@ -80,38 +135,121 @@ class Conversation(BaseModel):
         file_path: str,
         metadata_fn: Callable[[dict], metadata_dict] = lambda x: {},
     ) -> list["Conversation"]:
+        return list(cls.iter_claude_conversation_dump(file_path, metadata_fn))
+
+    @classmethod
+    def iter_claude_conversation_dump(
+        cls,
+        file_path: str,
+        metadata_fn: Callable[[dict], metadata_dict] = lambda x: {},
+    ) -> Iterator["Conversation"]:
+        """Yield conversations from a Claude export one at a time.
+
+        The export is parsed incrementally, so only one conversation is held
+        in memory regardless of the size of the file.
+        """
         with open(file_path, "r") as f:
-            return [
-                Conversation(
-                    chat_id=conversation["uuid"],
-                    created_at=conversation["created_at"],
-                    messages=[
-                        Message(
-                            created_at=datetime.fromisoformat(
-                                message["created_at"].replace("Z", "+00:00")
-                            ),
-                            role="user"
-                            if message["sender"] == "human"
-                            else "assistant",
-                            content="\n".join(
-                                [
-                                    item["text"]
-                                    for item in message["content"]
-                                    if item["type"] == "text"
-                                ]
-                            ),
-                        )
-                        for message in sorted(
-                            conversation["chat_messages"],
-                            key=lambda x: (
-                                datetime.fromisoformat(
-                                    x["created_at"].replace("Z", "+00:00")
-                                ),
-                                0 if x["sender"] == "human" else 1,
-                            ),
-                        )
-                    ],
-                    metadata=metadata_fn(conversation),
+            for conversation in _iter_json_array(f):
+                yield cls.from_claude_conversation(conversation, metadata_fn)
+
+    @classmethod
+    def from_claude_conversation(
+        cls,
+        conversation: dict,
+        metadata_fn: Callable[[dict], metadata_dict] = lambda x: {},
+    ) -> "Conversation":
+        return Conversation(
+            chat_id=conversation["uuid"],
+            created_at=conversation["created_at"],
+            messages=[
+                Message(
+                    created_at=datetime.fromisoformat(
+                        message["created_at"].replace("Z", "+00:00")
+                    ),
+                    role="user" if message["sender"] == "human" else "assistant",
+                    content="\n".join(
+                        [
+                            item["text"]
+                            for item in message["content"]
+                            if item["type"] == "text"
+                        ]
+                    ),
                 )
-                for conversation in json.load(f)
-            ]
+                for message in sorted(
+                    conversation["chat_messages"],
+                    key=lambda x: (
+                        datetime.fromisoformat(x["created_at"].replace("Z", "+00:00")),
+                        0 if x["sender"] == "human" else 1,
+                    ),
+                )
+            ],
+            metadata=metadata_fn(conversation),
+        )
+
+
+def _iter_json_array(f: IO[str], chunk_size: int = _JSON_CHUNK_SIZE) -> Iterator[Any]:
+    """Incrementally decode the items of a top-level JSON array.
+
+    Reads ``f`` in chunks and decodes one item at a time with
+    ``JSONDecoder.raw_decode``. If an item spans past the end of the buffer,
+    at least as much data as is already buffered is read before retrying.
+    This keeps decoding linear even for items much larger than ``chunk_size``.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill(min_size: int) -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        data = f.read(max(chunk_size, min_size))
+        if not data:
+            eof = True
+            return False
+        buffer = buffer[pos:] + data
+        pos = 0
+        return True
+
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or not fill(0):
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+
+    skip_whitespace()
+    if pos < len(buffer) and buffer[pos] == "]":
+        return
+
+    while True:
+        skip_whitespace()
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if not fill(len(buffer) - pos):
+                raise
+            continue
+        # A number at the very end of the buffer may be truncated
+        if end == len(buffer) and not eof and fill(0):
+            continue
+        yield item
+        pos = end
+
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of JSON array")
+        if buffer[pos] == "]":
+            return
+        if buffer[pos] != ",":
+            raise ValueError(
+                f"Expected ',' or ']' in JSON array, found {buffer[pos]!r}"
+            )
+        pos += 1
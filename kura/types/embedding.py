@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class EmbeddingMatrix:
+    """A contiguous float32 matrix of embeddings with an optional id index.
+
+    Stores one row per embedded item instead of a Python list of floats per
+    vector, which takes roughly 8x less memory and can be handed to numpy,
+    scikit-learn and UMAP without a copy. ``ids`` (e.g. chat ids or cluster
+    ids) map rows back to the items they were computed for.
+
+    The matrix can be backed by a memory-mapped ``.npy`` file (see ``save``
+    and ``load``), in which case rows are only read from disk when accessed.
+    It behaves like a read-only sequence of rows, so code written for
+    ``list[list[float]]`` (``len``, indexing, slicing, ``np.asarray``) keeps
+    working.
+    """
+
+    def __init__(self, vectors, ids: Optional[Sequence[str]] = None):
+        import numpy as np
+
+        # float32 arrays are kept as they are, so memmaps stay memory-mapped
+        if isinstance(vectors, np.ndarray) and vectors.dtype == np.float32:
+            array = vectors
+        else:
+            array = np.asarray(vectors, dtype=np.float32)
+        if array.ndim == 1 and array.size == 0:
+            array = array.reshape(0, 0)
+        if array.ndim != 2:
+            raise ValueError(f"Expected a 2D embedding matrix, got shape {array.shape}")
+        if not array.flags.c_contiguous:
+            array = np.ascontiguousarray(array)
+        if ids is not None and len(ids) != len(array):
+            raise ValueError(f"Got {len(ids)} ids for {len(array)} embeddings")
+
+        self._vectors = array
+        self._ids = list(ids) if ids is not None else None
+        self._index: Optional[dict[str, int]] = None
+
+    @classmethod
+    def from_embeddings(
+        cls,
+        embeddings: Union["EmbeddingMatrix", Sequence[Sequence[float]], np.ndarray],
+        ids: Optional[Sequence[str]] = None,
+    ) -> "EmbeddingMatrix":
+        """Wrap embeddings in any supported format, without copying if possible."""
+        if isinstance(embeddings, EmbeddingMatrix):
+            if ids is None or embeddings.ids == list(ids):
+                return embeddings
+            return cls(embeddings.vectors, ids)
+        return cls(embeddings, ids)
+
+    @classmethod
+    def concatenate(cls, matrices: Sequence["EmbeddingMatrix"]) -> "EmbeddingMatrix":
+        """Stack matrices row-wise. Ids are kept only if every matrix has them."""
+        import numpy as np
+
+        matrices = [m for m in matrices if len(m)]
+        if not matrices:
+            return cls(np.empty((0, 0), dtype=np.float32))
+        if len(matrices) == 1:
+            return matrices[0]
+        ids = (
+            [i for m in matrices for i in m.ids]  # type: ignore[union-attr]
+            if all(m.ids is not None for m in matrices)
+            else None
+        )
+        return cls(np.concatenate([m.vectors for m in matrices]), ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The underlying ``(n, dim)`` float32 array."""
+        return self._vectors
+
+    @property
+    def ids(self) -> Optional[list[str]]:
+        return self._ids
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._vectors.shape  # type: ignore[return-value]
+
+    @property
+    def dim(self) -> int:
+        return self._vectors.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._vectors.nbytes
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __getitem__(self, index):
+        return self._vectors[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self._vectors)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or self._vectors.dtype == dtype:
+            return self._vectors.copy() if copy else self._vectors
+        return self._vectors.astype(dtype)
+
+    def __repr__(self) -> str:
+        return f"EmbeddingMatrix(shape={self.shape}, ids={'yes' if self._ids is not None else 'no'})"
+
+    def index_of(self, id: str) -> int:
+        """Row of the embedding computed for ``id``."""
+        if self._ids is None:
+            raise ValueError("This EmbeddingMatrix has no ids")
+        if self._index is None:
+            self._index = {id: row for row, id in enumerate(self._ids)}
+        return self._index[id]
+
+    def rows(self, ids: Sequence[str]) -> np.ndarray:
+        """Embeddings for ``ids``, in that order."""
+        return self._vectors[[self.index_of(id) for id in ids]]
+
+    def tolist(self) -> list[list[float]]:
+        return self._vectors.tolist()
+
+    def save(self, path: str) -> None:
+        """Write the vectors to ``path`` (``.npy``) and the ids to a sidecar file."""
+        import numpy as np
+
+        # Write through a file object so numpy doesn't append ".npy" to path
+        with open(path, "wb") as f:
+            np.save(f, self._vectors)
+        ids_path = _ids_path(path)
+        if self._ids is not None:
+            with open(ids_path, "w") as f:
+                json.dump(self._ids, f)
+        elif os.path.exists(ids_path):
+            os.remove(ids_path)
+
+    @classmethod
+    def load(cls, path: str, *, mmap_mode: Optional[str] = "r") -> "EmbeddingMatrix":
+        """Load a matrix written by ``save``, memory-mapped by default."""
+        import numpy as np
+
+        vectors = np.load(path, mmap_mode=mmap_mode)
+        ids = None
+        if os.path.exists(_ids_path(path)):
+            with open(_ids_path(path)) as f:
+                ids = json.load(f)
+        return cls(vectors, ids)
+
+
+def _ids_path(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}.ids.json"
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+import weakref
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Semaphores are bound to the event loop they are first used on, so they are
+# kept per loop and dropped together with it
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+# Semaphores of models without a concurrency key are also dropped together
+# with the model, so creating models on a long-running loop doesn't leak them
+_owned_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, weakref.WeakKeyDictionary[object, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+_limits: dict[str, int] = {}
+
+
+def set_concurrency_limit(key: str, limit: Optional[int]) -> None:
+    """Set a process-wide limit on in-flight requests for ``key``.
+
+    Every model created with ``concurrency_key=key`` then shares a single
+    semaphore of this size on each event loop, whatever its own
+    ``max_concurrent_requests`` is. The limit applies per event loop: runs on
+    separate loops (e.g. ``asyncio.run`` in several threads) each get the
+    full limit. Passing ``None`` removes the override. Semaphores that
+    already exist keep their size, so set limits before starting pipeline
+    runs.
+
+    Example:
+        >>> set_concurrency_limit("openai", 100)
+        >>> summary_model = SummaryModel(concurrency_key="openai")
+        >>> cluster_model = ClusterModel(concurrency_key="openai")
+    """
+    if limit is None:
+        _limits.pop(key, None)
+        return
+    if limit < 1:
+        raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+    _limits[key] = limit
+    logger.info(f"Set concurrency limit for {key} to {limit}")
+
+
+def get_semaphore(key: Union[str, object], limit: int) -> asyncio.Semaphore:
+    """The semaphore for ``key`` on the running event loop, created on first use.
+
+    ``key`` is either a shared name or the model that owns the semaphore.
+    Callers sharing a name share the semaphore, so the first one to use it
+    decides its size unless a limit was set with ``set_concurrency_limit``.
+    A semaphore owned by a model is only held as long as the model is.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(key, str):
+        semaphores = _semaphores.setdefault(loop, {})
+        size = _limits.get(key, limit)
+    else:
+        semaphores = _owned_semaphores.setdefault(loop, weakref.WeakKeyDictionary())
+        size = limit
+    semaphore = semaphores.get(key)
+    if semaphore is None:
+        semaphore = semaphores[key] = asyncio.Semaphore(size)
+        name = key if isinstance(key, str) else type(key).__name__
+        logger.debug(f"Created semaphore for {name} with limit {size}")
+    return semaphore
@@ -0,0 +1,224 @@
+import asyncio
+import contextvars
+import logging
+import mmap
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterator, Literal, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+_current_executor: contextvars.ContextVar[Optional["PipelineExecutor"]] = (
+    contextvars.ContextVar("kura_pipeline_executor", default=None)
+)
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Handle to a numpy array stored in a ``multiprocessing`` shared memory block."""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class MappedArray:
+    """Handle to a read-only numpy memmap that workers reopen from its file."""
+
+    filename: str
+    offset: int
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class PipelineExecutor:
+    """Runs CPU-bound pipeline stages off the event loop.
+
+    ``kind="thread"`` uses a thread pool, which is enough for work that
+    releases the GIL (BLAS-backed k-means, SentenceTransformer inference).
+    ``kind="process"`` uses a process pool for work that holds the GIL; numpy
+    arrays of at least ``shared_memory_min_bytes`` are passed to workers
+    through shared memory instead of being pickled. Memory-mapped arrays
+    (e.g. from an ``EmbeddingStore``) are reopened from their file by the
+    worker, so they are never copied.
+
+    Activate an executor for a pipeline run with ``use_executor`` or by passing
+    ``executor=`` to the procedural pipeline functions.
+    """
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: Optional[int] = None,
+        *,
+        shared_memory_min_bytes: int = 1 << 20,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(
+                f"Unknown executor kind {kind!r}, expected 'thread' or 'process'"
+            )
+
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.shared_memory_min_bytes = shared_memory_min_bytes
+        self._pool: Optional[Executor] = None
+        logger.info(
+            f"Initialized PipelineExecutor with kind={kind}, max_workers={self.max_workers}"
+        )
+
+    @property
+    def uses_processes(self) -> bool:
+        return self.kind == "process"
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.uses_processes:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="kura"
+                )
+        return self._pool
+
+    async def run(self, fn: Callable[..., R], *args: Any) -> R:
+        """Run ``fn(*args)`` in the pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        if not self.uses_processes:
+            return await loop.run_in_executor(self._get_pool(), fn, *args)
+
+        blocks: list[shared_memory.SharedMemory] = []
+        try:
+            shared_args = tuple(self._share(arg, blocks) for arg in args)
+            if blocks:
+                logger.debug(
+                    f"Passing {len(blocks)} arrays to {getattr(fn, '__name__', fn)} through shared memory"
+                )
+            return await loop.run_in_executor(
+                self._get_pool(), _call_with_shared_arrays, fn, shared_args
+            )
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _share(self, arg: Any, blocks: list[shared_memory.SharedMemory]) -> Any:
+        import numpy as np
+
+        # Only a memmap that owns its mapping describes a whole region of its
+        # file; slices of it are copied like any other array
+        if (
+            isinstance(arg, np.memmap)
+            and isinstance(arg.base, mmap.mmap)
+            and arg.filename is not None
+            and arg.flags.c_contiguous
+        ):
+            return MappedArray(
+                filename=arg.filename,
+                offset=arg.offset,
+                shape=arg.shape,
+                dtype=arg.dtype.str,
+            )
+
+        if (
+            not isinstance(arg, np.ndarray)
+            or arg.dtype.hasobject
+            or arg.nbytes < self.shared_memory_min_bytes
+        ):
+            return arg
+
+        block = shared_memory.SharedMemory(create=True, size=arg.nbytes)
+        blocks.append(block)
+        np.ndarray(arg.shape, dtype=arg.dtype, buffer=block.buf)[...] = arg
+        return SharedArray(name=block.name, shape=arg.shape, dtype=arg.dtype.str)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+    def __enter__(self) -> "PipelineExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
+
+
+def _call_with_shared_arrays(fn: Callable[..., R], args: tuple) -> R:
+    """Worker entry point that maps ``SharedArray`` and ``MappedArray`` handles back to arrays."""
+    import numpy as np
+
+    blocks = []
+    resolved = []
+    for arg in args:
+        if isinstance(arg, SharedArray):
+            block = shared_memory.SharedMemory(name=arg.name)
+            blocks.append(block)
+            resolved.append(np.ndarray(arg.shape, dtype=arg.dtype, buffer=block.buf))
+        elif isinstance(arg, MappedArray):
+            resolved.append(
+                np.memmap(
+                    arg.filename,
+                    dtype=arg.dtype,
+                    mode="r",
+                    offset=arg.offset,
+                    shape=arg.shape,
+                )
+            )
+        else:
+            resolved.append(arg)
+
+    try:
+        result = fn(*resolved)
+        # Never hand back a view into memory that is about to be released
+        if isinstance(result, np.ndarray) and any(
+            np.shares_memory(result, a) for a in resolved if isinstance(a, np.ndarray)
+        ):
+            result = result.copy()
+        return result
+    finally:
+        del resolved
+        for block in blocks:
+            block.close()
+
+
+def get_executor() -> Optional[PipelineExecutor]:
+    """The executor active for the current pipeline run, if any."""
+    return _current_executor.get()
+
+
+@contextmanager
+def use_executor(executor: Optional[PipelineExecutor]) -> Iterator[None]:
+    """Run CPU-bound stages inside this block on ``executor``.
+
+    Passing ``None`` keeps whichever executor is already active.
+    """
+    if executor is None:
+        yield
+        return
+    token = _current_executor.set(executor)
+    try:
+        yield
+    finally:
+        _current_executor.reset(token)
+
+
+async def run_in_executor(
+    fn: Callable[..., R], *args: Any, process_safe: bool = True
+) -> R:
+    """Run a blocking call off the event loop.
+
+    Uses the active ``PipelineExecutor`` if there is one and the event loop's
+    default thread pool otherwise. Callables that can't be pickled, or whose
+    arguments are expensive to pickle (e.g. a loaded model), should pass
+    ``process_safe=False`` to always run in a thread.
+    """
+    executor = get_executor()
+    if executor is not None and (process_safe or not executor.uses_processes):
+        return await executor.run(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
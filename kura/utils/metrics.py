@@ -0,0 +1,453 @@
+import asyncio
+import bisect
+import contextvars
+import functools
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, TypeVar
+
+from kura.utils.openai_utils import InterceptedClient
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Upper bounds in seconds, from fast local calls to slow LLM requests and stages
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    """Counts of observations per bucket, plus their count, sum, min and max."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                lower, upper = max(lower, self.min), min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class Gauge:
+    value: float = 0.0
+    max: float = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+        self.max = max(self.max, value)
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms keyed by metric name and labels.
+
+    Metrics are recorded through the module-level ``inc``, ``set_gauge`` and
+    ``observe`` functions, which write to the process-wide registry returned
+    by ``get_metrics`` and to the registry of any ``collect_metrics`` block
+    that is active in the current context.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.gauges: dict[str, dict[Labels, Gauge]] = {}
+        self.histograms: dict[str, dict[Labels, Histogram]] = {}
+        self.started_at = time.time()
+
+    def inc(self, name: str, amount: float = 1.0, **labels: Any) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            self.gauges.setdefault(name, {}).setdefault(_labels(labels), Gauge()).set(
+                value
+            )
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = _labels(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Every metric as plain JSON-serialisable data."""
+        with self._lock:
+            return {
+                "started_at": datetime.fromtimestamp(
+                    self.started_at, timezone.utc
+                ).isoformat(),
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "counters": {
+                    name: [
+                        {"labels": dict(key), "value": value}
+                        for key, value in series.items()
+                    ]
+                    for name, series in sorted(self.counters.items())
+                },
+                "gauges": {
+                    name: [
+                        {"labels": dict(key), "value": gauge.value, "max": gauge.max}
+                        for key, gauge in series.items()
+                    ]
+                    for name, series in sorted(self.gauges.items())
+                },
+                "histograms": {
+                    name: [
+                        {"labels": dict(key), **histogram.to_dict()}
+                        for key, histogram in series.items()
+                    ]
+                    for name, series in sorted(self.histograms.items())
+                },
+            }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        logger.info(f"Wrote metrics report to {path}")
+
+    def to_prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                for key, gauge in series.items():
+                    lines.append(f"{name}{_format_labels(key)} {gauge.value:g}")
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        le = _format_labels(key + (("le", f"{bound:g}"),))
+                        lines.append(f"{name}_bucket{le} {cumulative}")
+                    le = _format_labels(key + (("le", "+Inf"),))
+                    lines.append(f"{name}_bucket{le} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+# Written next to the checkpoints at the end of every `run_pipeline`
+METRICS_FILENAME = "metrics.json"
+
+_metrics = MetricsRegistry()
+_collectors: contextvars.ContextVar[tuple[MetricsRegistry, ...]] = (
+    contextvars.ContextVar("kura_metrics_collectors", default=())
+)
+
+
+def get_metrics() -> MetricsRegistry:
+    """The process-wide registry, holding everything recorded since start-up."""
+    return _metrics
+
+
+def _registries() -> tuple[MetricsRegistry, ...]:
+    return (_metrics, *_collectors.get())
+
+
+def inc(name: str, amount: float = 1.0, **labels: Any) -> None:
+    for registry in _registries():
+        registry.inc(name, amount, **labels)
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    for registry in _registries():
+        registry.set_gauge(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    for registry in _registries():
+        registry.observe(name, value, **labels)
+
+
+@contextmanager
+def timer(name: str, **labels: Any) -> Iterator[None]:
+    """Observe the wall time of the block in seconds, even if it raises."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[MetricsRegistry]:
+    """Also record metrics from this block, and tasks it starts, into a fresh registry.
+
+    Example:
+        >>> with collect_metrics() as run_metrics:
+        ...     await run_pipeline(...)
+        >>> run_metrics.write_json("metrics.json")
+    """
+    registry = MetricsRegistry()
+    token = _collectors.set((*_collectors.get(), registry))
+    try:
+        yield registry
+    finally:
+        _collectors.reset(token)
+
+
+def timed_stage(stage: str) -> Callable[[F], F]:
+    """Time every call of an async pipeline step as ``kura_stage_seconds``."""
+
+    def decorator(fn: F) -> F:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with timer("kura_stage_seconds", stage=stage):
+                return await fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@asynccontextmanager
+async def monitor_event_loop_lag(interval: float = 0.1) -> AsyncIterator[None]:
+    """Sample how late the event loop wakes up while the block runs.
+
+    A sleep of ``interval`` that takes longer means something blocked the
+    loop (e.g. CPU-bound work on the loop thread); the overshoot is observed
+    as ``kura_event_loop_lag_seconds``.
+    """
+
+    async def sample() -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            observe(
+                "kura_event_loop_lag_seconds",
+                max(0.0, time.perf_counter() - start - interval),
+            )
+
+    task = asyncio.ensure_future(sample())
+    try:
+        yield
+    finally:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+# -----------------------------------------------------------------------------
+# LLM client instrumentation
+# -----------------------------------------------------------------------------
+
+
+@dataclass
+class _Call:
+    model: str
+    operation: str
+    attempts: int = 0
+
+
+_current_call: contextvars.ContextVar[Optional[_Call]] = contextvars.ContextVar(
+    "kura_current_llm_call", default=None
+)
+
+
+def _usage_tokens(response: Any) -> tuple[Optional[int], Optional[int]]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None, None
+    # OpenAI style first, then Anthropic style
+    tokens_in = getattr(usage, "prompt_tokens", None)
+    if tokens_in is None:
+        tokens_in = getattr(usage, "input_tokens", None)
+    tokens_out = getattr(usage, "completion_tokens", None)
+    if tokens_out is None:
+        tokens_out = getattr(usage, "output_tokens", None)
+    return tokens_in, tokens_out
+
+
+def _on_attempt(*args, **kwargs) -> None:
+    call = _current_call.get()
+    if call is not None:
+        call.attempts += 1
+
+
+def _on_response(response: Any) -> None:
+    call = _current_call.get()
+    if call is None:
+        return
+    tokens_in, tokens_out = _usage_tokens(response)
+    labels = {"model": call.model, "operation": call.operation}
+    if tokens_in:
+        inc("kura_llm_tokens_total", tokens_in, direction="input", **labels)
+    if tokens_out:
+        inc("kura_llm_tokens_total", tokens_out, direction="output", **labels)
+
+
+class InstrumentedClient(InterceptedClient):
+    """Wraps an instructor client to record latency, retries and token usage.
+
+    Every ``chat.completions.create`` call is timed as
+    ``kura_llm_request_seconds`` and counted by outcome. When the client
+    supports instructor hooks, each attempt and the usage reported with each
+    response are attributed to the call, giving ``kura_llm_retries_total``
+    and ``kura_llm_tokens_total``.
+    """
+
+    def __init__(self, client: Any, *, model: str, operation: str):
+        self._labels = {"model": model, "operation": operation}
+        super().__init__(client, self._create)
+        if hasattr(client, "on"):
+            client.on("completion:kwargs", _on_attempt)
+            client.on("completion:response", _on_response)
+
+    async def _create(self, create, **kwargs):
+        call = _Call(**self._labels)
+        token = _current_call.set(call)
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await create(**kwargs)
+            outcome = "success"
+            return response
+        finally:
+            _current_call.reset(token)
+            observe(
+                "kura_llm_request_seconds",
+                time.perf_counter() - start,
+                **self._labels,
+            )
+            inc("kura_llm_requests_total", outcome=outcome, **self._labels)
+            if call.attempts > 1:
+                inc("kura_llm_retries_total", call.attempts - 1, **self._labels)
+
+
+# -----------------------------------------------------------------------------
+# Prometheus endpoint
+# -----------------------------------------------------------------------------
+
+
+def start_metrics_server(
+    port: int = 9464,
+    host: str = "127.0.0.1",
+    registry: Optional[MetricsRegistry] = None,
+):
+    """Serve ``registry`` (the process-wide one by default) for Prometheus to scrape.
+
+    Runs in a daemon thread so a pipeline script can expose its progress
+    while it runs. Returns the server; call ``shutdown()`` to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    source = registry or _metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = source.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(
+        f"Serving Prometheus metrics at http://{host}:{server.server_port}/metrics"
+    )
+    return server
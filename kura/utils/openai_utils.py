@@ -1,9 +1,31 @@
+import asyncio
+import importlib.util
 import os
-from openai import AsyncOpenAI, AsyncAzureOpenAI
-import instructor
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
 
-load_dotenv()
+# httpx, openai and instructor are imported where they are used so that
+# importing kura stays cheap for code paths that never talk to an API
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+    from kura.utils.rate_limit import RateLimiter
+
+_dotenv_loaded = False
+
+# Called as intercept(create, **kwargs) in place of create(**kwargs)
+Interceptor = Callable[..., Awaitable[Any]]
+
+
+def load_env() -> None:
+    """Load a ``.env`` file the first time API settings are read."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _dotenv_loaded = True
 
 
 def _truthy(val: str | None) -> bool:
@@ -13,6 +35,7 @@ def _truthy(val: str | None) -> bool:
 
 
 def use_azure_openai() -> bool:
+    load_env()
     if _truthy(os.getenv("USE_AZURE_OPENAI")):
         return True
     required = [
@@ -23,22 +46,135 @@ def use_azure_openai() -> bool:
     return all(os.getenv(k) for k in required)
 
 
-def create_openai_client() -> AsyncOpenAI:
+def require_http2() -> None:
+    """Fail early if HTTP/2 is requested without the ``h2`` package."""
+    if importlib.util.find_spec("h2") is None:  # type: ignore
+        raise ImportError("Please install h2 to use HTTP/2: pip install 'httpx[http2]'")
+
+
+def create_http_client(
+    *,
+    http2: bool = False,
+    max_connections: int = 100,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: float = 30.0,
+    timeout: float = 600.0,
+    rate_limiter: Optional["RateLimiter"] = None,
+) -> "httpx.AsyncClient":
+    """Create a pooled HTTP client to share across many API requests.
+
+    ``http2=True`` requires the ``h2`` package (``pip install httpx[http2]``).
+    If a ``rate_limiter`` is given every request waits for its budget, and it
+    receives every response so it can track rate-limit headers and 429s.
+    """
+    if http2:
+        require_http2()
+    import httpx
+
+    return httpx.AsyncClient(
+        http2=http2,
+        event_hooks={
+            "request": [rate_limiter.on_request],
+            "response": [rate_limiter.on_response],
+        }
+        if rate_limiter
+        else None,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+            if max_keepalive_connections is not None
+            else max_connections,
+            keepalive_expiry=keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(timeout, connect=10.0),
+    )
+
+
+class _InterceptedCompletions:
+    def __init__(self, completions: Any, intercept: Interceptor):
+        self._completions = completions
+        self._intercept = intercept
+
+    async def create(self, **kwargs):
+        return await self._intercept(self._completions.create, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._completions, name)
+
+
+class _InterceptedChat:
+    def __init__(self, chat: Any, intercept: Interceptor):
+        self._chat = chat
+        self.completions = _InterceptedCompletions(chat.completions, intercept)
+
+    def __getattr__(self, name: str):
+        return getattr(self._chat, name)
+
+
+class InterceptedClient:
+    """Wraps an instructor client, routing every chat completion through ``intercept``.
+
+    ``intercept(create, **kwargs)`` is awaited instead of
+    ``client.chat.completions.create(**kwargs)`` and is expected to await
+    ``create(**kwargs)`` itself. Any other attribute is read from the wrapped
+    client, so wrappers can be stacked.
+    """
+
+    def __init__(self, client: Any, intercept: Interceptor):
+        self._client = client
+        self.chat = _InterceptedChat(client.chat, intercept)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+def close_stale_http_client(
+    http_client: "httpx.AsyncClient", loop: asyncio.AbstractEventLoop
+) -> None:
+    """Close a pooled client that belongs to another event loop.
+
+    Its connections can only be closed on the loop that opened them. If that
+    loop is still running (on another thread) the client is closed there;
+    otherwise the loop has finished and the client is left for the garbage
+    collector.
+    """
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(http_client.aclose(), loop)
+
+
+def create_openai_client(
+    *, http_client: Optional["httpx.AsyncClient"] = None
+) -> "AsyncOpenAI":
+    from openai import AsyncAzureOpenAI, AsyncOpenAI
+
     if use_azure_openai():
         return AsyncAzureOpenAI(
             azure_endpoint=os.environ.get("AZURE_OPENAI_API_BASE"),
             api_key=os.environ.get("AZURE_OPENAI_API_KEY"),
             api_version=os.environ.get("AZURE_OPENAI_API_VERSION"),
+            http_client=http_client,
         )
-    return AsyncOpenAI()
+    return AsyncOpenAI(http_client=http_client)
 
 
-def create_instructor_client(model: str, *, is_embedding: bool = False):
+def create_instructor_client(
+    model: str,
+    *,
+    is_embedding: bool = False,
+    http_client: Optional["httpx.AsyncClient"] = None,
+):
+    """Create an async instructor client for ``model``.
+
+    ``http_client`` is only used for OpenAI models; other providers manage
+    their own connections.
+    """
+    import instructor
+
+    provider, model_name = model.split("/", 1)
     if use_azure_openai():
-        provider, model_name = model.split("/", 1)
         if provider != "openai":
             return instructor.from_provider(model, async_client=True)
-        client = create_openai_client()
+        client = create_openai_client(http_client=http_client)
         deployment_env = (
             "AZURE_EMBEDDING_DEPLOYMENT_NAME"
             if is_embedding
@@ -46,4 +182,8 @@ def create_instructor_client(model: str, *, is_embedding: bool = False):
         )
         deployment = os.environ.get(deployment_env, model_name)
         return instructor.from_openai(client, model=deployment)
+    if provider == "openai" and http_client is not None:
+        return instructor.from_openai(
+            create_openai_client(http_client=http_client), model=model_name
+        )
     return instructor.from_provider(model, async_client=True)
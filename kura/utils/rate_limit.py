@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Any, Mapping, Optional
+
+from kura.utils.openai_utils import InterceptedClient
+
+logger = logging.getLogger(__name__)
+
+# Parses OpenAI style reset durations such as "1s", "6m0s" or "20ms"
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+def estimate_request_tokens(
+    messages: list[dict], context: Optional[dict] = None
+) -> int:
+    """Estimate the prompt tokens of a templated chat request before sending it.
+
+    Templates are not rendered; the raw template plus the string form of every
+    context value is a close enough upper bound for budgeting.
+    """
+    text = "".join(str(message.get("content", "")) for message in messages)
+    if context:
+        text += "".join(str(value) for value in context.values())
+    return estimate_tokens(text)
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    matches = _DURATION_PATTERN.findall(value)
+    if not matches:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in matches)
+
+
+class TokenBucket:
+    """A token bucket refilled continuously at ``capacity`` per minute."""
+
+    def __init__(self, capacity: float):
+        self.capacity = float(capacity)
+        self.available = float(capacity)
+        self._updated_at = time.monotonic()
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / 60.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            self.capacity,
+            self.available + (now - self._updated_at) * self.refill_per_second,
+        )
+        self._updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be taken from the bucket."""
+        self._refill()
+        # Requests larger than the bucket are allowed once it is full
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.available -= amount
+
+    def clamp(self, remaining: float) -> None:
+        """Trust the provider's view of the remaining budget if it is lower."""
+        self._refill()
+        self.available = min(self.available, remaining)
+
+
+class RateLimiter:
+    """Shared requests-per-minute and tokens-per-minute budget for LLM calls.
+
+    A single instance can be passed to ``SummaryModel``, ``ClusterModel``,
+    ``MetaClusterModel`` and ``OpenAIEmbeddingModel`` so that all of their
+    requests share one budget. For OpenAI models the limiter is installed as
+    event hooks on their HTTP client, so every HTTP request, including the
+    retries made by instructor and the OpenAI SDK, waits until both token
+    buckets can cover it. Rate-limit headers
+    returned by the provider tighten the buckets (and set their capacity when
+    no limit was configured), and 429 responses pause every request with
+    exponential backoff.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        *,
+        completion_tokens_estimate: int = 256,
+        initial_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0,
+    ):
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.completion_tokens_estimate = completion_tokens_estimate
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._backoff_seconds = initial_backoff_seconds
+        self._paused_until = 0.0
+        self.rate_limited_count = 0
+        logger.info(
+            f"Initialized RateLimiter with requests_per_minute={requests_per_minute}, tokens_per_minute={tokens_per_minute}"
+        )
+
+    async def acquire(
+        self, tokens: int = 0, *, completion_tokens: Optional[int] = None
+    ) -> None:
+        """Wait until one request costing ``tokens`` fits in the budget.
+
+        Args:
+            tokens: Estimated prompt tokens of the request
+            completion_tokens: Tokens reserved for the response; defaults to
+                ``completion_tokens_estimate``
+        """
+        if completion_tokens is None:
+            completion_tokens = self.completion_tokens_estimate
+        tokens += completion_tokens
+        while True:
+            wait = max(0.0, self._paused_until - time.monotonic())
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.wait_time(tokens))
+            if wait <= 0:
+                break
+            logger.debug(f"Rate limit reached, waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+        if self.requests is not None:
+            self.requests.take(1)
+        if self.tokens is not None:
+            self.tokens.take(tokens)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Adjust the budget from ``x-ratelimit-*`` response headers."""
+        for kind in ("requests", "tokens"):
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            bucket = getattr(self, kind)
+            if bucket is None and limit:
+                bucket = TokenBucket(float(limit))
+                setattr(self, kind, bucket)
+                logger.info(f"Using provider {kind} per minute limit of {limit}")
+            if bucket is not None and remaining:
+                bucket.clamp(float(remaining))
+
+    def record_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Pause all requests after a 429 response."""
+        self.rate_limited_count += 1
+        delay = retry_after if retry_after is not None else self._backoff_seconds
+        self._backoff_seconds = min(self._backoff_seconds * 2, self.max_backoff_seconds)
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning(f"Rate limited by provider, pausing requests for {delay:.2f}s")
+
+    def record_success(self) -> None:
+        self._backoff_seconds = self.initial_backoff_seconds
+
+    async def on_request(self, request: Any) -> None:
+        """httpx request event hook that waits for budget before every request.
+
+        The prompt tokens are estimated from the request body. Embedding
+        requests have no completion, so nothing is reserved for one.
+        """
+        import httpx
+
+        try:
+            body = request.content.decode("utf-8", errors="ignore")
+        except httpx.RequestNotRead:
+            # Streamed uploads can't be inspected up front
+            body = ""
+        await self.acquire(
+            estimate_tokens(body) if body else 0,
+            completion_tokens=0 if request.url.path.endswith("/embeddings") else None,
+        )
+
+    async def on_response(self, response: Any) -> None:
+        """httpx response event hook that feeds headers back into the limiter."""
+        headers = response.headers
+        self.update_from_headers(headers)
+        if response.status_code == 429:
+            retry_after = headers.get("retry-after-ms")
+            if retry_after is not None:
+                self.record_rate_limited(float(retry_after) / 1000)
+            else:
+                retry_after = headers.get("retry-after")
+                self.record_rate_limited(
+                    _parse_duration(retry_after) if retry_after else None
+                )
+        elif response.status_code < 400:
+            self.record_success()
+
+    def wrap_client(self, client: Any, model: str) -> Any:
+        """Limit an instructor client whose HTTP requests can't be hooked.
+
+        OpenAI clients are created on an HTTP client that already waits for
+        the budget on every request and are returned unchanged. Other
+        providers manage their own connections, so each chat completion
+        takes budget once, before any retries.
+        """
+        if model.split("/", 1)[0] == "openai":
+            return client
+        return RateLimitedClient(client, self)
+
+
+class RateLimitedClient(InterceptedClient):
+    """Wraps an instructor client so every chat completion waits for the budget."""
+
+    def __init__(self, client: Any, limiter: RateLimiter):
+        self._limiter = limiter
+        super().__init__(client, self._create)
+
+    async def _create(self, create, **kwargs):
+        await self._limiter.acquire(
+            estimate_request_tokens(kwargs.get("messages", []), kwargs.get("context"))
+        )
+        return await create(**kwargs)
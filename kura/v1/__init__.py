@@ -11,6 +11,9 @@ from .kura import (
     generate_base_clusters_from_conversation_summaries,
     reduce_clusters_from_base_clusters,
     reduce_dimensionality_from_clusters,
+    run_pipeline,
+    assign_new_conversations,
+    PipelineResult,
     # Checkpoint management
     CheckpointManager,
 )
@@ -21,6 +24,9 @@ __all__ = [
     "generate_base_clusters_from_conversation_summaries",
     "reduce_clusters_from_base_clusters",
     "reduce_dimensionality_from_clusters",
+    "run_pipeline",
+    "assign_new_conversations",
+    "PipelineResult",
     # Utilities
     "CheckpointManager",
 ]
@@ -14,20 +14,58 @@ Key benefits over the class-based approach:
 
 import logging
 import asyncio
-from typing import Optional, TypeVar, List
+import inspect
+import json
+from typing import (
+    Any,
+    AsyncIterable,
+    Awaitable,
+    AsyncIterator,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    TYPE_CHECKING,
+    TypeVar,
+    List,
+    Union,
+)
 import os
 from pydantic import BaseModel
 
 # Import existing Kura components
 from kura.base_classes import (
+    BaseCheckpointBackend,
     BaseSummaryModel,
     BaseClusterModel,
     BaseMetaClusterModel,
     BaseDimensionalityReduction,
 )
-from kura.types import Conversation, Cluster, ConversationSummary, ClusteringError
+from kura.types import (
+    Conversation,
+    Cluster,
+    ClusterCentroid,
+    ConversationSummary,
+    ClusteringError,
+    EmbeddingMatrix,
+)
+from kura.dedup import ConversationDeduplicator
+from kura.embedding_store import EmbeddingStore
 from kura.types.dimensionality import ProjectedCluster
 from kura.types.summarisation import SummarisationError
+from kura.utils.executor import PipelineExecutor, run_in_executor, use_executor
+from kura.utils.metrics import (
+    METRICS_FILENAME,
+    collect_metrics,
+    monitor_event_loop_lag,
+    set_gauge,
+    timed_stage,
+    timer,
+)
+
+if TYPE_CHECKING:
+    from kura.sqlite_store import SQLiteStore
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -43,15 +81,32 @@ T = TypeVar("T", bound=BaseModel)
 class CheckpointManager:
     """Handles checkpoint loading and saving for pipeline steps."""
 
-    def __init__(self, checkpoint_dir: str, *, enabled: bool = True):
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        *,
+        enabled: bool = True,
+        append_only: bool = False,
+        backend: Optional[BaseCheckpointBackend] = None,
+    ):
         """Initialize checkpoint manager.
 
         Args:
             checkpoint_dir: Directory for saving checkpoints
             enabled: Whether checkpointing is enabled
+            append_only: Whether pipeline steps should append each batch to
+                their checkpoint instead of rewriting the whole file. Appended
+                checkpoints are compacted once at the end of each step.
+            backend: Optional storage backend (e.g. ParquetCheckpointBackend).
+                Defaults to JSONL files.
         """
+        if append_only and backend is not None:
+            raise ValueError("append_only checkpoints are only supported for JSONL")
+
         self.checkpoint_dir = checkpoint_dir
         self.enabled = enabled
+        self.append_only = append_only
+        self.backend = backend
 
         if self.enabled:
             self.setup_checkpoint_dir()
@@ -64,6 +119,8 @@ class CheckpointManager:
 
     def get_checkpoint_path(self, filename: str) -> str:
         """Get full path for a checkpoint file."""
+        if self.backend is not None:
+            filename = os.path.splitext(filename)[0] + self.backend.file_extension
         return os.path.join(self.checkpoint_dir, filename)
 
     def load_checkpoint(self, filename: str, model_class: type[T]) -> Optional[List[T]]:
@@ -84,8 +141,18 @@ class CheckpointManager:
             logger.info(
                 f"Loading checkpoint from {checkpoint_path} for {model_class.__name__}"
             )
-            with open(checkpoint_path, "r") as f:
-                return [model_class.model_validate_json(line) for line in f]
+            if self.backend is not None:
+                return self.backend.load(checkpoint_path, model_class)
+            manifest = self.load_manifest(filename)
+            with open(checkpoint_path, "rb") as f:
+                # Only trust bytes recorded in the manifest; anything after
+                # that is a partially written batch from an interrupted run.
+                content = f.read(manifest["committed_bytes"]) if manifest else f.read()
+            return [
+                model_class.model_validate_json(line)
+                for line in content.splitlines()
+                if line.strip()
+            ]
         return None
 
     def save_checkpoint(self, filename: str, data: List[T]) -> None:
@@ -99,26 +166,189 @@ class CheckpointManager:
             return
 
         checkpoint_path = self.get_checkpoint_path(filename)
+        if self.backend is not None:
+            self.backend.save(checkpoint_path, data)
+            logger.info(f"Saved checkpoint to {checkpoint_path} with {len(data)} items")
+            return
+
         with open(checkpoint_path, "w") as f:
             for item in data:
                 f.write(item.model_dump_json() + "\n")
+        # A full rewrite supersedes any append-only bookkeeping
+        manifest_path = self.get_manifest_path(filename)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
         logger.info(f"Saved checkpoint to {checkpoint_path} with {len(data)} items")
 
+    def load_columns(
+        self, filename: str, columns: Optional[List[str]] = None
+    ) -> Optional[dict[str, Any]]:
+        """Load selected columns of a checkpoint without building model instances.
+
+        Args:
+            filename: Name of the checkpoint file
+            columns: Columns to read (e.g. ``["chat_id", "embedding"]``), or
+                None for all columns
+
+        Returns:
+            Mapping of column name to values if the checkpoint exists, None
+            otherwise. Embedding columns are returned as float32 numpy arrays
+            when every row has an embedding.
+        """
+        if not self.enabled:
+            return None
+
+        checkpoint_path = self.get_checkpoint_path(filename)
+        if not os.path.exists(checkpoint_path):
+            return None
+        if self.backend is not None:
+            return self.backend.load_columns(checkpoint_path, columns)
+
+        import numpy as np
+
+        manifest = self.load_manifest(filename)
+        with open(checkpoint_path, "rb") as f:
+            content = f.read(manifest["committed_bytes"]) if manifest else f.read()
+        records = [json.loads(line) for line in content.splitlines() if line.strip()]
+        names = columns or (list(records[0].keys()) if records else [])
+        result: dict[str, Any] = {
+            name: [record.get(name) for record in records] for name in names
+        }
+        if "embedding" in result and all(v is not None for v in result["embedding"]):
+            result["embedding"] = np.asarray(result["embedding"], dtype=np.float32)
+        return result
+
+    def get_manifest_path(self, filename: str) -> str:
+        """Get full path for the manifest of an append-only checkpoint file."""
+        return self.get_checkpoint_path(f"{filename}.manifest.json")
+
+    def load_manifest(self, filename: str) -> Optional[dict]:
+        """Load the manifest for an append-only checkpoint file if it exists."""
+        manifest_path = self.get_manifest_path(filename)
+        if not os.path.exists(manifest_path):
+            return None
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    def _write_manifest(self, filename: str, manifest: dict) -> None:
+        manifest_path = self.get_manifest_path(filename)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, manifest_path)
+
+    def append_checkpoint(self, filename: str, data: List[T]) -> None:
+        """Append new items to a checkpoint file without rewriting it.
+
+        The new records are fsynced before the manifest is updated, so a crash
+        mid-write never exposes a partially written batch to ``load_checkpoint``.
+
+        Args:
+            filename: Name of the checkpoint file
+            data: New model instances to append
+        """
+        if not self.enabled or not data:
+            return
+
+        checkpoint_path = self.get_checkpoint_path(filename)
+        manifest = self.load_manifest(filename)
+        if manifest is None:
+            # Adopt a checkpoint written by save_checkpoint as the first batch
+            manifest = {"records": 0, "batches": 0, "committed_bytes": 0}
+            if os.path.exists(checkpoint_path):
+                with open(checkpoint_path, "rb") as f:
+                    manifest["records"] = sum(1 for line in f if line.strip())
+                manifest["committed_bytes"] = os.path.getsize(checkpoint_path)
+
+        payload = "".join(item.model_dump_json() + "\n" for item in data).encode()
+        with open(checkpoint_path, "ab") as f:
+            # Drop any bytes left behind by an interrupted append
+            f.truncate(manifest["committed_bytes"])
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        manifest["records"] += len(data)
+        manifest["batches"] += 1
+        manifest["committed_bytes"] += len(payload)
+        self._write_manifest(filename, manifest)
+        logger.info(
+            f"Appended {len(data)} items to checkpoint {checkpoint_path} ({manifest['records']} total)"
+        )
+
+    def compact_checkpoint(
+        self,
+        filename: str,
+        model_class: type[T],
+        *,
+        key: Optional[Callable[[T], Hashable]] = None,
+    ) -> int:
+        """Rewrite an append-only checkpoint into a single clean file.
+
+        Drops any uncommitted trailing bytes and, if ``key`` is given, keeps only
+        the last record for each key. The rewrite is atomic.
+
+        Args:
+            filename: Name of the checkpoint file
+            model_class: Pydantic model class for deserializing the data
+            key: Optional function returning the identity of a record
+
+        Returns:
+            Number of records in the compacted checkpoint
+        """
+        if not self.enabled:
+            return 0
+
+        items = self.load_checkpoint(filename, model_class)
+        if items is None:
+            return 0
+        if key is not None:
+            items = list({key(item): item for item in items}.values())
+        if self.backend is not None:
+            self.save_checkpoint(filename, items)
+            return len(items)
+
+        checkpoint_path = self.get_checkpoint_path(filename)
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, "w") as f:
+            for item in items:
+                f.write(item.model_dump_json() + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, checkpoint_path)
+        self._write_manifest(
+            filename,
+            {
+                "records": len(items),
+                "batches": 0,
+                "committed_bytes": os.path.getsize(checkpoint_path),
+            },
+        )
+        logger.info(f"Compacted checkpoint {checkpoint_path} to {len(items)} items")
+        return len(items)
+
 
 # =============================================================================
 # Core Pipeline Functions
 # =============================================================================
 
 
+@timed_stage("summarise")
 async def summarise_conversations(
-    conversations: List[Conversation],
+    conversations: Union[Iterable[Conversation], AsyncIterable[Conversation]],
     *,
     model: BaseSummaryModel,
     checkpoint_manager: Optional[CheckpointManager] = None,
     batch_size: int = 100,
     sleep_seconds: float = 0.0,
+    on_batch_complete: Optional[
+        Callable[[List[ConversationSummary]], Awaitable[None]]
+    ] = None,
+    deduplicator: Optional[ConversationDeduplicator] = None,
 ) -> List[ConversationSummary]:
-    """Generate summaries for a list of conversations.
+    """Generate summaries for conversations.
 
     This is a pure function that takes conversations and a summary model,
     and returns conversation summaries. Optionally uses checkpointing.
@@ -127,13 +357,30 @@ async def summarise_conversations(
     supporting heterogeneous backends (OpenAI, vLLM, Hugging Face, etc.)
     through polymorphism.
 
+    Conversations can also be a (sync or async) iterator such as
+    ``Conversation.iter_claude_conversation_dump``. They are then consumed in
+    batches of ``batch_size`` while earlier batches are summarised, so only a
+    couple of batches of conversations are in memory at once.
+
+    With a ``deduplicator``, only one representative of each group of
+    identical or near-identical conversations is sent to the model. The other
+    conversations in the group get a copy of its summary with
+    ``duplicate_of`` set in their metadata, and every summary in the group
+    records ``duplicate_group_size``.
+
     Args:
-        conversations: List of conversations to summarize
+        conversations: Conversations to summarize, as a list or an iterable
         model: Model to use for summarization (OpenAI, vLLM, local, etc.)
         checkpoint_manager: Optional checkpoint manager for caching
         batch_size: Number of conversations to process before saving a checkpoint
         sleep_seconds: Seconds to pause after each batch to avoid rate limits
             (default ``0.0`` for no delay)
+        on_batch_complete: Optional coroutine called with the summaries loaded
+            from the checkpoint and then with every new batch, so later stages
+            can start before summarisation finishes. Summarisation waits for
+            it, which lets a bounded queue apply backpressure
+        deduplicator: Optional ``ConversationDeduplicator`` used to summarise
+            duplicate conversations only once
 
     Returns:
         List of conversation summaries
@@ -149,8 +396,9 @@ async def summarise_conversations(
         ...     sleep_seconds=1.0,
         ... )
     """
+    total = len(conversations) if isinstance(conversations, list) else None
     logger.info(
-        f"Starting summarization of {len(conversations)} conversations using {type(model).__name__}"
+        f"Starting summarization of {total if total is not None else 'streamed'} conversations using {type(model).__name__}"
     )
 
     # Try to load from checkpoint
@@ -179,49 +427,85 @@ async def summarise_conversations(
             logger.info(
                 f"Loaded {len(cached_errors)} summarisation errors from checkpoint"
             )
-        if len(processed_ids) == len(conversations):
+        if cached and on_batch_complete:
+            await on_batch_complete(cached)
+        if total is not None and len(processed_ids) == total:
             return cached
 
-    remaining = [c for c in conversations if c.chat_id not in processed_ids]
     all_summaries = list(cached)
     all_errors: List[SummarisationError] = list(cached_errors)
+    representative_summaries: dict[str, ConversationSummary] = {}
+    progress_total = f"/{total}" if total is not None else ""
 
-    if remaining:
-        logger.info(
-            f"Generating {len(remaining)} new summaries in batches of {batch_size}"
-        )
-    else:
-        logger.info("No new conversations to summarise")
+    logger.info(f"Generating new summaries in batches of {batch_size}")
 
     # Generate summaries in batches and save progress
-
-    for start in range(0, len(remaining), batch_size):
-        batch = remaining[start : start + batch_size]
-        logger.info(
-            f"Processing batch {start // batch_size + 1}: {len(batch)} conversations"
-        )
-        batch_summaries = await model.summarise(batch)
-        all_summaries.extend(batch_summaries)
+    batch_number = 0
+    async for batch in _prefetch_batches(conversations, batch_size, processed_ids):
+        batch_number += 1
+        logger.info(f"Processing batch {batch_number}: {len(batch)} conversations")
+        duplicates: List[tuple[Conversation, str]] = []
+        if deduplicator is not None:
+            batch, duplicates = deduplicator.split(batch)
+        batch_summaries = await model.summarise(batch) if batch else []
+        batch_errors: List[SummarisationError] = []
         if getattr(model, "errors", None):
-            all_errors.extend(model.errors)
+            batch_errors = list(model.errors)
             model.errors = []
-        if checkpoint_manager:
+        if deduplicator is not None:
+            representative_summaries.update(
+                (summary.chat_id, summary) for summary in batch_summaries
+            )
+            copies, copy_errors = _copy_representative_summaries(
+                duplicates, representative_summaries
+            )
+            batch_summaries = batch_summaries + copies
+            batch_errors.extend(copy_errors)
+        all_summaries.extend(batch_summaries)
+        all_errors.extend(batch_errors)
+        if checkpoint_manager and checkpoint_manager.append_only:
+            checkpoint_manager.append_checkpoint(
+                model.checkpoint_filename, batch_summaries
+            )
+            checkpoint_manager.append_checkpoint(
+                model.error_checkpoint_filename, batch_errors
+            )
+            logger.info(
+                f"Checkpoint appended with {len(all_summaries)}{progress_total} summaries"
+            )
+        elif checkpoint_manager:
             checkpoint_manager.save_checkpoint(model.checkpoint_filename, all_summaries)
             if all_errors:
                 checkpoint_manager.save_checkpoint(
                     model.error_checkpoint_filename, all_errors
                 )
             logger.info(
-                f"Checkpoint saved with {len(all_summaries)}/{len(conversations)} summaries"
+                f"Checkpoint saved with {len(all_summaries)}{progress_total} summaries"
             )
+        if on_batch_complete:
+            await on_batch_complete(batch_summaries)
         if sleep_seconds > 0:
             logger.info(f"Sleeping for {sleep_seconds} seconds to respect rate limits")
             await asyncio.sleep(sleep_seconds)
 
-    summaries = all_summaries
+    if batch_number == 0:
+        logger.info("No new conversations to summarise")
 
-    # Save to checkpoint at the end (ensures fully written file)
-    if checkpoint_manager:
+    summaries = all_summaries
+    if deduplicator is not None:
+        summaries = _record_duplicate_group_sizes(summaries, deduplicator)
+
+    # Save to checkpoint at the end (ensures fully written file). Group sizes
+    # are only final now, so a deduplicated run rewrites its checkpoint.
+    if checkpoint_manager and checkpoint_manager.append_only and deduplicator is None:
+        logger.info(f"Compacting summaries checkpoint: {model.checkpoint_filename}")
+        checkpoint_manager.compact_checkpoint(
+            model.checkpoint_filename, ConversationSummary, key=lambda s: s.chat_id
+        )
+        checkpoint_manager.compact_checkpoint(
+            model.error_checkpoint_filename, SummarisationError
+        )
+    elif checkpoint_manager:
         logger.info(f"Saving summaries to checkpoint: {model.checkpoint_filename}")
         checkpoint_manager.save_checkpoint(model.checkpoint_filename, summaries)
         if all_errors:
@@ -232,6 +516,137 @@ async def summarise_conversations(
     return summaries
 
 
+def _copy_representative_summaries(
+    duplicates: List[tuple[Conversation, str]],
+    representative_summaries: dict[str, ConversationSummary],
+) -> tuple[List[ConversationSummary], List[SummarisationError]]:
+    """Give each duplicate conversation a copy of its representative's summary."""
+    copies: List[ConversationSummary] = []
+    errors: List[SummarisationError] = []
+    for conversation, representative in duplicates:
+        summary = representative_summaries.get(representative)
+        if summary is None:
+            errors.append(
+                SummarisationError(
+                    chat_id=conversation.chat_id,
+                    error=f"Representative conversation {representative} was not summarised",
+                )
+            )
+            continue
+        copies.append(
+            summary.model_copy(
+                update={
+                    "chat_id": conversation.chat_id,
+                    "metadata": {
+                        **summary.metadata,
+                        "conversation_turns": len(conversation.messages),
+                        **conversation.metadata,
+                        "duplicate_of": representative,
+                    },
+                }
+            )
+        )
+    return copies, errors
+
+
+def _record_duplicate_group_sizes(
+    summaries: List[ConversationSummary], deduplicator: ConversationDeduplicator
+) -> List[ConversationSummary]:
+    """Set ``duplicate_group_size`` on the summaries of every deduplicated group."""
+    result = []
+    duplicates = 0
+    for summary in summaries:
+        representative = summary.metadata.get("duplicate_of", summary.chat_id)
+        size = deduplicator.group_sizes.get(representative)
+        if size is None:
+            result.append(summary)
+            continue
+        duplicates += representative != summary.chat_id
+        result.append(
+            summary.model_copy(
+                update={"metadata": {**summary.metadata, "duplicate_group_size": size}}
+            )
+        )
+    if duplicates:
+        logger.info(
+            f"Reused summaries for {duplicates} duplicate conversations across {len(deduplicator.group_sizes)} groups"
+        )
+    return result
+
+
+async def _prefetch_batches(
+    items: Union[Iterable[Conversation], AsyncIterable[Conversation]],
+    batch_size: int,
+    skip_ids: set[str],
+) -> AsyncIterator[List[Conversation]]:
+    """Yield batches of unprocessed conversations, loading the next one ahead.
+
+    A background task keeps at most one batch ready while the caller works on
+    the current one, so loading overlaps with summarisation and memory stays
+    bounded for large streamed inputs.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    done = object()
+
+    async def produce() -> None:
+        batch: List[Conversation] = []
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    if item.chat_id in skip_ids:
+                        continue
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        await queue.put(batch)
+                        batch = []
+            else:
+                # Plain iterables (file and dataset loaders) parse as they are
+                # advanced, so each batch is pulled in a worker thread
+                it = iter(items)
+                while True:
+                    batch = await run_in_executor(
+                        _next_batch, it, batch_size, skip_ids, process_safe=False
+                    )
+                    if len(batch) < batch_size:
+                        break
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+            await queue.put(done)
+        except Exception as e:
+            await queue.put(e)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is done:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        if not producer.done():
+            producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+def _next_batch(
+    it: Iterator[Conversation], batch_size: int, skip_ids: set[str]
+) -> List[Conversation]:
+    """Pull up to ``batch_size`` unprocessed conversations from ``it``."""
+    batch: List[Conversation] = []
+    for item in it:
+        if item.chat_id in skip_ids:
+            continue
+        batch.append(item)
+        if len(batch) >= batch_size:
+            break
+    return batch
+
+
+@timed_stage("cluster")
 async def generate_base_clusters_from_conversation_summaries(
     summaries: List[ConversationSummary],
     *,
@@ -239,6 +654,8 @@ async def generate_base_clusters_from_conversation_summaries(
     checkpoint_manager: Optional[CheckpointManager] = None,
     batch_size: int = 100,
     sleep_seconds: float = 0.0,
+    executor: Optional[PipelineExecutor] = None,
+    embeddings: Optional[Union[EmbeddingMatrix, List[List[float]]]] = None,
 ) -> List[Cluster]:
     """Generate base clusters from conversation summaries.
 
@@ -250,6 +667,10 @@ async def generate_base_clusters_from_conversation_summaries(
         summaries: List of conversation summaries to cluster
         model: Model to use for clustering (HDBSCAN, KMeans, etc.)
         checkpoint_manager: Optional checkpoint manager for caching
+        executor: Optional executor for the CPU-bound embedding and clustering
+            steps; defaults to the event loop's thread pool
+        embeddings: Optional precomputed embeddings, one per summary, passed to
+            the model so it doesn't embed the summaries again
 
     Returns:
         List of base clusters
@@ -296,11 +717,24 @@ async def generate_base_clusters_from_conversation_summaries(
     all_clusters = list(cached)
     all_errors = list(cached_errors)
 
-    async def _on_batch(new_clusters: list[Cluster], new_errors: list[ClusteringError]):
-        nonlocal all_clusters, all_errors
+    persisted_ids: set[str] = set()
+    persisted_error_count = len(cached_errors)
+
+    def _on_batch(new_clusters: list[Cluster], new_errors: list[ClusteringError]):
+        nonlocal all_clusters, all_errors, persisted_error_count
         all_clusters.extend(new_clusters)
         all_errors.extend(new_errors)
-        if checkpoint_manager:
+        if checkpoint_manager and checkpoint_manager.append_only:
+            checkpoint_manager.append_checkpoint(
+                model.checkpoint_filename, new_clusters
+            )
+            checkpoint_manager.append_checkpoint(
+                model.error_checkpoint_filename, new_errors
+            )
+            persisted_ids.update(c.id for c in new_clusters)
+            persisted_error_count += len(new_errors)
+            logger.info(f"Checkpoint appended with {len(all_clusters)} clusters")
+        elif checkpoint_manager:
             checkpoint_manager.save_checkpoint(model.checkpoint_filename, all_clusters)
             if all_errors:
                 checkpoint_manager.save_checkpoint(
@@ -308,18 +742,36 @@ async def generate_base_clusters_from_conversation_summaries(
                 )
             logger.info(f"Checkpoint saved with {len(all_clusters)} clusters")
 
-    new_clusters = await model.cluster_summaries(
-        summaries,
-        processed_keys=processed_keys,
-        batch_size=batch_size,
-        sleep_seconds=sleep_seconds,
-        on_batch_complete=_on_batch,
-    )
+    extra_kwargs = {} if embeddings is None else {"embeddings": embeddings}
+    with use_executor(executor):
+        new_clusters = await model.cluster_summaries(
+            summaries,
+            processed_keys=processed_keys,
+            batch_size=batch_size,
+            sleep_seconds=sleep_seconds,
+            on_batch_complete=_on_batch,
+            **extra_kwargs,
+        )
 
     all_clusters = cached + new_clusters
     all_errors = cached_errors + getattr(model, "errors", [])
 
-    if checkpoint_manager:
+    if checkpoint_manager and checkpoint_manager.append_only:
+        # Persist anything the model did not report through on_batch_complete
+        checkpoint_manager.append_checkpoint(
+            model.checkpoint_filename,
+            [c for c in new_clusters if c.id not in persisted_ids],
+        )
+        checkpoint_manager.append_checkpoint(
+            model.error_checkpoint_filename, all_errors[persisted_error_count:]
+        )
+        checkpoint_manager.compact_checkpoint(
+            model.checkpoint_filename, Cluster, key=lambda c: c.id
+        )
+        checkpoint_manager.compact_checkpoint(
+            model.error_checkpoint_filename, ClusteringError
+        )
+    elif checkpoint_manager:
         checkpoint_manager.save_checkpoint(model.checkpoint_filename, all_clusters)
         if all_errors:
             checkpoint_manager.save_checkpoint(
@@ -330,11 +782,13 @@ async def generate_base_clusters_from_conversation_summaries(
     return all_clusters
 
 
+@timed_stage("meta_cluster")
 async def reduce_clusters_from_base_clusters(
     clusters: List[Cluster],
     *,
     model: BaseMetaClusterModel,
     checkpoint_manager: Optional[CheckpointManager] = None,
+    executor: Optional[PipelineExecutor] = None,
 ) -> List[Cluster]:
     """Reduce clusters into a hierarchical structure.
 
@@ -345,6 +799,8 @@ async def reduce_clusters_from_base_clusters(
         clusters: List of initial clusters to reduce
         model: Meta-clustering model to use for reduction
         checkpoint_manager: Optional checkpoint manager for caching
+        executor: Optional executor for the CPU-bound embedding and clustering
+            steps; defaults to the event loop's thread pool
 
     Returns:
         List of clusters with hierarchical structure
@@ -383,7 +839,8 @@ async def reduce_clusters_from_base_clusters(
     # Iteratively reduce until we have desired number of root clusters
     while len(root_clusters) > max_clusters:
         # Get updated clusters from meta-clustering
-        new_current_level = await model.reduce_clusters(root_clusters)
+        with use_executor(executor):
+            new_current_level = await model.reduce_clusters(root_clusters)
         if getattr(model, "errors", None):
             all_errors.extend(model.errors)
             model.errors = []
@@ -415,11 +872,13 @@ async def reduce_clusters_from_base_clusters(
     return all_clusters
 
 
+@timed_stage("dimensionality")
 async def reduce_dimensionality_from_clusters(
     clusters: List[Cluster],
     *,
     model: BaseDimensionalityReduction,
     checkpoint_manager: Optional[CheckpointManager] = None,
+    executor: Optional[PipelineExecutor] = None,
 ) -> List[ProjectedCluster]:
     """Reduce dimensions of clusters for visualization.
 
@@ -430,6 +889,8 @@ async def reduce_dimensionality_from_clusters(
         clusters: List of clusters to project
         model: Dimensionality reduction model to use (UMAP, t-SNE, etc.)
         checkpoint_manager: Optional checkpoint manager for caching
+        executor: Optional executor for the CPU-bound embedding and projection
+            steps; defaults to the event loop's thread pool
 
     Returns:
         List of projected clusters with 2D coordinates
@@ -457,7 +918,8 @@ async def reduce_dimensionality_from_clusters(
 
     # Reduce dimensionality
     logger.info("Projecting clusters to 2D space...")
-    projected_clusters = await model.reduce_dimensionality(clusters)
+    with use_executor(executor):
+        projected_clusters = await model.reduce_dimensionality(clusters)
     logger.info(f"Projected {len(projected_clusters)} clusters to 2D")
 
     # Save to checkpoint
@@ -467,3 +929,671 @@ async def reduce_dimensionality_from_clusters(
         )
 
     return projected_clusters
+
+
+# =============================================================================
+# Pipeline Orchestration
+# =============================================================================
+
+
+class PipelineResult(BaseModel):
+    """Outputs of every stage run by ``run_pipeline``."""
+
+    summaries: List[ConversationSummary]
+    clusters: List[Cluster]
+    meta_clusters: Optional[List[Cluster]] = None
+    projected_clusters: Optional[List[ProjectedCluster]] = None
+
+
+async def run_pipeline(
+    conversations: Union[Iterable[Conversation], AsyncIterable[Conversation]],
+    *,
+    summary_model: BaseSummaryModel,
+    cluster_model: BaseClusterModel,
+    meta_cluster_model: Optional[BaseMetaClusterModel] = None,
+    dimensionality_model: Optional[BaseDimensionalityReduction] = None,
+    checkpoint_manager: Optional[CheckpointManager] = None,
+    batch_size: int = 100,
+    queue_size: int = 2,
+    executor: Optional[PipelineExecutor] = None,
+    deduplicator: Optional[ConversationDeduplicator] = None,
+    embedding_store: Optional[EmbeddingStore] = None,
+    sqlite_store: Optional["SQLiteStore"] = None,
+) -> PipelineResult:
+    """Run the whole pipeline, overlapping summarisation and embedding.
+
+    Summaries are handed to the embedding stage through a queue holding at
+    most ``queue_size`` batches, so finished summaries are embedded while the
+    rest of the corpus is still being summarised. When the embedding stage
+    falls behind, summarisation waits for it. Clustering needs every
+    embedding and is the first barrier; meta-clustering and dimensionality
+    reduction then run as usual if their models are given.
+
+    The embedding stage is used when ``cluster_model`` has an
+    ``embedding_model`` and its ``cluster_summaries`` accepts precomputed
+    ``embeddings`` (as ``ClusterModel`` does). Other cluster models get the
+    full list of summaries once summarisation is done.
+
+    Args:
+        conversations: Conversations to analyse, as a list or a (sync or async) iterable
+        summary_model: Model used to summarise conversations
+        cluster_model: Model used to create base clusters
+        meta_cluster_model: Optional model used to build the cluster hierarchy
+        dimensionality_model: Optional model used to project the meta clusters
+            (or the base clusters without a ``meta_cluster_model``) to 2D
+        checkpoint_manager: Optional checkpoint manager for caching every stage
+        batch_size: Number of conversations summarised, and then embedded, at a time
+        queue_size: Maximum number of summary batches waiting to be embedded
+        executor: Optional executor for the CPU-bound stages
+        deduplicator: Optional ``ConversationDeduplicator`` used to summarise
+            duplicate conversations only once
+        embedding_store: Optional ``EmbeddingStore`` that summary embeddings
+            are written to as they are computed. Clustering then reads them
+            memory-mapped instead of holding them in memory, and summaries
+            already in the store are not embedded again
+        sqlite_store: Optional ``SQLiteStore`` that conversations are written
+            to as they are read, followed by the summaries and the final
+            cluster hierarchy, for indexed lookups afterwards
+
+    The timings, token counts and queue depths recorded during the run are
+    written to ``metrics.json`` in the checkpoint directory.
+
+    Returns:
+        The summaries and clusters produced by each stage
+
+    Example:
+        >>> result = await run_pipeline(
+        ...     Conversation.iter_claude_conversation_dump("conversations.json"),
+        ...     summary_model=SummaryModel(),
+        ...     cluster_model=ClusterModel(),
+        ...     meta_cluster_model=MetaClusterModel(),
+        ...     dimensionality_model=HDBUMAP(),
+        ...     checkpoint_manager=CheckpointManager("./checkpoints"),
+        ... )
+    """
+    with collect_metrics() as run_metrics:
+        async with monitor_event_loop_lag():
+            with timer("kura_stage_seconds", stage="pipeline"):
+                result = await _run_pipeline(
+                    conversations,
+                    summary_model=summary_model,
+                    cluster_model=cluster_model,
+                    meta_cluster_model=meta_cluster_model,
+                    dimensionality_model=dimensionality_model,
+                    checkpoint_manager=checkpoint_manager,
+                    batch_size=batch_size,
+                    queue_size=queue_size,
+                    executor=executor,
+                    deduplicator=deduplicator,
+                    embedding_store=embedding_store,
+                    sqlite_store=sqlite_store,
+                )
+    if checkpoint_manager is not None and checkpoint_manager.enabled:
+        run_metrics.write_json(
+            os.path.join(checkpoint_manager.checkpoint_dir, METRICS_FILENAME)
+        )
+    return result
+
+
+async def _run_pipeline(
+    conversations: Union[Iterable[Conversation], AsyncIterable[Conversation]],
+    *,
+    summary_model: BaseSummaryModel,
+    cluster_model: BaseClusterModel,
+    meta_cluster_model: Optional[BaseMetaClusterModel] = None,
+    dimensionality_model: Optional[BaseDimensionalityReduction] = None,
+    checkpoint_manager: Optional[CheckpointManager] = None,
+    batch_size: int = 100,
+    queue_size: int = 2,
+    executor: Optional[PipelineExecutor] = None,
+    deduplicator: Optional[ConversationDeduplicator] = None,
+    embedding_store: Optional[EmbeddingStore] = None,
+    sqlite_store: Optional["SQLiteStore"] = None,
+) -> PipelineResult:
+    embedding_model = _streaming_embedding_model(cluster_model, checkpoint_manager)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+    done = object()
+    embedded_summaries: List[ConversationSummary] = []
+    embedded_batches: List[EmbeddingMatrix] = []
+
+    async def _enqueue(batch: List[ConversationSummary]) -> None:
+        await queue.put(batch)
+        set_gauge("kura_queue_depth", queue.qsize(), queue="summaries")
+
+    async def _summarise() -> List[ConversationSummary]:
+        try:
+            summaries = await summarise_conversations(
+                _write_to_store(conversations, sqlite_store, batch_size)
+                if sqlite_store is not None
+                else conversations,
+                model=summary_model,
+                checkpoint_manager=checkpoint_manager,
+                batch_size=batch_size,
+                on_batch_complete=_enqueue if embedding_model else None,
+                deduplicator=deduplicator,
+            )
+        except Exception:
+            if embedding_model:
+                await queue.put(done)
+            raise
+        if embedding_model:
+            await queue.put(done)
+        return summaries
+
+    @timed_stage("embed")
+    async def _embed() -> None:
+        while True:
+            batch = await queue.get()
+            set_gauge("kura_queue_depth", queue.qsize(), queue="summaries")
+            if batch is done:
+                return
+            for start in range(0, len(batch), batch_size):
+                chunk = batch[start : start + batch_size]
+                embedded_summaries.extend(chunk)
+                if embedding_store is not None:
+                    # Summaries embedded by an earlier run are read from the store
+                    chunk = [s for s in chunk if s.chat_id not in embedding_store]
+                    if not chunk:
+                        continue
+                with use_executor(executor):
+                    vectors = await embedding_model.embed_matrix(
+                        [str(s) for s in chunk], [s.chat_id for s in chunk]
+                    )
+                if len(vectors) != len(chunk):
+                    raise ValueError(
+                        f"Embedding model returned {len(vectors)} embeddings for {len(chunk)} summaries"
+                    )
+                if embedding_store is not None:
+                    # Appending writes and fsyncs files, so it runs in a thread
+                    # to keep summarisation going meanwhile
+                    await run_in_executor(
+                        embedding_store.append,
+                        vectors.ids,
+                        vectors,
+                        process_safe=False,
+                    )
+                else:
+                    embedded_batches.append(vectors)
+            logger.info(f"Embedded {len(embedded_summaries)} summaries")
+
+    summarise_task = asyncio.ensure_future(_summarise())
+    embed_task = asyncio.ensure_future(_embed()) if embedding_model else None
+    try:
+        await asyncio.gather(
+            summarise_task, *([embed_task] if embed_task is not None else [])
+        )
+    finally:
+        for task in (summarise_task, embed_task):
+            if task is not None and not task.done():
+                task.cancel()
+    summaries = summarise_task.result()
+    if embedding_model and deduplicator is not None:
+        # Duplicate group sizes are only final once every conversation has
+        # been seen, so cluster the finished summaries in embedding order
+        final = {summary.chat_id: summary for summary in summaries}
+        embedded_summaries = [final.get(s.chat_id, s) for s in embedded_summaries]
+
+    embeddings = None
+    if embedding_model and embedding_store is not None:
+        embedded_summaries, embeddings = _summaries_in_store_order(
+            embedded_summaries, embedding_store
+        )
+    elif embedding_model:
+        embeddings = EmbeddingMatrix.concatenate(embedded_batches)
+
+    # Clustering needs every embedding, so this is the first barrier
+    clusters = await generate_base_clusters_from_conversation_summaries(
+        embedded_summaries if embedding_model else summaries,
+        model=cluster_model,
+        checkpoint_manager=checkpoint_manager,
+        batch_size=batch_size,
+        executor=executor,
+        embeddings=embeddings,
+    )
+
+    result = PipelineResult(summaries=summaries, clusters=clusters)
+    if meta_cluster_model is not None:
+        result.meta_clusters = await reduce_clusters_from_base_clusters(
+            clusters,
+            model=meta_cluster_model,
+            checkpoint_manager=checkpoint_manager,
+            executor=executor,
+        )
+    if dimensionality_model is not None:
+        result.projected_clusters = await reduce_dimensionality_from_clusters(
+            result.meta_clusters if result.meta_clusters is not None else clusters,
+            model=dimensionality_model,
+            checkpoint_manager=checkpoint_manager,
+            executor=executor,
+        )
+    if sqlite_store is not None:
+        await run_in_executor(sqlite_store.add_summaries, summaries, process_safe=False)
+        await run_in_executor(
+            sqlite_store.set_clusters,
+            result.projected_clusters or result.meta_clusters or clusters,
+            process_safe=False,
+        )
+    return result
+
+
+async def _write_to_store(
+    conversations: Union[Iterable[Conversation], AsyncIterable[Conversation]],
+    store: "SQLiteStore",
+    batch_size: int,
+) -> AsyncIterator[Conversation]:
+    """Pass conversations through, writing each batch to ``store`` on the way.
+
+    Inserts run in a worker thread, as does reading plain iterables, so
+    neither blocks the summarisation requests in flight.
+    """
+    batch: List[Conversation] = []
+    if isinstance(conversations, AsyncIterable):
+        async for conversation in conversations:
+            batch.append(conversation)
+            if len(batch) >= batch_size:
+                await run_in_executor(
+                    store.add_conversations, batch, process_safe=False
+                )
+                batch = []
+            yield conversation
+        if batch:
+            await run_in_executor(store.add_conversations, batch, process_safe=False)
+        return
+
+    it = iter(conversations)
+    while True:
+        batch = await run_in_executor(
+            _next_batch, it, batch_size, set(), process_safe=False
+        )
+        if batch:
+            await run_in_executor(store.add_conversations, batch, process_safe=False)
+        for conversation in batch:
+            yield conversation
+        if len(batch) < batch_size:
+            return
+
+
+def _summaries_in_store_order(
+    summaries: List[ConversationSummary], store: EmbeddingStore
+) -> tuple[List[ConversationSummary], EmbeddingMatrix]:
+    """Line summaries up with the store's rows so its memmap can be used as is."""
+    by_id = {summary.chat_id: summary for summary in summaries}
+    if len(store) == len(by_id) and all(id in by_id for id in store.ids):
+        return [by_id[id] for id in store.ids], store.matrix()
+
+    # The store holds other ids too, so copy out the rows for this run
+    logger.info(
+        f"Embedding store has {len(store)} embeddings for {len(by_id)} summaries, copying the matching rows into memory"
+    )
+    ids = list(by_id)
+    return list(by_id.values()), store.rows(ids)
+
+
+def _streaming_embedding_model(
+    cluster_model: BaseClusterModel, checkpoint_manager: Optional[CheckpointManager]
+):
+    """The embedding model to stream summaries into, if the cluster model supports it."""
+    embedding_model = getattr(cluster_model, "embedding_model", None)
+    if embedding_model is None:
+        return None
+    if (
+        "embeddings"
+        not in inspect.signature(cluster_model.cluster_summaries).parameters
+    ):
+        return None
+    if (
+        checkpoint_manager
+        and checkpoint_manager.enabled
+        and os.path.exists(
+            checkpoint_manager.get_checkpoint_path(cluster_model.checkpoint_filename)
+        )
+    ):
+        # Clusters will come from the checkpoint, embedding would be wasted work
+        return None
+    return embedding_model
+
+
+# =============================================================================
+# Incremental Ingestion
+# =============================================================================
+
+
+async def assign_new_conversations(
+    summaries: List[ConversationSummary],
+    *,
+    cluster_model: BaseClusterModel,
+    checkpoint_manager: CheckpointManager,
+    meta_cluster_model: Optional[BaseMetaClusterModel] = None,
+    max_distance: float = 0.25,
+    summary_checkpoint_filename: str = "summaries.jsonl",
+    centroid_checkpoint_filename: str = "cluster_centroids.jsonl",
+    batch_size: int = 100,
+    executor: Optional[PipelineExecutor] = None,
+) -> PipelineResult:
+    """Add new conversation summaries to an existing set of clusters.
+
+    Loads the base clusters (and meta clusters) from ``checkpoint_manager``
+    instead of re-clustering the whole corpus:
+
+    1. Only summaries whose ``chat_id`` is not already clustered are embedded.
+    2. Each one joins the base cluster with the nearest centroid if its cosine
+       distance is at most ``max_distance``.
+    3. The leftovers are clustered and named by ``cluster_model``.
+    4. If a ``meta_cluster_model`` is given, the hierarchy is updated in
+       place. Parent clusters gain the newly assigned chat ids, and each new
+       base cluster is attached next to its nearest existing base cluster if
+       that one is within ``max_distance``. Only when this leaves more than
+       ``max_clusters`` roots are the roots reduced again by the model.
+
+    Centroids are persisted in ``centroid_checkpoint_filename`` and updated
+    as conversations are assigned. On the first incremental run they are
+    built from the summaries checkpoint. Any dimensionality reduction
+    checkpoint is stale afterwards and should be regenerated.
+
+    Args:
+        summaries: Summaries of the new conversations
+        cluster_model: Model used to cluster leftovers, its ``embedding_model``
+            is used for all embeddings
+        checkpoint_manager: Checkpoint manager holding the existing clusters
+        meta_cluster_model: Optional model whose hierarchy checkpoint is updated
+        max_distance: Maximum cosine distance to a centroid for assignment
+        summary_checkpoint_filename: Checkpoint with the summaries of the
+            existing clusters, used to build missing centroids
+        centroid_checkpoint_filename: Checkpoint for the cluster centroids
+        batch_size: Batch size for naming leftover clusters
+        executor: Optional executor for the CPU-bound stages
+
+    Returns:
+        The new summaries with the updated base and meta clusters
+
+    Example:
+        >>> summaries = await summarise_conversations(todays_conversations, ...)
+        >>> result = await assign_new_conversations(
+        ...     summaries,
+        ...     cluster_model=ClusterModel(),
+        ...     meta_cluster_model=MetaClusterModel(),
+        ...     checkpoint_manager=checkpoint_mgr,
+        ... )
+    """
+    import numpy as np
+
+    embedding_model = getattr(cluster_model, "embedding_model", None)
+    if embedding_model is None:
+        raise ValueError(
+            "assign_new_conversations needs a cluster model with an embedding_model"
+        )
+
+    base_clusters = checkpoint_manager.load_checkpoint(
+        cluster_model.checkpoint_filename, Cluster
+    )
+    if not base_clusters:
+        raise ValueError(
+            f"No base clusters found in {cluster_model.checkpoint_filename}, run the full pipeline first"
+        )
+    meta_clusters = (
+        checkpoint_manager.load_checkpoint(
+            meta_cluster_model.checkpoint_filename, Cluster
+        )
+        if meta_cluster_model is not None
+        else None
+    )
+
+    clustered_ids = {chat_id for c in base_clusters for chat_id in c.chat_ids}
+    new_summaries = [s for s in summaries if s.chat_id not in clustered_ids]
+    if not new_summaries:
+        logger.info("All summaries are already clustered, nothing to assign")
+        return PipelineResult(
+            summaries=summaries, clusters=base_clusters, meta_clusters=meta_clusters
+        )
+
+    centroids = await _load_or_build_centroids(
+        base_clusters,
+        embedding_model=embedding_model,
+        checkpoint_manager=checkpoint_manager,
+        summary_checkpoint_filename=summary_checkpoint_filename,
+        centroid_checkpoint_filename=centroid_checkpoint_filename,
+        executor=executor,
+    )
+
+    with use_executor(executor):
+        vectors = (
+            await embedding_model.embed_matrix(
+                [str(s) for s in new_summaries], [s.chat_id for s in new_summaries]
+            )
+        ).vectors
+    logger.info(f"Embedded {len(new_summaries)} new summaries")
+
+    # Nearest centroid by cosine distance
+    cluster_ids = list(centroids.keys())
+    if cluster_ids:
+        matrix = np.stack([centroids[c].centroid for c in cluster_ids])
+        similarities = _normalise_rows(vectors) @ _normalise_rows(matrix).T
+        nearest = similarities.argmax(axis=1)
+        distances = 1.0 - similarities[np.arange(len(new_summaries)), nearest]
+        assigned_mask = distances <= max_distance
+    else:
+        assigned_mask = np.zeros(len(new_summaries), dtype=bool)
+
+    additions: dict[str, List[str]] = {}
+    for row in np.flatnonzero(assigned_mask).tolist():
+        cluster_id = cluster_ids[nearest[row]]
+        additions.setdefault(cluster_id, []).append(new_summaries[row].chat_id)
+        centroid = centroids[cluster_id]
+        mean = np.asarray(centroid.centroid, dtype=np.float64)
+        mean += (vectors[row] - mean) / (centroid.count + 1)
+        centroids[cluster_id] = ClusterCentroid(
+            cluster_id=cluster_id, centroid=mean.tolist(), count=centroid.count + 1
+        )
+    logger.info(
+        f"Assigned {int(assigned_mask.sum())}/{len(new_summaries)} new summaries to {len(additions)} existing clusters"
+    )
+
+    base_clusters = [
+        c.model_copy(update={"chat_ids": c.chat_ids + additions[c.id]})
+        if c.id in additions
+        else c
+        for c in base_clusters
+    ]
+
+    # Cluster whatever did not fit an existing cluster
+    leftover_rows = np.flatnonzero(~assigned_mask).tolist()
+    new_clusters: List[Cluster] = []
+    if leftover_rows:
+        leftovers = [new_summaries[row] for row in leftover_rows]
+        logger.info(
+            f"Clustering {len(leftovers)} summaries that fit no existing cluster"
+        )
+        extra_kwargs = (
+            {"embeddings": EmbeddingMatrix(vectors[leftover_rows])}
+            if "embeddings"
+            in inspect.signature(cluster_model.cluster_summaries).parameters
+            else {}
+        )
+        with use_executor(executor):
+            new_clusters = await cluster_model.cluster_summaries(
+                leftovers, batch_size=batch_size, **extra_kwargs
+            )
+        row_of = {new_summaries[row].chat_id: row for row in leftover_rows}
+        for cluster in new_clusters:
+            rows = [
+                row_of[chat_id] for chat_id in cluster.chat_ids if chat_id in row_of
+            ]
+            if rows:
+                centroids[cluster.id] = ClusterCentroid(
+                    cluster_id=cluster.id,
+                    centroid=vectors[rows].mean(axis=0).tolist(),
+                    count=len(rows),
+                )
+
+    all_base_clusters = base_clusters + new_clusters
+    checkpoint_manager.save_checkpoint(
+        cluster_model.checkpoint_filename, all_base_clusters
+    )
+    checkpoint_manager.save_checkpoint(
+        centroid_checkpoint_filename, list(centroids.values())
+    )
+
+    if meta_cluster_model is not None:
+        if meta_clusters:
+            meta_clusters = await _update_meta_clusters(
+                meta_clusters,
+                additions=additions,
+                new_clusters=new_clusters,
+                centroids=centroids,
+                existing_ids=cluster_ids,
+                model=meta_cluster_model,
+                max_distance=max_distance,
+                executor=executor,
+            )
+            checkpoint_manager.save_checkpoint(
+                meta_cluster_model.checkpoint_filename, meta_clusters
+            )
+        else:
+            meta_clusters = await reduce_clusters_from_base_clusters(
+                all_base_clusters,
+                model=meta_cluster_model,
+                checkpoint_manager=checkpoint_manager,
+                executor=executor,
+            )
+
+    return PipelineResult(
+        summaries=summaries, clusters=all_base_clusters, meta_clusters=meta_clusters
+    )
+
+
+def _normalise_rows(matrix):
+    import numpy as np
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+async def _load_or_build_centroids(
+    base_clusters: List[Cluster],
+    *,
+    embedding_model,
+    checkpoint_manager: CheckpointManager,
+    summary_checkpoint_filename: str,
+    centroid_checkpoint_filename: str,
+    executor: Optional[PipelineExecutor],
+) -> dict[str, ClusterCentroid]:
+    """Load centroids for ``base_clusters``, embedding summaries for any missing ones."""
+
+    cached = (
+        checkpoint_manager.load_checkpoint(
+            centroid_checkpoint_filename, ClusterCentroid
+        )
+        or []
+    )
+    wanted = {c.id for c in base_clusters}
+    centroids = {c.cluster_id: c for c in cached if c.cluster_id in wanted}
+    missing = [c for c in base_clusters if c.id not in centroids]
+    if not missing:
+        return centroids
+
+    summaries = (
+        checkpoint_manager.load_checkpoint(
+            summary_checkpoint_filename, ConversationSummary
+        )
+        or []
+    )
+    by_chat_id = {s.chat_id: s for s in summaries}
+    members = [
+        (cluster, [by_chat_id[i] for i in cluster.chat_ids if i in by_chat_id])
+        for cluster in missing
+    ]
+    texts = [str(s) for _, group in members for s in group]
+    if not texts:
+        logger.warning(
+            f"No checkpointed summaries found in {summary_checkpoint_filename} for {len(missing)} clusters"
+        )
+        return centroids
+    logger.info(
+        f"Building centroids for {len(missing)} clusters from {len(texts)} checkpointed summaries"
+    )
+    with use_executor(executor):
+        vectors = (await embedding_model.embed_matrix(texts)).vectors
+
+    start = 0
+    for cluster, group in members:
+        if not group:
+            logger.warning(
+                f"No summaries found for cluster {cluster.id}, it won't receive new conversations"
+            )
+            continue
+        centroids[cluster.id] = ClusterCentroid(
+            cluster_id=cluster.id,
+            centroid=vectors[start : start + len(group)].mean(axis=0).tolist(),
+            count=len(group),
+        )
+        start += len(group)
+    return centroids
+
+
+async def _update_meta_clusters(
+    meta_clusters: List[Cluster],
+    *,
+    additions: dict[str, List[str]],
+    new_clusters: List[Cluster],
+    centroids: dict[str, ClusterCentroid],
+    existing_ids: List[str],
+    model: BaseMetaClusterModel,
+    max_distance: float,
+    executor: Optional[PipelineExecutor],
+) -> List[Cluster]:
+    """Fold assigned conversations and new base clusters into a hierarchy."""
+    import numpy as np
+
+    by_id = {c.id: c for c in meta_clusters}
+    order = [c.id for c in meta_clusters]
+
+    def add_chat_ids(cluster_id: Optional[str], chat_ids: List[str]) -> None:
+        # Every ancestor holds the chat ids of all of its descendants
+        while cluster_id is not None and cluster_id in by_id:
+            cluster = by_id[cluster_id]
+            seen = set(cluster.chat_ids)
+            by_id[cluster_id] = cluster.model_copy(
+                update={
+                    "chat_ids": cluster.chat_ids
+                    + [i for i in chat_ids if i not in seen]
+                }
+            )
+            cluster_id = cluster.parent_id
+
+    for cluster_id, chat_ids in additions.items():
+        add_chat_ids(cluster_id, chat_ids)
+
+    # Attach each new base cluster next to its nearest existing base cluster
+    anchors = [c for c in existing_ids if c in by_id and c in centroids]
+    anchor_matrix = (
+        _normalise_rows(np.stack([centroids[c].centroid for c in anchors]))
+        if anchors
+        else None
+    )
+    for cluster in new_clusters:
+        parent_id = None
+        if anchor_matrix is not None and cluster.id in centroids:
+            vector = _normalise_rows(np.asarray([centroids[cluster.id].centroid]))
+            similarities = (vector @ anchor_matrix.T)[0]
+            best = int(similarities.argmax())
+            if 1.0 - similarities[best] <= max_distance:
+                parent_id = by_id[anchors[best]].parent_id
+        by_id[cluster.id] = cluster.model_copy(update={"parent_id": parent_id})
+        order.append(cluster.id)
+        add_chat_ids(parent_id, cluster.chat_ids)
+
+    roots = [by_id[i] for i in order if by_id[i].parent_id is None]
+    max_clusters = getattr(model, "max_clusters", 10)
+    if len(roots) > max_clusters:
+        logger.info(
+            f"{len(roots)} root clusters after assignment, reducing them to {max_clusters}"
+        )
+        reduced = await reduce_clusters_from_base_clusters(
+            roots, model=model, executor=executor
+        )
+        for cluster in reduced:
+            if cluster.id not in by_id:
+                order.append(cluster.id)
+            by_id[cluster.id] = cluster
+
+    return [by_id[i] for i in order]
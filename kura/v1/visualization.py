@@ -10,10 +10,20 @@ Compatible with the procedural Kura v1 pipeline approach.
 from typing import List, Optional, Union, TYPE_CHECKING, Any
 from pathlib import Path
 import logging
+import sys
+from kura.cluster_tree import (
+    ClusterTree,
+    format_enhanced_tree_lines,
+    format_tree_line,
+    render_enhanced_tree,
+    render_tree,
+    walk_tree,
+)
 from kura.types import Cluster, ClusterTreeNode
 
 if TYPE_CHECKING:
     from rich.console import Console as ConsoleType
+    from kura.sqlite_store import SQLiteStore
 else:
     ConsoleType = Any
 
@@ -51,7 +61,9 @@ def _build_tree_structure(
 ) -> str:
     """Build a text representation of the hierarchical cluster tree.
 
-    This is a recursive helper function used by visualise_clusters().
+    The tree is walked iteratively, so deep hierarchies don't hit the
+    recursion limit. visualise_clusters() streams the same lines straight
+    from a ClusterTree instead.
 
     Args:
         node: Current tree node
@@ -63,39 +75,16 @@ def _build_tree_structure(
     Returns:
         String representation of the tree structure
     """
-    # Current line prefix (used for tree visualization symbols)
-    current_prefix = prefix
-
-    # Add the appropriate connector based on whether this is the last child
-    if level > 0:
-        if is_last:
-            current_prefix += "╚══ "
-        else:
-            current_prefix += "╠══ "
-
-    # Print the current node
-    result = current_prefix + node.name + " (" + str(node.count) + " conversations)\n"
-
-    # Calculate the prefix for children (continue vertical lines for non-last children)
-    child_prefix = prefix
-    if level > 0:
-        if is_last:
-            child_prefix += "    "  # No vertical line needed for last child's children
-        else:
-            child_prefix += (
-                "║   "  # Continue vertical line for non-last child's children
-            )
-
-    # Process children
-    children = node.children
-    for i, child_id in enumerate(children):
-        child = node_id_to_cluster[child_id]
-        is_last_child = i == len(children) - 1
-        result += _build_tree_structure(
-            child, node_id_to_cluster, level + 1, is_last_child, child_prefix
+    return "".join(
+        format_tree_line(current.name, current.count, *position)
+        for current, *position in walk_tree(
+            node,
+            lambda n: [node_id_to_cluster[child_id] for child_id in n.children],
+            level=level,
+            is_last=is_last,
+            prefix=prefix,
         )
-
-    return result
+    )
 
 
 def _build_enhanced_tree_structure(
@@ -119,77 +108,22 @@ def _build_enhanced_tree_structure(
     Returns:
         String representation of the enhanced tree structure
     """
-    # Color scheme based on level
-    colors = [
-        "bright_cyan",
-        "bright_green",
-        "bright_yellow",
-        "bright_magenta",
-        "bright_blue",
-    ]
-    colors[level % len(colors)]
-
-    # Current line prefix (used for tree visualization symbols)
-    current_prefix = prefix
-
-    # Add the appropriate connector based on whether this is the last child
-    if level > 0:
-        if is_last:
-            current_prefix += "╚══ "
-        else:
-            current_prefix += "╠══ "
-
-    # Calculate percentage of total conversations
-    percentage = (
-        (node.count / total_conversations * 100) if total_conversations > 0 else 0
-    )
-
-    # Create progress bar for visual representation
-    bar_width = 20
-    filled_width = (
-        int((node.count / total_conversations) * bar_width)
-        if total_conversations > 0
-        else 0
-    )
-    progress_bar = "█" * filled_width + "░" * (bar_width - filled_width)
-
-    # Build the line with enhanced formatting
-    result = f"{current_prefix}🔸 {node.name}\n"
-    result += f"{prefix}{'║   ' if not is_last and level > 0 else '    '}📊 {node.count:,} conversations ({percentage:.1f}%) [{progress_bar}]\n"
-
-    # Add description if available and not too long
-    if (
-        hasattr(node, "description")
-        and node.description
-        and len(node.description) < 100
-    ):
-        result += f"{prefix}{'║   ' if not is_last and level > 0 else '    '}💭 {node.description}\n"
-
-    result += "\n"
-
-    # Calculate the prefix for children
-    child_prefix = prefix
-    if level > 0:
-        if is_last:
-            child_prefix += "    "
-        else:
-            child_prefix += "║   "
-
-    # Process children
-    children = node.children
-    for i, child_id in enumerate(children):
-        child = node_id_to_cluster[child_id]
-        is_last_child = i == len(children) - 1
-        result += _build_enhanced_tree_structure(
-            child,
-            node_id_to_cluster,
-            level + 1,
-            is_last_child,
-            child_prefix,
+    return "".join(
+        format_enhanced_tree_lines(
+            current.name,
+            current.count,
+            current.description,
+            *position,
             total_conversations,
         )
-
-    return result
+        for current, *position in walk_tree(
+            node,
+            lambda n: [node_id_to_cluster[child_id] for child_id in n.children],
+            level=level,
+            is_last=is_last,
+            prefix=prefix,
+        )
+    )
 
 
 def _load_clusters_from_checkpoint(checkpoint_path: Union[str, Path]) -> List[Cluster]:
@@ -205,18 +139,27 @@ def _load_clusters_from_checkpoint(checkpoint_path: Union[str, Path]) -> List[Cl
         FileNotFoundError: If checkpoint file doesn't exist
         ValueError: If checkpoint file is malformed
     """
-    checkpoint_path = Path(checkpoint_path)
+    return ClusterTree.from_checkpoint(checkpoint_path).clusters
+
 
-    if not checkpoint_path.exists():
-        raise FileNotFoundError(f"Checkpoint file not found: {checkpoint_path}")
+def _load_cluster_tree(
+    clusters: Optional[List[Cluster]],
+    checkpoint_path: Optional[Union[str, Path]],
+    store: Optional["SQLiteStore"] = None,
+) -> ClusterTree:
+    """Index the given clusters, or load the tree from store or checkpoint_path.
 
-    try:
-        with open(checkpoint_path) as f:
-            clusters = [Cluster.model_validate_json(line) for line in f]
-        logger.info(f"Loaded {len(clusters)} clusters from {checkpoint_path}")
-        return clusters
-    except Exception as e:
-        raise ValueError(f"Failed to load clusters from {checkpoint_path}: {e}")
+    Raises:
+        ValueError: If neither clusters, store nor checkpoint_path is provided
+        FileNotFoundError: If checkpoint file doesn't exist
+    """
+    if clusters is not None:
+        return ClusterTree(clusters)
+    if store is not None:
+        return store.cluster_tree()
+    if checkpoint_path is None:
+        raise ValueError("Either clusters, store or checkpoint_path must be provided")
+    return ClusterTree.from_checkpoint(checkpoint_path)
 
 
 def _build_cluster_tree(clusters: List[Cluster]) -> dict[str, ClusterTreeNode]:
@@ -228,31 +171,25 @@ def _build_cluster_tree(clusters: List[Cluster]) -> dict[str, ClusterTreeNode]:
     Returns:
         Dictionary mapping cluster IDs to tree nodes
     """
-    node_id_to_cluster = {}
-
-    # Create tree nodes
-    for cluster in clusters:
-        node_id_to_cluster[cluster.id] = ClusterTreeNode(
+    tree = ClusterTree(clusters)
+    return {
+        cluster.id: ClusterTreeNode(
             id=cluster.id,
             name=cluster.name,
             description=cluster.description,
             slug=cluster.slug,
-            count=len(cluster.chat_ids),
-            children=[],
+            count=tree.counts[i],
+            children=[tree.clusters[child].id for child in tree.children[i]],
         )
-
-    # Link parent-child relationships
-    for cluster in clusters:
-        if cluster.parent_id:
-            node_id_to_cluster[cluster.parent_id].children.append(cluster.id)
-
-    return node_id_to_cluster
+        for i, cluster in enumerate(tree.clusters)
+    }
 
 
 def visualise_clusters(
     clusters: Optional[List[Cluster]] = None,
     *,
     checkpoint_path: Optional[Union[str, Path]] = None,
+    store: Optional["SQLiteStore"] = None,
 ) -> None:
     """Print a hierarchical visualization of clusters to the terminal.
 
@@ -264,9 +201,10 @@ def visualise_clusters(
     Args:
         clusters: List of clusters to visualize. If None, loads from checkpoint_path
         checkpoint_path: Path to checkpoint file to load clusters from
+        store: SQLiteStore to load the hierarchy from, without chat ids
 
     Raises:
-        ValueError: If neither clusters nor checkpoint_path is provided
+        ValueError: If neither clusters, store nor checkpoint_path is provided
         FileNotFoundError: If checkpoint file doesn't exist
 
     Example output:
@@ -276,40 +214,18 @@ def visualise_clusters(
         ║       ╚══ Compare and select Flutter state management solutions (17 conversations)
         ╠══ Optimize blog posts for SEO and improved user engagement (28 conversations)
     """
-    # Load clusters
-    if clusters is None:
-        if checkpoint_path is None:
-            raise ValueError("Either clusters or checkpoint_path must be provided")
-        clusters = _load_clusters_from_checkpoint(checkpoint_path)
-
-    logger.info(f"Visualizing {len(clusters)} clusters")
+    tree = _load_cluster_tree(clusters, checkpoint_path, store)
+    logger.info(f"Visualizing {len(tree)} clusters")
 
-    # Build tree structure
-    node_id_to_cluster = _build_cluster_tree(clusters)
-
-    # Find root nodes and build the tree
-    root_nodes = [
-        node_id_to_cluster[cluster.id] for cluster in clusters if not cluster.parent_id
-    ]
-
-    total_conversations = sum(node.count for node in root_nodes)
-    fake_root = ClusterTreeNode(
-        id="root",
-        name="Clusters",
-        description="All clusters",
-        slug="all_clusters",
-        count=total_conversations,
-        children=[node.id for node in root_nodes],
-    )
-
-    tree_output = _build_tree_structure(fake_root, node_id_to_cluster, 0, False)
-    print(tree_output)
+    render_tree(tree, sys.stdout)
+    print()
 
 
 def visualise_clusters_enhanced(
     clusters: Optional[List[Cluster]] = None,
     *,
     checkpoint_path: Optional[Union[str, Path]] = None,
+    store: Optional["SQLiteStore"] = None,
 ) -> None:
     """Print an enhanced hierarchical visualization of clusters with colors and statistics.
 
@@ -319,57 +235,32 @@ def visualise_clusters_enhanced(
     Args:
         clusters: List of clusters to visualize. If None, loads from checkpoint_path
         checkpoint_path: Path to checkpoint file to load clusters from
+        store: SQLiteStore to load the hierarchy from, without chat ids
 
     Raises:
-        ValueError: If neither clusters nor checkpoint_path is provided
+        ValueError: If neither clusters, store nor checkpoint_path is provided
         FileNotFoundError: If checkpoint file doesn't exist
     """
-    # Load clusters
-    if clusters is None:
-        if checkpoint_path is None:
-            raise ValueError("Either clusters or checkpoint_path must be provided")
-        clusters = _load_clusters_from_checkpoint(checkpoint_path)
-
-    logger.info(f"Enhanced visualization of {len(clusters)} clusters")
+    tree = _load_cluster_tree(clusters, checkpoint_path, store)
+    logger.info(f"Enhanced visualization of {len(tree)} clusters")
 
     print("\n" + "=" * 80)
     print("🎯 ENHANCED CLUSTER VISUALIZATION")
     print("=" * 80)
 
-    # Build tree structure
-    node_id_to_cluster = _build_cluster_tree(clusters)
-
-    # Calculate total conversations from root clusters only
-    root_clusters = [cluster for cluster in clusters if not cluster.parent_id]
-    total_conversations = sum(len(cluster.chat_ids) for cluster in root_clusters)
-
-    # Find root nodes
-    root_nodes = [node_id_to_cluster[cluster.id] for cluster in root_clusters]
-
-    fake_root = ClusterTreeNode(
-        id="root",
-        name=f"📚 All Clusters ({total_conversations:,} total conversations)",
-        description="Hierarchical conversation clustering results",
-        slug="all_clusters",
-        count=total_conversations,
-        children=[node.id for node in root_nodes],
-    )
-
-    tree_output = _build_enhanced_tree_structure(
-        fake_root, node_id_to_cluster, 0, False, "", total_conversations
-    )
-
-    print(tree_output)
+    total_conversations = tree.total_conversations
+    render_enhanced_tree(tree, sys.stdout)
+    print()
 
     # Add summary statistics
     print("=" * 80)
     print("📈 CLUSTER STATISTICS")
     print("=" * 80)
-    print(f"📊 Total Clusters: {len(clusters)}")
-    print(f"🌳 Root Clusters: {len(root_nodes)}")
+    print(f"📊 Total Clusters: {len(tree)}")
+    print(f"🌳 Root Clusters: {len(tree.roots)}")
     print(f"💬 Total Conversations: {total_conversations:,}")
     print(
-        f"📏 Average Conversations per Root Cluster: {total_conversations / len(root_nodes):.1f}"
+        f"📏 Average Conversations per Root Cluster: {total_conversations / len(tree.roots):.1f}"
     )
     print("=" * 80 + "\n")
 
@@ -378,6 +269,7 @@ def visualise_clusters_rich(
     clusters: Optional[List[Cluster]] = None,
     *,
     checkpoint_path: Optional[Union[str, Path]] = None,
+    store: Optional["SQLiteStore"] = None,
     console: Optional[ConsoleType] = None,
 ) -> None:
     """Print a rich-formatted hierarchical visualization using Rich library.
@@ -389,15 +281,18 @@ def visualise_clusters_rich(
     Args:
         clusters: List of clusters to visualize. If None, loads from checkpoint_path
         checkpoint_path: Path to checkpoint file to load clusters from
+        store: SQLiteStore to load the hierarchy from, without chat ids
         console: Rich Console instance. If None, creates a new one or falls back
 
     Raises:
-        ValueError: If neither clusters nor checkpoint_path is provided
+        ValueError: If neither clusters, store nor checkpoint_path is provided
         FileNotFoundError: If checkpoint file doesn't exist
     """
     if not RICH_AVAILABLE:
         logger.warning("Rich library not available. Using enhanced visualization...")
-        visualise_clusters_enhanced(clusters, checkpoint_path=checkpoint_path)
+        visualise_clusters_enhanced(
+            clusters, checkpoint_path=checkpoint_path, store=store
+        )
         return
 
     # Create console if not provided
@@ -406,30 +301,23 @@ def visualise_clusters_rich(
 
     if console is None:
         logger.warning("Console not available. Using enhanced visualization...")
-        visualise_clusters_enhanced(clusters, checkpoint_path=checkpoint_path)
+        visualise_clusters_enhanced(
+            clusters, checkpoint_path=checkpoint_path, store=store
+        )
         return
 
-    # Load clusters
-    if clusters is None:
-        if checkpoint_path is None:
-            raise ValueError("Either clusters or checkpoint_path must be provided")
-        clusters = _load_clusters_from_checkpoint(checkpoint_path)
-
-    logger.info(f"Rich visualization of {len(clusters)} clusters")
-
-    # Build cluster tree structure
-    node_id_to_cluster = _build_cluster_tree(clusters)
+    cluster_tree = _load_cluster_tree(clusters, checkpoint_path, store)
+    logger.info(f"Rich visualization of {len(cluster_tree)} clusters")
 
     # Calculate total conversations from root clusters only
-    root_clusters = [cluster for cluster in clusters if not cluster.parent_id]
-    total_conversations = sum(len(cluster.chat_ids) for cluster in root_clusters)
+    total_conversations = cluster_tree.total_conversations
 
     # Create Rich Tree
     if Tree is None:
         logger.warning(
             "Rich Tree component not available. Using enhanced visualization..."
         )
-        visualise_clusters_enhanced(clusters, checkpoint_path=checkpoint_path)
+        visualise_clusters_enhanced(cluster_tree.clusters)
         return
 
     tree = Tree(
@@ -437,58 +325,57 @@ def visualise_clusters_rich(
         style="bold bright_cyan",
     )
 
-    # Add root clusters to tree
-    root_nodes = [node_id_to_cluster[cluster.id] for cluster in root_clusters]
-
-    def add_node_to_tree(rich_tree, cluster_node, level=0):
-        """Recursively add nodes to Rich tree with formatting."""
-        # Color scheme based on level
-        colors = [
-            "bright_green",
-            "bright_yellow",
-            "bright_magenta",
-            "bright_blue",
-            "bright_red",
-        ]
+    # Color scheme based on level
+    colors = [
+        "bright_green",
+        "bright_yellow",
+        "bright_magenta",
+        "bright_blue",
+        "bright_red",
+    ]
+
+    def node_label(index: int, level: int) -> str:
+        """Format a cluster as a Rich tree label."""
+        cluster = cluster_tree.clusters[index]
+        count = cluster_tree.counts[index]
         color = colors[level % len(colors)]
 
         # Calculate percentage
         percentage = (
-            (cluster_node.count / total_conversations * 100)
-            if total_conversations > 0
-            else 0
+            (count / total_conversations * 100) if total_conversations > 0 else 0
         )
 
         # Create progress bar representation
         bar_width = 15
         filled_width = (
-            int((cluster_node.count / total_conversations) * bar_width)
+            int((count / total_conversations) * bar_width)
             if total_conversations > 0
             else 0
         )
         progress_bar = "█" * filled_width + "░" * (bar_width - filled_width)
 
         # Create node label with rich formatting
-        label = f"[bold {color}]{cluster_node.name}[/] [dim]({cluster_node.count:,} conversations, {percentage:.1f}%)[/]"
-        if hasattr(cluster_node, "description") and cluster_node.description:
+        label = f"[bold {color}]{cluster.name}[/] [dim]({count:,} conversations, {percentage:.1f}%)[/]"
+        if cluster.description:
             short_desc = (
-                cluster_node.description[:80] + "..."
-                if len(cluster_node.description) > 80
-                else cluster_node.description
+                cluster.description[:80] + "..."
+                if len(cluster.description) > 80
+                else cluster.description
             )
             label += f"\n[italic dim]{short_desc}[/]"
         label += f"\n[dim]Progress: [{progress_bar}][/]"
+        return label
 
-        node = rich_tree.add(label)
-
-        # Add children
-        for child_id in cluster_node.children:
-            child = node_id_to_cluster[child_id]
-            add_node_to_tree(node, child, level + 1)
-
-    # Add all root nodes to the tree
-    for root_node in sorted(root_nodes, key=lambda x: x.count, reverse=True):
-        add_node_to_tree(tree, root_node)
+    # Add root clusters, largest first, then their descendants in order
+    root_nodes = sorted(
+        cluster_tree.roots, key=lambda i: cluster_tree.counts[i], reverse=True
+    )
+    stack = [(tree, index, 0) for index in reversed(root_nodes)]
+    while stack:
+        parent, index, level = stack.pop()
+        node = parent.add(node_label(index, level))
+        for child in reversed(cluster_tree.children[index]):
+            stack.append((node, child, level + 1))
 
     # Only create tables if Rich components are available
     if Table is None or ROUNDED is None:
@@ -502,7 +389,7 @@ def visualise_clusters_rich(
     stats_table.add_column("Metric", style="bold bright_yellow")
     stats_table.add_column("Value", style="bright_green")
 
-    stats_table.add_row("📊 Total Clusters", f"{len(clusters):,}")
+    stats_table.add_row("📊 Total Clusters", f"{len(cluster_tree):,}")
     stats_table.add_row("🌳 Root Clusters", f"{len(root_nodes):,}")
     stats_table.add_row("💬 Total Conversations", f"{total_conversations:,}")
     stats_table.add_row(
@@ -520,7 +407,7 @@ def visualise_clusters_rich(
     size_table.add_column("Percentage", style="bright_blue")
 
     # Calculate size distribution for root clusters
-    root_sizes = [node.count for node in root_nodes]
+    root_sizes = [cluster_tree.counts[i] for i in root_nodes]
     size_ranges = [
         ("🔥 Large (>100)", lambda x: x > 100),
         ("📈 Medium (21-100)", lambda x: 21 <= x <= 100),
@@ -5,8 +5,17 @@ in the terminal, including basic tree views, enhanced visualizations with statis
 and rich-formatted output using the Rich library when available.
 """
 
+import sys
 from typing import TYPE_CHECKING
-from kura.types import Cluster, ClusterTreeNode
+from kura.cluster_tree import (
+    ClusterTree,
+    format_enhanced_tree_lines,
+    format_tree_line,
+    render_enhanced_tree,
+    render_tree,
+    walk_tree,
+)
+from kura.types import ClusterTreeNode
 
 # Try to import Rich, fall back gracefully if not available
 try:
@@ -56,7 +65,8 @@ class ClusterVisualizer:
     ) -> str:
         """Build a text representation of the hierarchical cluster tree.
 
-        This is a recursive helper method used by visualise_clusters().
+        The tree is walked iteratively, so deep hierarchies don't hit the
+        recursion limit.
 
         Args:
             node: Current tree node
@@ -68,43 +78,16 @@ class ClusterVisualizer:
         Returns:
             String representation of the tree structure
         """
-        # Current line prefix (used for tree visualization symbols)
-        current_prefix = prefix
-
-        # Add the appropriate connector based on whether this is the last child
-        if level > 0:
-            if is_last:
-                current_prefix += "╚══ "
-            else:
-                current_prefix += "╠══ "
-
-        # Print the current node
-        result = (
-            current_prefix + node.name + " (" + str(node.count) + " conversations)\n"
-        )
-
-        # Calculate the prefix for children (continue vertical lines for non-last children)
-        child_prefix = prefix
-        if level > 0:
-            if is_last:
-                child_prefix += (
-                    "    "  # No vertical line needed for last child's children
-                )
-            else:
-                child_prefix += (
-                    "║   "  # Continue vertical line for non-last child's children
-                )
-
-        # Process children
-        children = node.children
-        for i, child_id in enumerate(children):
-            child = node_id_to_cluster[child_id]
-            is_last_child = i == len(children) - 1
-            result += self._build_tree_structure(
-                child, node_id_to_cluster, level + 1, is_last_child, child_prefix
+        return "".join(
+            format_tree_line(current.name, current.count, *position)
+            for current, *position in walk_tree(
+                node,
+                lambda n: [node_id_to_cluster[child_id] for child_id in n.children],
+                level=level,
+                is_last=is_last,
+                prefix=prefix,
             )
-
-        return result
+        )
 
     def visualise_clusters(self):
         """Print a hierarchical visualization of clusters to the terminal.
@@ -121,45 +104,9 @@ class ClusterVisualizer:
         ║       ╚══ Compare and select Flutter state management solutions (17 conversations)
         ╠══ Optimize blog posts for SEO and improved user engagement (28 conversations)
         """
-        with open(self.kura.meta_cluster_checkpoint_path) as f:
-            clusters = [Cluster.model_validate_json(line) for line in f]
-
-        node_id_to_cluster = {}
-
-        for node in clusters:
-            node_id_to_cluster[node.id] = ClusterTreeNode(
-                id=node.id,
-                name=node.name,
-                description=node.description,
-                slug=node.slug,
-                count=len(node.chat_ids),  # Access the actual count value
-                children=[],
-            )
-
-        for node in clusters:
-            if node.parent_id:
-                node_id_to_cluster[node.parent_id].children.append(node.id)
-
-        # Find root nodes and build the tree
-        tree_output = ""
-        root_nodes = [
-            node_id_to_cluster[node.id] for node in clusters if not node.parent_id
-        ]
-
-        fake_root = ClusterTreeNode(
-            id="root",
-            name="Clusters",
-            description="All clusters",
-            slug="all_clusters",
-            count=sum(node.count for node in root_nodes),
-            children=[node.id for node in root_nodes],
-        )
-
-        tree_output += self._build_tree_structure(
-            fake_root, node_id_to_cluster, 0, False
-        )
-
-        print(tree_output)
+        tree = ClusterTree.from_checkpoint(self.kura.meta_cluster_checkpoint_path)
+        render_tree(tree, sys.stdout)
+        print()
 
     def _build_enhanced_tree_structure(
         self,
@@ -183,77 +130,22 @@ class ClusterVisualizer:
         Returns:
             String representation of the enhanced tree structure
         """
-        # Color scheme based on level
-        colors = [
-            "bright_cyan",
-            "bright_green",
-            "bright_yellow",
-            "bright_magenta",
-            "bright_blue",
-        ]
-        colors[level % len(colors)]
-
-        # Current line prefix (used for tree visualization symbols)
-        current_prefix = prefix
-
-        # Add the appropriate connector based on whether this is the last child
-        if level > 0:
-            if is_last:
-                current_prefix += "╚══ "
-            else:
-                current_prefix += "╠══ "
-
-        # Calculate percentage of total conversations
-        percentage = (
-            (node.count / total_conversations * 100) if total_conversations > 0 else 0
-        )
-
-        # Create progress bar for visual representation
-        bar_width = 20
-        filled_width = (
-            int((node.count / total_conversations) * bar_width)
-            if total_conversations > 0
-            else 0
-        )
-        progress_bar = "█" * filled_width + "░" * (bar_width - filled_width)
-
-        # Build the line with enhanced formatting
-        result = f"{current_prefix}🔸 {node.name}\n"
-        result += f"{prefix}{'║   ' if not is_last and level > 0 else '    '}📊 {node.count:,} conversations ({percentage:.1f}%) [{progress_bar}]\n"
-
-        # Add description if available and not too long
-        if (
-            hasattr(node, "description")
-            and node.description
-            and len(node.description) < 100
-        ):
-            result += f"{prefix}{'║   ' if not is_last and level > 0 else '    '}💭 {node.description}\n"
-
-        result += "\n"
-
-        # Calculate the prefix for children
-        child_prefix = prefix
-        if level > 0:
-            if is_last:
-                child_prefix += "    "
-            else:
-                child_prefix += "║   "
-
-        # Process children
-        children = node.children
-        for i, child_id in enumerate(children):
-            child = node_id_to_cluster[child_id]
-            is_last_child = i == len(children) - 1
-            result += self._build_enhanced_tree_structure(
-                child,
-                node_id_to_cluster,
-                level + 1,
-                is_last_child,
-                child_prefix,
+        return "".join(
+            format_enhanced_tree_lines(
+                current.name,
+                current.count,
+                current.description,
+                *position,
                 total_conversations,
             )
-
-        return result
+            for current, *position in walk_tree(
+                node,
+                lambda n: [node_id_to_cluster[child_id] for child_id in n.children],
+                level=level,
+                is_last=is_last,
+                prefix=prefix,
+            )
+        )
 
     def visualise_clusters_enhanced(self):
         """Print an enhanced hierarchical visualization of clusters with colors and statistics.
@@ -265,57 +157,20 @@ class ClusterVisualizer:
         print("🎯 ENHANCED CLUSTER VISUALIZATION")
         print("=" * 80)
 
-        with open(self.kura.meta_cluster_checkpoint_path) as f:
-            clusters = [Cluster.model_validate_json(line) for line in f]
-
-        node_id_to_cluster = {}
-        total_conversations = sum(
-            len(node.chat_ids) for node in clusters if not node.parent_id
-        )
-
-        for node in clusters:
-            node_id_to_cluster[node.id] = ClusterTreeNode(
-                id=node.id,
-                name=node.name,
-                description=node.description,
-                slug=node.slug,
-                count=len(node.chat_ids),  # Access the actual count value
-                children=[],
-            )
-
-        for node in clusters:
-            if node.parent_id:
-                node_id_to_cluster[node.parent_id].children.append(node.id)
-
-        # Find root nodes and build the tree
-        root_nodes = [
-            node_id_to_cluster[node.id] for node in clusters if not node.parent_id
-        ]
-
-        fake_root = ClusterTreeNode(
-            id="root",
-            name=f"📚 All Clusters ({total_conversations:,} total conversations)",
-            description="Hierarchical conversation clustering results",
-            slug="all_clusters",
-            count=total_conversations,
-            children=[node.id for node in root_nodes],
-        )
-
-        tree_output = self._build_enhanced_tree_structure(
-            fake_root, node_id_to_cluster, 0, False, "", total_conversations
-        )
-
-        print(tree_output)
+        tree = ClusterTree.from_checkpoint(self.kura.meta_cluster_checkpoint_path)
+        total_conversations = tree.total_conversations
+        render_enhanced_tree(tree, sys.stdout)
+        print()
 
         # Add summary statistics
         print("=" * 80)
         print("📈 CLUSTER STATISTICS")
         print("=" * 80)
-        print(f"📊 Total Clusters: {len(clusters)}")
-        print(f"🌳 Root Clusters: {len(root_nodes)}")
+        print(f"📊 Total Clusters: {len(tree)}")
+        print(f"🌳 Root Clusters: {len(tree.roots)}")
         print(f"💬 Total Conversations: {total_conversations:,}")
         print(
-            f"📏 Average Conversations per Root Cluster: {total_conversations / len(root_nodes):.1f}"
+            f"📏 Average Conversations per Root Cluster: {total_conversations / len(tree.roots):.1f}"
         )
         print("=" * 80 + "\n")
 
@@ -333,28 +188,10 @@ class ClusterVisualizer:
             self.visualise_clusters_enhanced()
             return
 
-        with open(self.kura.meta_cluster_checkpoint_path) as f:
-            clusters = [Cluster.model_validate_json(line) for line in f]
-
-        # Build cluster tree structure
-        node_id_to_cluster = {}
-        total_conversations = sum(
-            len(node.chat_ids) for node in clusters if not node.parent_id
+        cluster_tree = ClusterTree.from_checkpoint(
+            self.kura.meta_cluster_checkpoint_path
         )
-
-        for node in clusters:
-            node_id_to_cluster[node.id] = ClusterTreeNode(
-                id=node.id,
-                name=node.name,
-                description=node.description,
-                slug=node.slug,
-                count=len(node.chat_ids),  # Access the actual count value
-                children=[],
-            )
-
-        for node in clusters:
-            if node.parent_id:
-                node_id_to_cluster[node.parent_id].children.append(node.id)
+        total_conversations = cluster_tree.total_conversations
 
         # Create Rich Tree
         if Tree is None:
@@ -369,60 +206,57 @@ class ClusterVisualizer:
             style="bold bright_cyan",
         )
 
-        # Add root clusters to tree
-        root_nodes = [
-            node_id_to_cluster[node.id] for node in clusters if not node.parent_id
+        # Color scheme based on level
+        colors = [
+            "bright_green",
+            "bright_yellow",
+            "bright_magenta",
+            "bright_blue",
+            "bright_red",
         ]
 
-        def add_node_to_tree(rich_tree, cluster_node, level=0):
-            """Recursively add nodes to Rich tree with formatting."""
-            # Color scheme based on level
-            colors = [
-                "bright_green",
-                "bright_yellow",
-                "bright_magenta",
-                "bright_blue",
-                "bright_red",
-            ]
+        def node_label(index: int, level: int) -> str:
+            """Format a cluster as a Rich tree label."""
+            cluster = cluster_tree.clusters[index]
+            count = cluster_tree.counts[index]
             color = colors[level % len(colors)]
 
             # Calculate percentage
             percentage = (
-                (cluster_node.count / total_conversations * 100)
-                if total_conversations > 0
-                else 0
+                (count / total_conversations * 100) if total_conversations > 0 else 0
             )
 
             # Create progress bar representation
             bar_width = 15
             filled_width = (
-                int((cluster_node.count / total_conversations) * bar_width)
+                int((count / total_conversations) * bar_width)
                 if total_conversations > 0
                 else 0
             )
             progress_bar = "█" * filled_width + "░" * (bar_width - filled_width)
 
             # Create node label with rich formatting
-            label = f"[bold {color}]{cluster_node.name}[/] [dim]({cluster_node.count:,} conversations, {percentage:.1f}%)[/]"
-            if hasattr(cluster_node, "description") and cluster_node.description:
+            label = f"[bold {color}]{cluster.name}[/] [dim]({count:,} conversations, {percentage:.1f}%)[/]"
+            if cluster.description:
                 short_desc = (
-                    cluster_node.description[:80] + "..."
-                    if len(cluster_node.description) > 80
-                    else cluster_node.description
+                    cluster.description[:80] + "..."
+                    if len(cluster.description) > 80
+                    else cluster.description
                 )
                 label += f"\n[italic dim]{short_desc}[/]"
             label += f"\n[dim]Progress: [{progress_bar}][/]"
+            return label
 
-            node = rich_tree.add(label)
-
-            # Add children
-            for child_id in cluster_node.children:
-                child = node_id_to_cluster[child_id]
-                add_node_to_tree(node, child, level + 1)
-
-        # Add all root nodes to the tree
-        for root_node in sorted(root_nodes, key=lambda x: x.count, reverse=True):
-            add_node_to_tree(tree, root_node)
+        # Add root clusters, largest first, then their descendants in order
+        root_nodes = sorted(
+            cluster_tree.roots, key=lambda i: cluster_tree.counts[i], reverse=True
+        )
+        stack = [(tree, index, 0) for index in reversed(root_nodes)]
+        while stack:
+            parent, index, level = stack.pop()
+            node = parent.add(node_label(index, level))
+            for child in reversed(cluster_tree.children[index]):
+                stack.append((node, child, level + 1))
 
         # Only create tables if Rich components are available
         if Table is None or ROUNDED is None:
@@ -437,7 +271,7 @@ class ClusterVisualizer:
         stats_table.add_column("Metric", style="bold bright_yellow")
         stats_table.add_column("Value", style="bright_green")
 
-        stats_table.add_row("📊 Total Clusters", f"{len(clusters):,}")
+        stats_table.add_row("📊 Total Clusters", f"{len(cluster_tree):,}")
         stats_table.add_row("🌳 Root Clusters", f"{len(root_nodes):,}")
         stats_table.add_row("💬 Total Conversations", f"{total_conversations:,}")
         stats_table.add_row(
@@ -455,7 +289,7 @@ class ClusterVisualizer:
         size_table.add_column("Percentage", style="bright_blue")
 
         # Calculate size distribution for root clusters
-        root_sizes = [node.count for node in root_nodes]
+        root_sizes = [cluster_tree.counts[i] for i in root_nodes]
         size_ranges = [
             ("🔥 Large (>100)", lambda x: x > 100),
             ("📈 Medium (21-100)", lambda x: 21 <= x <= 100),
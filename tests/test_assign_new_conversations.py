@@ -0,0 +1,198 @@
+import pytest
+
+from kura.base_classes import BaseClusterModel, BaseEmbeddingModel, BaseMetaClusterModel
+from kura.types import Cluster, ClusterCentroid, ConversationSummary
+from kura.v1.kura import CheckpointManager, assign_new_conversations
+
+# Topic keyword in the summary text -> embedding direction
+TOPICS = {
+    "python": [1.0, 0.0, 0.0],
+    "cooking": [0.0, 1.0, 0.0],
+    "travel": [0.0, 0.0, 1.0],
+}
+
+
+def _summary(chat_id: str, topic: str) -> ConversationSummary:
+    return ConversationSummary(chat_id=chat_id, summary=f"about {topic}", metadata={})
+
+
+class TopicEmbeddingModel(BaseEmbeddingModel):
+    def __init__(self):
+        self.calls: list[int] = []
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(len(texts))
+        return [
+            next(vector for topic, vector in TOPICS.items() if topic in text)
+            for text in texts
+        ]
+
+    def slug(self) -> str:
+        return "topics"
+
+
+class SingleClusterModel(BaseClusterModel):
+    """Puts all leftovers into one cluster and records what it was given."""
+
+    def __init__(self):
+        self.embedding_model = TopicEmbeddingModel()
+        self.received: list[str] = []
+        self.received_embeddings = None
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "clusters.jsonl"
+
+    async def cluster_summaries(self, summaries, *, batch_size=100, embeddings=None):
+        self.received = [s.chat_id for s in summaries]
+        self.received_embeddings = embeddings
+        return [
+            Cluster(
+                id="new",
+                name="new",
+                description="d",
+                slug="new",
+                chat_ids=self.received,
+                parent_id=None,
+            )
+        ]
+
+
+class RootMetaClusterModel(BaseMetaClusterModel):
+    def __init__(self, max_clusters: int = 10):
+        self.max_clusters = max_clusters
+        self.reduced: list[list[str]] = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "meta_clusters.jsonl"
+
+    async def reduce_clusters(self, clusters):
+        self.reduced.append([c.id for c in clusters])
+        root = Cluster(
+            id="root",
+            name="root",
+            description="d",
+            slug="root",
+            chat_ids=[i for c in clusters for i in c.chat_ids],
+            parent_id=None,
+        )
+        return [root] + [c.model_copy(update={"parent_id": "root"}) for c in clusters]
+
+
+def _cluster(id: str, chat_ids: list[str], parent_id=None) -> Cluster:
+    return Cluster(
+        id=id,
+        name=id,
+        description="d",
+        slug=id,
+        chat_ids=chat_ids,
+        parent_id=parent_id,
+    )
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = CheckpointManager(str(tmp_path))
+    manager.save_checkpoint(
+        "summaries.jsonl",
+        [_summary("p1", "python"), _summary("p2", "python"), _summary("c1", "cooking")],
+    )
+    manager.save_checkpoint(
+        "clusters.jsonl",
+        [_cluster("py", ["p1", "p2"], "code"), _cluster("cook", ["c1"])],
+    )
+    manager.save_checkpoint(
+        "meta_clusters.jsonl",
+        [
+            _cluster("code", ["p1", "p2"]),
+            _cluster("py", ["p1", "p2"], "code"),
+            _cluster("cook", ["c1"]),
+        ],
+    )
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_assigns_to_nearest_cluster_and_clusters_leftovers(manager):
+    cluster_model = SingleClusterModel()
+    meta_model = RootMetaClusterModel()
+
+    result = await assign_new_conversations(
+        [_summary("p1", "python"), _summary("p3", "python"), _summary("t1", "travel")],
+        cluster_model=cluster_model,
+        meta_cluster_model=meta_model,
+        checkpoint_manager=manager,
+    )
+
+    clusters = {c.id: c for c in result.clusters}
+    assert clusters["py"].chat_ids == ["p1", "p2", "p3"]
+    assert clusters["cook"].chat_ids == ["c1"]
+    # Only the conversation that fits no cluster is clustered from scratch
+    assert cluster_model.received == ["t1"]
+    assert cluster_model.received_embeddings.tolist() == [TOPICS["travel"]]
+    # Centroids built from the checkpoint once, then only the new summaries
+    assert cluster_model.embedding_model.calls == [3, 2]
+
+    meta = {c.id: c for c in result.meta_clusters}
+    assert meta["code"].chat_ids == ["p1", "p2", "p3"]
+    assert meta["new"].parent_id is None
+    assert meta_model.reduced == []
+
+    assert manager.load_checkpoint("clusters.jsonl", Cluster) == result.clusters
+    assert (
+        manager.load_checkpoint("meta_clusters.jsonl", Cluster) == result.meta_clusters
+    )
+    centroids = {
+        c.cluster_id: c
+        for c in manager.load_checkpoint("cluster_centroids.jsonl", ClusterCentroid)
+    }
+    assert centroids["py"].count == 3
+    assert centroids["new"].centroid == TOPICS["travel"]
+
+
+@pytest.mark.asyncio
+async def test_cached_centroids_are_reused(manager):
+    cluster_model = SingleClusterModel()
+    await assign_new_conversations(
+        [_summary("p3", "python")],
+        cluster_model=cluster_model,
+        checkpoint_manager=manager,
+    )
+    await assign_new_conversations(
+        [_summary("c2", "cooking")],
+        cluster_model=cluster_model,
+        checkpoint_manager=manager,
+    )
+
+    assert cluster_model.embedding_model.calls == [3, 1, 1]
+    clusters = {c.id: c for c in manager.load_checkpoint("clusters.jsonl", Cluster)}
+    assert clusters["cook"].chat_ids == ["c1", "c2"]
+
+
+@pytest.mark.asyncio
+async def test_roots_are_reduced_when_over_max_clusters(manager):
+    meta_model = RootMetaClusterModel(max_clusters=2)
+
+    result = await assign_new_conversations(
+        [_summary("t1", "travel")],
+        cluster_model=SingleClusterModel(),
+        meta_cluster_model=meta_model,
+        checkpoint_manager=manager,
+    )
+
+    assert meta_model.reduced == [["code", "cook", "new"]]
+    meta = {c.id: c for c in result.meta_clusters}
+    assert meta["root"].parent_id is None
+    assert {meta[i].parent_id for i in ("code", "cook", "new")} == {"root"}
+    assert meta["py"].parent_id == "code"
+
+
+@pytest.mark.asyncio
+async def test_requires_existing_clusters(tmp_path):
+    with pytest.raises(ValueError, match="run the full pipeline first"):
+        await assign_new_conversations(
+            [_summary("p1", "python")],
+            cluster_model=SingleClusterModel(),
+            checkpoint_manager=CheckpointManager(str(tmp_path)),
+        )
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+
+from kura.v1.kura import CheckpointManager, summarise_conversations
+from kura.types import Conversation, ConversationSummary, Message
+from kura.base_classes.summarisation import BaseSummaryModel
+
+
+class DummySummaryModel(BaseSummaryModel):
+    def __init__(self) -> None:
+        self.errors = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(
+        self, conversations: list[Conversation]
+    ) -> list[ConversationSummary]:
+        return [_summary(c.chat_id) for c in conversations]
+
+    async def summarise_conversation(
+        self, conversation: Conversation
+    ) -> ConversationSummary:  # pragma: no cover - unused
+        raise NotImplementedError
+
+    async def apply_hooks(
+        self, conversation: Conversation
+    ) -> dict:  # pragma: no cover - unused
+        return {}
+
+
+def _summary(chat_id: str) -> ConversationSummary:
+    return ConversationSummary(chat_id=chat_id, summary="ok", metadata={})
+
+
+def test_append_checkpoint_only_writes_new_records(tmp_path):
+    manager = CheckpointManager(str(tmp_path), append_only=True)
+
+    manager.append_checkpoint("summaries.jsonl", [_summary("1"), _summary("2")])
+    manager.append_checkpoint("summaries.jsonl", [_summary("3")])
+
+    loaded = manager.load_checkpoint("summaries.jsonl", ConversationSummary)
+    assert [s.chat_id for s in loaded] == ["1", "2", "3"]
+    manifest = manager.load_manifest("summaries.jsonl")
+    assert manifest["records"] == 3 and manifest["batches"] == 2
+
+
+def test_load_ignores_uncommitted_bytes(tmp_path):
+    manager = CheckpointManager(str(tmp_path), append_only=True)
+    manager.append_checkpoint("summaries.jsonl", [_summary("1")])
+
+    # Simulate a crash half-way through writing the next batch
+    with open(manager.get_checkpoint_path("summaries.jsonl"), "a") as f:
+        f.write('{"chat_id": "2", "summ')
+
+    loaded = manager.load_checkpoint("summaries.jsonl", ConversationSummary)
+    assert [s.chat_id for s in loaded] == ["1"]
+
+    manager.append_checkpoint("summaries.jsonl", [_summary("3")])
+    loaded = manager.load_checkpoint("summaries.jsonl", ConversationSummary)
+    assert [s.chat_id for s in loaded] == ["1", "3"]
+
+
+def test_compact_checkpoint_deduplicates(tmp_path):
+    manager = CheckpointManager(str(tmp_path), append_only=True)
+    manager.append_checkpoint("summaries.jsonl", [_summary("1"), _summary("2")])
+    manager.append_checkpoint("summaries.jsonl", [_summary("1")])
+
+    count = manager.compact_checkpoint(
+        "summaries.jsonl", ConversationSummary, key=lambda s: s.chat_id
+    )
+
+    assert count == 2
+    with open(manager.get_checkpoint_path("summaries.jsonl")) as f:
+        assert len(f.readlines()) == 2
+
+
+@pytest.mark.asyncio
+async def test_summarise_conversations_append_only(tmp_path):
+    conversations = [
+        Conversation(
+            chat_id=str(i),
+            created_at=datetime.now(),
+            messages=[Message(created_at=datetime.now(), role="user", content="hi")],
+            metadata={},
+        )
+        for i in range(5)
+    ]
+    manager = CheckpointManager(str(tmp_path), append_only=True)
+
+    results = await summarise_conversations(
+        conversations,
+        model=DummySummaryModel(),
+        checkpoint_manager=manager,
+        batch_size=2,
+    )
+
+    assert [s.chat_id for s in results] == ["0", "1", "2", "3", "4"]
+    loaded = manager.load_checkpoint("summaries.jsonl", ConversationSummary)
+    assert [s.chat_id for s in loaded] == ["0", "1", "2", "3", "4"]
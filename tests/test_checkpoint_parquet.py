@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from kura.checkpoint import ParquetCheckpointBackend
+from kura.v1.kura import CheckpointManager
+from kura.types import Cluster, ConversationSummary, ProjectedCluster
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return CheckpointManager(str(tmp_path), backend=ParquetCheckpointBackend())
+
+
+def test_parquet_round_trip_summaries(manager):
+    summaries = [
+        ConversationSummary(
+            chat_id="1",
+            summary="a",
+            languages=["english", "python"],
+            metadata={"turns": 3, "tags": ["x"]},
+            embedding=[0.5, 0.25, 1.0],
+        ),
+        ConversationSummary(chat_id="2", summary="b", metadata={}, embedding=None),
+    ]
+
+    manager.save_checkpoint("summaries.jsonl", summaries)
+
+    assert manager.get_checkpoint_path("summaries.jsonl").endswith("summaries.parquet")
+    assert manager.load_checkpoint("summaries.jsonl", ConversationSummary) == summaries
+
+
+def test_parquet_load_columns_skips_model_construction(manager):
+    summaries = [
+        ConversationSummary(
+            chat_id=str(i), summary="s", metadata={}, embedding=[float(i), 1.0]
+        )
+        for i in range(3)
+    ]
+    manager.save_checkpoint("summaries.jsonl", summaries)
+
+    columns = manager.load_columns("summaries.jsonl", ["chat_id", "embedding"])
+
+    assert set(columns) == {"chat_id", "embedding"}
+    assert columns["chat_id"] == ["0", "1", "2"]
+    assert columns["embedding"].dtype == np.float32
+    assert columns["embedding"].shape == (3, 2)
+
+
+def test_parquet_round_trip_clusters(manager):
+    clusters = [
+        Cluster(
+            name="c", description="d", slug="s", chat_ids=["1", "2"], parent_id=None
+        )
+    ]
+    projected = [
+        ProjectedCluster(**clusters[0].model_dump(), x_coord=0.1, y_coord=0.2, level=0)
+    ]
+
+    manager.save_checkpoint("meta_clusters.jsonl", clusters)
+    manager.save_checkpoint("dimensionality.jsonl", projected)
+
+    assert manager.load_checkpoint("meta_clusters.jsonl", Cluster) == clusters
+    assert (
+        manager.load_checkpoint("dimensionality.jsonl", ProjectedCluster) == projected
+    )
+
+
+def test_parquet_backend_rejects_append_only(tmp_path):
+    with pytest.raises(ValueError):
+        CheckpointManager(
+            str(tmp_path), append_only=True, backend=ParquetCheckpointBackend()
+        )
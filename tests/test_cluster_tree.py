@@ -0,0 +1,106 @@
+import io
+import os
+import sys
+
+import pytest
+
+from kura.cluster_tree import ClusterTree, render_enhanced_tree, render_tree
+from kura.types import Cluster
+from kura.v1.visualization import visualise_clusters
+
+
+def _cluster(id: str, n: int, parent_id=None) -> Cluster:
+    return Cluster(
+        id=id,
+        name=f"Cluster {id}",
+        description=f"About {id}",
+        slug=id,
+        chat_ids=[f"{id}-{i}" for i in range(n)],
+        parent_id=parent_id,
+    )
+
+
+@pytest.fixture
+def clusters() -> list[Cluster]:
+    return [
+        _cluster("a", 3),
+        _cluster("a1", 2, "a"),
+        _cluster("a2", 1, "a"),
+        _cluster("a1x", 2, "a1"),
+        _cluster("b", 1),
+    ]
+
+
+def test_index_links_children_and_subtree_sizes(clusters):
+    tree = ClusterTree(clusters)
+
+    assert [c.id for c in tree.children_of("a")] == ["a1", "a2"]
+    assert [tree.clusters[i].id for i in tree.roots] == ["a", "b"]
+    assert tree.subtree_size("a") == 4
+    assert tree.subtree_size("a1") == 2
+    assert tree.total_conversations == 4
+
+
+def test_render_tree(clusters):
+    writer = io.StringIO()
+    render_tree(ClusterTree(clusters), writer)
+
+    assert writer.getvalue() == (
+        "Clusters (4 conversations)\n"
+        "╠══ Cluster a (3 conversations)\n"
+        "║   ╠══ Cluster a1 (2 conversations)\n"
+        "║   ║   ╚══ Cluster a1x (2 conversations)\n"
+        "║   ╚══ Cluster a2 (1 conversations)\n"
+        "╚══ Cluster b (1 conversations)\n"
+    )
+
+
+def test_render_enhanced_tree(clusters):
+    writer = io.StringIO()
+    render_enhanced_tree(ClusterTree(clusters), writer)
+    lines = writer.getvalue().splitlines()
+
+    assert lines[0] == "🔸 📚 All Clusters (4 total conversations)"
+    assert lines[4] == "╠══ 🔸 Cluster a"
+    assert lines[5] == "║   📊 3 conversations (75.0%) [███████████████░░░░░]"
+    assert lines[6] == "║   💭 About a"
+    assert lines[-4] == "╚══ 🔸 Cluster b"
+
+
+def test_renders_hierarchy_deeper_than_recursion_limit():
+    depth = sys.getrecursionlimit() + 100
+    clusters = [_cluster(str(i), 1, str(i - 1) if i else None) for i in range(depth)]
+    writer = io.StringIO()
+    tree = ClusterTree(clusters)
+
+    render_tree(tree, writer)
+
+    assert writer.getvalue().count("\n") == depth + 1
+    assert tree.subtree_sizes[tree.roots[0]] == depth
+
+
+def test_rejects_unknown_parent():
+    with pytest.raises(ValueError, match="unknown parent"):
+        ClusterTree([_cluster("a", 1, "missing")])
+
+
+def test_checkpoint_tree_is_cached_until_file_changes(tmp_path, clusters):
+    path = tmp_path / "meta_clusters.jsonl"
+    path.write_text("".join(c.model_dump_json() + "\n" for c in clusters))
+
+    tree = ClusterTree.from_checkpoint(path)
+    assert ClusterTree.from_checkpoint(str(path)) is tree
+
+    path.write_text(clusters[-1].model_dump_json() + "\n")
+    os.utime(path, ns=(0, 0))
+    reloaded = ClusterTree.from_checkpoint(path)
+    assert reloaded is not tree
+    assert len(reloaded) == 1
+
+
+def test_visualise_clusters_streams_tree(capsys, clusters):
+    visualise_clusters(clusters)
+
+    out = capsys.readouterr().out
+    assert out.startswith("Clusters (4 conversations)\n╠══ Cluster a ")
+    assert out.endswith("╚══ Cluster b (1 conversations)\n\n")
@@ -0,0 +1,85 @@
+import asyncio
+import gc
+
+import pytest
+
+from kura.cluster import ClusterModel
+from kura.meta_cluster import MetaClusterModel
+from kura.utils import concurrency
+from kura.utils.concurrency import get_semaphore, set_concurrency_limit
+
+
+async def _max_in_flight(semaphores: list[asyncio.Semaphore], calls: int) -> int:
+    in_flight = 0
+    peak = 0
+
+    async def call(sem: asyncio.Semaphore):
+        nonlocal in_flight, peak
+        async with sem:
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(call(semaphores[i % len(semaphores)]) for i in range(calls)))
+    return peak
+
+
+def test_model_can_be_reused_across_event_loops():
+    model = ClusterModel(max_concurrent_requests=2)
+
+    async def run():
+        return await _max_in_flight([model.sem], 6)
+
+    # A semaphore created in __init__ would be bound to the first loop
+    assert asyncio.run(run()) == 2
+    assert asyncio.run(run()) == 2
+
+
+@pytest.mark.asyncio
+async def test_models_have_separate_limits_by_default():
+    a = ClusterModel(max_concurrent_requests=2)
+    b = ClusterModel(max_concurrent_requests=2)
+
+    assert a.sem is a.sem
+    assert await _max_in_flight([a.sem, b.sem], 8) == 4
+
+
+@pytest.mark.asyncio
+async def test_unshared_semaphores_are_dropped_with_their_model():
+    loop = asyncio.get_running_loop()
+    model = ClusterModel()
+    assert model.sem is model.sem
+    assert len(concurrency._owned_semaphores[loop]) == 1
+
+    del model
+    gc.collect()
+    assert len(concurrency._owned_semaphores[loop]) == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_key_enforces_a_global_limit():
+    set_concurrency_limit("test-provider", 3)
+    try:
+        cluster_model = ClusterModel(
+            max_concurrent_requests=50, concurrency_key="test-provider"
+        )
+        meta_model = MetaClusterModel(
+            max_concurrent_requests=50, concurrency_key="test-provider"
+        )
+
+        assert cluster_model.sem is meta_model.sem
+        assert await _max_in_flight([cluster_model.sem, meta_model.sem], 10) == 3
+    finally:
+        set_concurrency_limit("test-provider", None)
+
+
+@pytest.mark.asyncio
+async def test_first_user_sizes_a_shared_semaphore():
+    assert get_semaphore("test-first", 2) is get_semaphore("test-first", 5)
+    assert await _max_in_flight([get_semaphore("test-first", 5)], 6) == 2
+
+
+def test_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        set_concurrency_limit("test-invalid", 0)
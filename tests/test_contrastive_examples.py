@@ -0,0 +1,50 @@
+import numpy as np
+
+from kura.cluster import NearestClusterContrastiveSelector
+from kura.types import ConversationSummary
+
+
+def _group(prefix: str, n: int) -> list[ConversationSummary]:
+    return [
+        ConversationSummary(chat_id=f"{prefix}{i}", summary=prefix, metadata={})
+        for i in range(n)
+    ]
+
+
+def _selector(n_neighbours: int) -> NearestClusterContrastiveSelector:
+    summaries = {0: _group("a", 5), 1: _group("b", 5), 2: _group("c", 5)}
+    embeddings = {
+        0: np.array([[1.0, 0.0]] * 5, dtype=np.float32),
+        1: np.array([[0.9, 0.1]] * 5, dtype=np.float32),
+        2: np.array([[0.0, 1.0]] * 5, dtype=np.float32),
+    }
+    return NearestClusterContrastiveSelector(
+        summaries, embeddings, n_neighbours=n_neighbours, seed=0
+    )
+
+
+def test_selector_prefers_nearest_clusters():
+    selector = _selector(n_neighbours=1)
+
+    assert selector.neighbours(0) == [1]
+    assert selector.neighbours(2) == [1]
+    examples = selector.select(0, limit=3)
+    assert len(examples) == 3
+    assert {e.summary for e in examples} == {"b"}
+
+
+def test_selector_spreads_examples_across_neighbours():
+    selector = _selector(n_neighbours=2)
+
+    assert selector.neighbours(0) == [1, 2]
+    examples = selector.select(0, limit=4)
+    assert [e.summary for e in examples] == ["b", "b", "c", "c"]
+    assert len({e.chat_id for e in examples}) == 4
+
+
+def test_selector_with_single_cluster_returns_nothing():
+    selector = NearestClusterContrastiveSelector(
+        {0: _group("a", 2)}, {0: np.ones((2, 2), dtype=np.float32)}
+    )
+
+    assert selector.select(0) == []
@@ -0,0 +1,151 @@
+import io
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from kura.base_classes.summarisation import BaseSummaryModel
+from kura.types.conversation import Conversation, Message, _iter_json_array
+from kura.types.summarisation import ConversationSummary
+from kura.v1.kura import summarise_conversations
+
+
+def _conversation(chat_id: str) -> Conversation:
+    return Conversation(
+        chat_id=chat_id,
+        created_at=datetime(2024, 1, 1),
+        messages=[
+            Message(created_at=datetime(2024, 1, 1), role="user", content="hi ] [")
+        ],
+        metadata={},
+    )
+
+
+def _claude_export(n: int) -> list[dict]:
+    return [
+        {
+            "uuid": f"c{i}",
+            "created_at": "2024-01-01T00:00:00Z",
+            "chat_messages": [
+                {
+                    "created_at": "2024-01-01T00:00:01Z",
+                    "sender": "assistant",
+                    "content": [{"type": "text", "text": "answer"}],
+                },
+                {
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "sender": "human",
+                    "content": [{"type": "text", "text": 'question {"x": 1}'}],
+                },
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_iter_json_array_matches_json_load(chunk_size):
+    data = _claude_export(5) + [1.5, "text", [], {}]
+    text = json.dumps(data, indent=2)
+
+    assert list(_iter_json_array(io.StringIO(text), chunk_size)) == data
+
+
+def test_iter_json_array_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(_iter_json_array(io.StringIO('[{"a": 1}, {"b": '), 4))
+
+
+def test_claude_dump_streams_the_same_conversations(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(_claude_export(3)))
+
+    streamed = Conversation.iter_claude_conversation_dump(str(path))
+    assert not isinstance(streamed, list)
+    streamed = list(streamed)
+
+    assert streamed == Conversation.from_claude_conversation_dump(str(path))
+    assert [c.chat_id for c in streamed] == ["c0", "c1", "c2"]
+    assert [m.role for m in streamed[0].messages] == ["user", "assistant"]
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = tmp_path / "conversations.jsonl"
+    conversations = [_conversation(str(i)) for i in range(3)]
+
+    Conversation.generate_conversation_jsonl(iter(conversations), str(path))
+
+    assert Conversation.from_conversation_jsonl(str(path)) == conversations
+
+
+class RecordingSummaryModel(BaseSummaryModel):
+    def __init__(self, events: list[str]):
+        self.events = events
+        self.errors = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(self, conversations):
+        self.events.append(f"summarise {len(conversations)}")
+        return [
+            ConversationSummary(chat_id=c.chat_id, summary="ok", metadata={})
+            for c in conversations
+        ]
+
+    async def summarise_conversation(self, conversation):  # pragma: no cover
+        raise NotImplementedError
+
+    async def apply_hooks(self, conversation):  # pragma: no cover
+        return {}
+
+
+@pytest.mark.asyncio
+async def test_summarise_consumes_async_iterables_in_batches():
+    events: list[str] = []
+
+    async def load():
+        for i in range(5):
+            events.append(f"load {i}")
+            yield _conversation(str(i))
+
+    summaries = await summarise_conversations(
+        load(), model=RecordingSummaryModel(events), batch_size=2
+    )
+
+    assert [s.chat_id for s in summaries] == ["0", "1", "2", "3", "4"]
+    # The first batch is summarised before the input has been fully loaded
+    assert events.index("summarise 2") < events.index("load 4")
+    assert events.count("summarise 2") == 2 and events[-1] == "summarise 1"
+
+
+@pytest.mark.asyncio
+async def test_summarise_propagates_loader_errors():
+    def load():
+        yield _conversation("0")
+        raise RuntimeError("broken export")
+
+    with pytest.raises(RuntimeError, match="broken export"):
+        await summarise_conversations(
+            load(), model=RecordingSummaryModel([]), batch_size=1
+        )
+
+
+@pytest.mark.asyncio
+async def test_summarise_reads_sync_iterables_off_the_event_loop():
+    loop_thread = threading.get_ident()
+    loader_threads = set()
+
+    def load():
+        for i in range(5):
+            loader_threads.add(threading.get_ident())
+            yield _conversation(str(i))
+
+    summaries = await summarise_conversations(
+        load(), model=RecordingSummaryModel([]), batch_size=2
+    )
+
+    assert [s.chat_id for s in summaries] == ["0", "1", "2", "3", "4"]
+    assert loop_thread not in loader_threads
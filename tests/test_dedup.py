@@ -0,0 +1,148 @@
+from datetime import datetime
+
+import pytest
+
+from kura.base_classes.summarisation import BaseSummaryModel
+from kura.dedup import ConversationDeduplicator
+from kura.types import Conversation, ConversationSummary, Message
+from kura.types.summarisation import SummarisationError
+from kura.v1.kura import CheckpointManager, summarise_conversations
+
+TEMPLATE = (
+    "Hello, I would like help writing a cover letter for a software engineering "
+    "role at a large company. Please keep it short, friendly and professional, and "
+    "mention my five years of backend experience with distributed systems."
+)
+
+
+def _conversation(chat_id: str, content: str) -> Conversation:
+    return Conversation(
+        chat_id=chat_id,
+        created_at=datetime(2024, 1, 1),
+        messages=[
+            Message(created_at=datetime(2024, 1, 1), role="user", content=content)
+        ],
+        metadata={"source": chat_id},
+    )
+
+
+class CountingSummaryModel(BaseSummaryModel):
+    def __init__(self, fail: set[str] = frozenset()):
+        self.summarised: list[str] = []
+        self.fail = fail
+        self.errors = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(self, conversations):
+        summaries = []
+        for c in conversations:
+            self.summarised.append(c.chat_id)
+            if c.chat_id in self.fail:
+                self.errors.append(SummarisationError(chat_id=c.chat_id, error="boom"))
+                continue
+            summaries.append(
+                ConversationSummary(
+                    chat_id=c.chat_id,
+                    summary=f"summary of {c.chat_id}",
+                    metadata={"conversation_turns": 1, **c.metadata},
+                )
+            )
+        return summaries
+
+    async def summarise_conversation(self, conversation):  # pragma: no cover
+        raise NotImplementedError
+
+    async def apply_hooks(self, conversation):  # pragma: no cover
+        return {}
+
+
+def test_exact_duplicates_ignore_case_and_whitespace():
+    dedup = ConversationDeduplicator(near_duplicates=False)
+    unique, duplicates = dedup.split(
+        [
+            _conversation("a", "Hello   World"),
+            _conversation("b", "hello world "),
+            _conversation("c", "something else"),
+        ]
+    )
+
+    assert [c.chat_id for c in unique] == ["a", "c"]
+    assert [(c.chat_id, rep) for c, rep in duplicates] == [("b", "a")]
+    assert dedup.group_sizes == {"a": 2, "c": 1}
+
+
+def test_near_duplicates_are_grouped():
+    dedup = ConversationDeduplicator(threshold=0.7)
+    unique, duplicates = dedup.split(
+        [
+            _conversation("a", TEMPLATE),
+            _conversation("b", TEMPLATE.replace("five", "six")),
+            _conversation("c", "What is the boiling point of water at high altitude?"),
+        ]
+    )
+
+    assert [c.chat_id for c in unique] == ["a", "c"]
+    assert [(c.chat_id, rep) for c, rep in duplicates] == [("b", "a")]
+
+
+def test_near_duplicates_can_be_disabled():
+    dedup = ConversationDeduplicator(near_duplicates=False)
+    unique, _ = dedup.split(
+        [
+            _conversation("a", TEMPLATE),
+            _conversation("b", TEMPLATE.replace("five", "six")),
+        ]
+    )
+
+    assert len(unique) == 2
+
+
+@pytest.mark.asyncio
+async def test_summarise_fans_out_across_batches(tmp_path):
+    model = CountingSummaryModel()
+    conversations = [
+        _conversation("a", TEMPLATE),
+        _conversation("b", "unique question"),
+        _conversation("c", TEMPLATE),
+        _conversation("d", TEMPLATE.upper()),
+    ]
+    manager = CheckpointManager(str(tmp_path), append_only=True)
+
+    summaries = await summarise_conversations(
+        iter(conversations),
+        model=model,
+        checkpoint_manager=manager,
+        batch_size=2,
+        deduplicator=ConversationDeduplicator(),
+    )
+
+    assert model.summarised == ["a", "b"]
+    by_id = {s.chat_id: s for s in summaries}
+    assert [s.chat_id for s in summaries] == ["a", "b", "c", "d"]
+    assert by_id["d"].summary == "summary of a"
+    assert by_id["d"].metadata["source"] == "d"
+    assert by_id["d"].metadata["duplicate_of"] == "a"
+    assert "duplicate_of" not in by_id["a"].metadata
+    assert by_id["a"].metadata["duplicate_group_size"] == 3
+    assert by_id["b"].metadata["duplicate_group_size"] == 1
+    # The checkpoint is rewritten with the final group sizes
+    assert manager.load_checkpoint("summaries.jsonl", ConversationSummary) == summaries
+
+
+@pytest.mark.asyncio
+async def test_duplicates_of_failed_conversations_are_errors(tmp_path):
+    manager = CheckpointManager(str(tmp_path))
+
+    summaries = await summarise_conversations(
+        [_conversation("a", TEMPLATE), _conversation("b", TEMPLATE)],
+        model=CountingSummaryModel(fail={"a"}),
+        checkpoint_manager=manager,
+        deduplicator=ConversationDeduplicator(),
+    )
+
+    assert summaries == []
+    errors = manager.load_checkpoint("summaries_errors.jsonl", SummarisationError)
+    assert [e.chat_id for e in errors] == ["a", "b"]
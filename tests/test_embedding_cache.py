@@ -0,0 +1,70 @@
+import pytest
+
+from kura.base_classes import BaseEmbeddingModel
+from kura.embedding import CachedEmbeddingModel
+
+
+class CountingEmbeddingModel(BaseEmbeddingModel):
+    model_name = "counting"
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_cached_embedding_only_embeds_misses(tmp_path):
+    backend = CountingEmbeddingModel()
+    model = CachedEmbeddingModel(backend, cache_dir=str(tmp_path))
+
+    first = await model.embed(["a", "bb", "a"])
+    second = await model.embed(["bb", "ccc"])
+
+    assert backend.calls == [["a", "bb"], ["ccc"]]
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 1.0]]
+    assert model.hits == 1 and model.misses == 4
+
+
+@pytest.mark.asyncio
+async def test_cached_embedding_persists_across_instances(tmp_path):
+    backend = CountingEmbeddingModel()
+    await CachedEmbeddingModel(backend, cache_dir=str(tmp_path)).embed(["hello"])
+
+    other_backend = CountingEmbeddingModel()
+    model = CachedEmbeddingModel(other_backend, cache_dir=str(tmp_path))
+    assert await model.embed(["hello"]) == [[5.0, 1.0]]
+    assert other_backend.calls == []
+
+
+@pytest.mark.asyncio
+async def test_cached_embedding_evicts_least_recently_used(tmp_path):
+    backend = CountingEmbeddingModel()
+    model = CachedEmbeddingModel(backend, cache_dir=str(tmp_path), max_entries=2)
+
+    await model.embed(["a"])
+    await model.embed(["bb"])
+    await model.embed(["a"])  # refresh "a" so "bb" becomes the oldest entry
+    await model.embed(["ccc"])
+    backend.calls.clear()
+
+    await model.embed(["a", "bb"])
+    assert backend.calls == [["bb"]]
+
+
+@pytest.mark.asyncio
+async def test_cached_embedding_keeps_row_count_across_instances(tmp_path):
+    backend = CountingEmbeddingModel()
+    await CachedEmbeddingModel(backend, cache_dir=str(tmp_path), max_entries=2).embed(
+        ["a", "bb"]
+    )
+
+    model = CachedEmbeddingModel(backend, cache_dir=str(tmp_path), max_entries=2)
+    assert model._count == 2
+    await model.embed(["ccc"])
+    assert model._count == 2
+    (rows,) = model._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+    assert rows == 2
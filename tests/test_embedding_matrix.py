@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from kura.base_classes import BaseEmbeddingModel
+from kura.k_means import KmeansClusteringMethod
+from kura.types import EmbeddingMatrix
+
+
+class ListEmbeddingModel(BaseEmbeddingModel):
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_wraps_lists_as_contiguous_float32():
+    matrix = EmbeddingMatrix([[1, 2], [3, 4]], ids=["a", "b"])
+
+    assert matrix.vectors.dtype == np.float32
+    assert matrix.vectors.flags.c_contiguous
+    assert matrix.shape == (2, 2) and len(matrix) == 2
+    assert matrix.rows(["b", "a"]).tolist() == [[3, 4], [1, 2]]
+    # Behaves like the list of vectors it replaces
+    assert matrix[1].tolist() == [3, 4]
+    assert np.asarray(matrix) is matrix.vectors
+
+
+def test_from_embeddings_does_not_copy():
+    vectors = np.ones((3, 2), dtype=np.float32)
+    matrix = EmbeddingMatrix.from_embeddings(vectors)
+
+    assert matrix.vectors is vectors
+    assert EmbeddingMatrix.from_embeddings(matrix) is matrix
+
+
+def test_rejects_mismatched_ids():
+    with pytest.raises(ValueError):
+        EmbeddingMatrix([[1.0], [2.0]], ids=["a"])
+
+
+def test_concatenate_keeps_ids():
+    a = EmbeddingMatrix([[1.0]], ids=["a"])
+    b = EmbeddingMatrix([[2.0], [3.0]], ids=["b", "c"])
+
+    combined = EmbeddingMatrix.concatenate([a, EmbeddingMatrix([]), b])
+
+    assert combined.ids == ["a", "b", "c"]
+    assert combined.vectors.ravel().tolist() == [1.0, 2.0, 3.0]
+
+
+def test_save_and_load_memory_mapped(tmp_path):
+    path = str(tmp_path / "embeddings.npy")
+    EmbeddingMatrix([[1.0, 2.0], [3.0, 4.0]], ids=["a", "b"]).save(path)
+
+    loaded = EmbeddingMatrix.load(path)
+
+    assert isinstance(loaded.vectors, np.memmap) or isinstance(
+        loaded.vectors.base, np.memmap
+    )
+    assert loaded.ids == ["a", "b"]
+    assert loaded.rows(["b"]).tolist() == [[3.0, 4.0]]
+
+
+@pytest.mark.asyncio
+async def test_default_embed_matrix_wraps_embed():
+    matrix = await ListEmbeddingModel().embed_matrix(["a", "bbb"], ids=["x", "y"])
+
+    assert matrix.ids == ["x", "y"]
+    assert matrix.vectors.tolist() == [[1.0, 1.0], [3.0, 1.0]]
+
+
+@pytest.mark.asyncio
+async def test_kmeans_clusters_a_matrix_directly(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = np.vstack([rng.normal(loc, 0.01, size=(5, 3)) for loc in (0.0, 5.0)])
+    path = str(tmp_path / "embeddings.npy")
+    EmbeddingMatrix(vectors).save(path)
+
+    result = await KmeansClusteringMethod(5).cluster_matrix(
+        EmbeddingMatrix.load(path), list(range(10))
+    )
+
+    assert sorted(sorted(group) for group in result.values()) == [
+        list(range(0, 5)),
+        list(range(5, 10)),
+    ]
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from kura.embedding import OpenAIEmbeddingModel, _batch_texts_by_tokens
+
+
+@pytest.mark.asyncio
+async def test_slow_batch_does_not_block_later_batches(monkeypatch):
+    model = OpenAIEmbeddingModel(model_batch_size=1, n_concurrent_jobs=2)
+    last_batch_started = asyncio.Event()
+    started = []
+
+    async def fake_embed_batch(texts):
+        started.append(texts[0])
+        if texts[0] == "a":
+            # Only finishes once every other batch has been scheduled
+            await last_batch_started.wait()
+        if texts[0] == "d":
+            last_batch_started.set()
+        return [[float(ord(texts[0]))]]
+
+    monkeypatch.setattr(model, "_embed_batch", fake_embed_batch)
+
+    embeddings = await asyncio.wait_for(model.embed(["a", "b", "c", "d"]), 1)
+
+    assert started == ["a", "b", "c", "d"]
+    assert embeddings == [[97.0], [98.0], [99.0], [100.0]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_propagates(monkeypatch):
+    model = OpenAIEmbeddingModel(model_batch_size=1, n_concurrent_jobs=2)
+
+    async def fake_embed_batch(texts):
+        if texts[0] == "b":
+            raise RuntimeError("boom")
+        return [[0.0]]
+
+    monkeypatch.setattr(model, "_embed_batch", fake_embed_batch)
+
+    with pytest.raises(RuntimeError):
+        await model.embed(["a", "b", "c"])
+
+
+def test_batches_split_by_estimated_tokens():
+    texts = ["x" * 480, "x" * 480, "x" * 40, "x" * 4000]
+
+    batches = _batch_texts_by_tokens(texts, max_batch_size=10, max_batch_tokens=200)
+
+    assert [len(b) for b in batches] == [1, 2, 1]
+    assert _batch_texts_by_tokens(["a"] * 5, 2, None) == [["a", "a"], ["a", "a"], ["a"]]
@@ -0,0 +1,193 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from kura.base_classes import BaseClusterModel, BaseEmbeddingModel, BaseSummaryModel
+from kura.embedding_store import EmbeddingStore
+from kura.k_means import KmeansClusteringMethod
+from kura.types import Cluster, Conversation, ConversationSummary, Message
+from kura.utils.executor import PipelineExecutor, use_executor
+from kura.v1.kura import run_pipeline
+
+
+def _conversations(n: int) -> list[Conversation]:
+    return [
+        Conversation(
+            chat_id=str(i),
+            created_at=datetime(2024, 1, 1),
+            messages=[
+                Message(created_at=datetime(2024, 1, 1), role="user", content="hi")
+            ],
+            metadata={},
+        )
+        for i in range(n)
+    ]
+
+
+class EchoSummaryModel(BaseSummaryModel):
+    errors: list = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(self, conversations):
+        return [
+            ConversationSummary(chat_id=c.chat_id, summary=f"s{c.chat_id}", metadata={})
+            for c in conversations
+        ]
+
+    async def summarise_conversation(self, conversation):  # pragma: no cover
+        raise NotImplementedError
+
+    async def apply_hooks(self, conversation):  # pragma: no cover
+        return {}
+
+
+class RecordingEmbeddingModel(BaseEmbeddingModel):
+    def __init__(self, events: list[str]):
+        self.events = events
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.events.append(f"embedded {len(texts)}")
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class PrecomputedClusterModel(BaseClusterModel):
+    def __init__(self, embedding_model):
+        self.embedding_model = embedding_model
+        self.received_embeddings = None
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "clusters.jsonl"
+
+    async def cluster_summaries(
+        self,
+        summaries,
+        *,
+        processed_keys=None,
+        batch_size=100,
+        sleep_seconds=0.0,
+        on_batch_complete=None,
+        embeddings=None,
+    ):
+        self.received_embeddings = embeddings
+        return [
+            Cluster(
+                name="all",
+                description="d",
+                slug="all",
+                chat_ids=[s.chat_id for s in summaries],
+                parent_id=None,
+            )
+        ]
+
+
+def _sum_rows(X: np.ndarray) -> np.ndarray:
+    return np.asarray(X.sum(axis=1))
+
+
+def test_append_skips_known_ids_and_reopens(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    assert store.append(["a", "b"], [[1.0, 2.0], [3.0, 4.0]]) == 2
+    assert store.append(["b", "c", "c"], [[0.0, 0.0], [5.0, 6.0], [7.0, 8.0]]) == 1
+
+    reopened = EmbeddingStore(str(tmp_path))
+    matrix = reopened.matrix()
+
+    assert reopened.ids == ["a", "b", "c"] and "c" in reopened
+    assert isinstance(matrix.vectors, np.memmap)
+    assert matrix.vectors.tolist() == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    assert reopened.rows(["c", "a"]).tolist() == [[5.0, 6.0], [1.0, 2.0]]
+    assert reopened.missing(["a", "d"]) == ["d"]
+
+
+def test_interrupted_append_is_ignored(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.append(["a"], [[1.0, 2.0]])
+    # Simulate a crash after the data was written but before the metadata
+    with open(store.vectors_path, "ab") as f:
+        f.write(b"\x00" * 6)
+    with open(store.ids_path, "a") as f:
+        f.write('"partial"\n')
+
+    reopened = EmbeddingStore(str(tmp_path))
+    assert reopened.ids == ["a"]
+    reopened.append(["b"], [[3.0, 4.0]])
+    assert EmbeddingStore(str(tmp_path)).matrix().vectors.tolist() == [
+        [1.0, 2.0],
+        [3.0, 4.0],
+    ]
+
+
+def test_rejects_dimension_mismatch(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.append(["a"], [[1.0, 2.0]])
+
+    with pytest.raises(ValueError):
+        store.append(["b"], [[1.0, 2.0, 3.0]])
+    with pytest.raises(ValueError):
+        EmbeddingStore(str(tmp_path), dim=3)
+
+
+@pytest.mark.asyncio
+async def test_process_workers_reopen_the_memmap(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    vectors = np.arange(20, dtype=np.float32).reshape(10, 2)
+    store.append([str(i) for i in range(10)], vectors)
+
+    with PipelineExecutor("process", max_workers=1) as executor:
+        shared = executor._share(store.matrix().vectors, [])
+        result = await executor.run(_sum_rows, store.matrix().vectors)
+
+    assert type(shared).__name__ == "MappedArray"
+    np.testing.assert_array_equal(result, vectors.sum(axis=1))
+
+
+@pytest.mark.asyncio
+async def test_minibatch_kmeans_streams_over_the_store(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = np.vstack([rng.normal(loc, 0.01, size=(20, 3)) for loc in (0.0, 5.0)])
+    store = EmbeddingStore(str(tmp_path))
+    store.append([str(i) for i in range(40)], vectors)
+
+    method = KmeansClusteringMethod(20, minibatch=True, batch_size=8)
+    with PipelineExecutor("process", max_workers=1) as executor:
+        with use_executor(executor):
+            result = await method.cluster_matrix(store.matrix(), list(range(40)))
+
+    assert sorted(sorted(group) for group in result.values()) == [
+        list(range(0, 20)),
+        list(range(20, 40)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_writes_and_reuses_the_store(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "embeddings"))
+    events: list[str] = []
+    cluster_model = PrecomputedClusterModel(RecordingEmbeddingModel(events))
+
+    await run_pipeline(
+        _conversations(4),
+        summary_model=EchoSummaryModel(),
+        cluster_model=cluster_model,
+        batch_size=2,
+        embedding_store=store,
+    )
+    assert events == ["embedded 2", "embedded 2"]
+    assert isinstance(cluster_model.received_embeddings.vectors, np.memmap)
+    assert cluster_model.received_embeddings.ids == ["0", "1", "2", "3"]
+
+    events.clear()
+    result = await run_pipeline(
+        _conversations(5),
+        summary_model=EchoSummaryModel(),
+        cluster_model=cluster_model,
+        batch_size=2,
+        embedding_store=EmbeddingStore(str(tmp_path / "embeddings")),
+    )
+    assert events == ["embedded 1"]
+    assert sorted(result.clusters[0].chat_ids) == ["0", "1", "2", "3", "4"]
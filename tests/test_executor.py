@@ -0,0 +1,146 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from kura.base_classes import BaseClusteringMethod
+from kura.cluster import ClusterModel
+from kura.k_means import KmeansClusteringMethod
+from kura.types import Cluster, ConversationSummary
+from kura.utils.executor import (
+    PipelineExecutor,
+    get_executor,
+    run_in_executor,
+    use_executor,
+)
+
+
+class SignClusteringMethod(BaseClusteringMethod):
+    """Groups items by the sign of their first coordinate, without ``cluster_matrix``."""
+
+    def cluster(self, items):
+        groups = {}
+        for item in items:
+            groups.setdefault(int(item["embedding"][0] > 0), []).append(item["item"])
+        return groups
+
+
+def _sum_rows(X: np.ndarray) -> np.ndarray:
+    return X.sum(axis=1)
+
+
+def _identity(X: np.ndarray) -> np.ndarray:
+    return X
+
+
+def _blocking_sleep(seconds: float) -> str:
+    import time
+
+    time.sleep(seconds)
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_default_runs_off_the_event_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    thread_name = await run_in_executor(_blocking_sleep, 0.2)
+    task.cancel()
+
+    assert thread_name != threading.current_thread().name
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_use_executor_is_scoped():
+    executor = PipelineExecutor("thread", max_workers=1)
+    assert get_executor() is None
+    with use_executor(executor):
+        assert get_executor() is executor
+        with use_executor(None):
+            assert get_executor() is executor
+        assert (await run_in_executor(_blocking_sleep, 0)).startswith("kura")
+    assert get_executor() is None
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_shares_large_arrays():
+    X = np.arange(200_000, dtype=np.float32).reshape(-1, 4)
+    with PipelineExecutor("process", max_workers=1, shared_memory_min_bytes=1) as ex:
+        np.testing.assert_array_equal(await ex.run(_sum_rows, X), X.sum(axis=1))
+        # Results that are views of the shared block are copied before it is released
+        np.testing.assert_array_equal(await ex.run(_identity, X), X)
+
+
+@pytest.mark.asyncio
+async def test_kmeans_cluster_async_matches_cluster():
+    rng = np.random.default_rng(0)
+    embeddings = np.vstack(
+        [rng.normal(loc, 0.01, size=(10, 3)) for loc in (0.0, 5.0, 10.0)]
+    )
+    items = [{"item": i, "embedding": e} for i, e in enumerate(embeddings)]
+    method = KmeansClusteringMethod(10)
+
+    with PipelineExecutor("process", max_workers=1, shared_memory_min_bytes=1) as ex:
+        with use_executor(ex):
+            result = await method.cluster_async(items)
+
+    groups = sorted(sorted(members) for members in result.values())
+    assert groups == [list(range(0, 10)), list(range(10, 20)), list(range(20, 30))]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_clusters_without_cluster_matrix():
+    embeddings = np.array([[1.0, 0.0], [-1.0, 0.0], [2.0, 0.0], [-2.0, 0.0]])
+    items = [object() for _ in embeddings]
+
+    with PipelineExecutor("process", max_workers=1, shared_memory_min_bytes=1) as ex:
+        with use_executor(ex):
+            result = await SignClusteringMethod().cluster_async(
+                [{"item": i, "embedding": e} for i, e in zip(items, embeddings)]
+            )
+
+    # The items are grouped in this process, so they are the same objects
+    assert result[1][0] is items[0] and result[1][1] is items[2]
+    assert result[0][0] is items[1] and result[0][1] is items[3]
+
+
+@pytest.mark.asyncio
+async def test_cluster_model_selects_neighbours_in_a_process_pool():
+    summaries = [
+        ConversationSummary(chat_id=str(i), summary=f"s{i}", metadata={})
+        for i in range(6)
+    ]
+    embeddings = np.array([[1.0, i] for i in range(3)] + [[-1.0, i] for i in range(3)])
+    model = ClusterModel(clustering_method=SignClusteringMethod())
+    contrastive = {}
+
+    async def generate_cluster(summaries, contrastive_examples):
+        contrastive[summaries[0].chat_id] = {s.chat_id for s in contrastive_examples}
+        return Cluster(
+            name="c",
+            description="d",
+            slug="c",
+            chat_ids=[s.chat_id for s in summaries],
+            parent_id=None,
+        )
+
+    model.generate_cluster = generate_cluster
+    with PipelineExecutor("process", max_workers=1) as ex:
+        with use_executor(ex):
+            clusters = await model.cluster_summaries(summaries, embeddings=embeddings)
+
+    assert sorted(sorted(c.chat_ids) for c in clusters) == [
+        ["0", "1", "2"],
+        ["3", "4", "5"],
+    ]
+    assert contrastive == {"0": {"3", "4", "5"}, "3": {"0", "1", "2"}}
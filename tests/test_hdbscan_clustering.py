@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from kura.hdbscan_clustering import HDBSCANClusteringMethod
+
+
+def _items():
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0, 0.0, 0.0], [20.0, 20.0, 0.0]])
+    points = np.concatenate(
+        [c + rng.normal(scale=0.2, size=(30, 3)) for c in centers]
+        # A lone point far away from both blobs
+        + [np.array([[10.0, 10.0, 40.0]])]
+    ).astype(np.float32)
+    return [{"item": i, "embedding": row} for i, row in enumerate(points)]
+
+
+def test_hdbscan_assigns_noise_to_nearest_cluster():
+    result = HDBSCANClusteringMethod(min_cluster_size=5).cluster(_items())
+
+    assert len(result) == 2
+    assert sorted(i for v in result.values() for i in v) == list(range(61))
+    groups = sorted(set(v) - {60} for v in result.values())
+    assert sorted(map(sorted, groups)) == [list(range(0, 30)), list(range(30, 60))]
+
+
+def test_hdbscan_outlier_bucket_with_pca():
+    result = HDBSCANClusteringMethod(
+        min_cluster_size=5,
+        reduce_dimensionality="pca",
+        n_components=2,
+        noise_strategy="outlier",
+    ).cluster(_items())
+
+    assert len(result) == 3
+    assert result[2] == [60]
+
+
+def test_hdbscan_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        HDBSCANClusteringMethod(noise_strategy="drop")  # type: ignore
@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+
+# Modules that should only be imported once a code path actually needs them
+HEAVY_MODULES = [
+    "numpy",
+    "sklearn",
+    "scipy",
+    "umap",
+    "hdbscan",
+    "openai",
+    "instructor",
+    "httpx",
+]
+
+# Constructing default models may load numpy but must not create API clients
+# or embedding models (which need an API key) or load sklearn
+CLIENT_MODULES = ["sklearn", "openai", "instructor", "httpx"]
+
+# Generous budget so the test only trips on real regressions (eager sklearn
+# and openai imports took several seconds)
+IMPORT_BUDGET_SECONDS = 1.5
+
+SCRIPT = f"""
+import json, sys, time
+start = time.perf_counter()
+import kura
+elapsed = time.perf_counter() - start
+loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+from kura.cluster import ClusterModel
+from kura.dimensionality import HDBUMAP
+from kura.meta_cluster import MetaClusterModel
+models = [ClusterModel(), MetaClusterModel(), HDBUMAP()]
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": loaded,
+    "loaded_by_defaults": [m for m in {CLIENT_MODULES!r} if m in sys.modules],
+    "embedding_models": [m._embedding_model is not None for m in models],
+}}))
+"""
+
+
+def _run() -> dict:
+    env = {
+        k: v
+        for k, v in os.environ.items()
+        if not k.startswith(("OPENAI_", "AZURE_OPENAI_", "USE_AZURE_OPENAI"))
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_and_default_models_are_lazy():
+    # Runs without an API key, so building a client eagerly would also fail here
+    report = _run()
+    assert report["loaded"] == []
+    assert report["loaded_by_defaults"] == []
+    # The default embedding model is only created when something is embedded
+    assert report["embedding_models"] == [False, False, False]
+
+
+def test_import_time_budget():
+    # Best of three to smooth over a cold filesystem cache
+    elapsed = min(_run()["elapsed"] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import kura took {elapsed:.2f}s"
@@ -0,0 +1,46 @@
+import numpy as np
+
+from kura.k_means import KmeansClusteringMethod, group_by_label
+
+
+def _blobs(n_per_blob: int = 20):
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0, 0.0], [10.0, 10.0], [-10.0, 10.0]], dtype=np.float32)
+    points = np.concatenate(
+        [c + rng.normal(scale=0.1, size=(n_per_blob, 2)) for c in centers]
+    ).astype(np.float32)
+    return points
+
+
+def test_group_by_label_preserves_order_and_empty_clusters():
+    labels = np.array([2, 0, 2, 0, 2])
+    data = ["a", "b", "c", "d", "e"]
+
+    assert group_by_label(labels, data, 4) == {
+        0: ["b", "d"],
+        1: [],
+        2: ["a", "c", "e"],
+        3: [],
+    }
+
+
+def test_kmeans_accepts_float32_rows():
+    points = _blobs()
+    items = [{"item": i, "embedding": row} for i, row in enumerate(points)]
+
+    result = KmeansClusteringMethod(clusters_per_group=20).cluster(items)
+
+    assert sorted(len(v) for v in result.values()) == [20, 20, 20]
+    assert sorted(i for v in result.values() for i in v) == list(range(60))
+
+
+def test_minibatch_kmeans_recovers_blobs():
+    points = _blobs()
+    items = [{"item": i, "embedding": row.tolist()} for i, row in enumerate(points)]
+
+    result = KmeansClusteringMethod(
+        clusters_per_group=20, minibatch=True, batch_size=16
+    ).cluster(items)
+
+    groups = sorted(sorted(v) for v in result.values())
+    assert groups == [list(range(0, 20)), list(range(20, 40)), list(range(40, 60))]
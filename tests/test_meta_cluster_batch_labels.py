@@ -0,0 +1,113 @@
+import pytest
+
+from kura.meta_cluster import BatchClusterLabel, BatchClusterLabels, MetaClusterModel
+from kura.types import Cluster
+
+CANDIDATES = ["Write Python code", "Plan travel itineraries"]
+
+
+class ScriptedCompletions:
+    """Returns one scripted response per call and records the batches sent."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.batches: list[list[str]] = []
+
+    async def create(self, **kwargs):
+        self.batches.append([c.name for c in kwargs["context"]["clusters"]])
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return BatchClusterLabels(
+            labels=[
+                BatchClusterLabel(cluster_id=i, higher_level_cluster=label)
+                for i, label in response.items()
+            ]
+        )
+
+
+class ScriptedClient:
+    def __init__(self, responses):
+        self.chat = self
+        self.completions = ScriptedCompletions(responses)
+
+
+def _model(responses, **kwargs) -> MetaClusterModel:
+    model = MetaClusterModel(label_batch_size=12, **kwargs)
+    model.client = ScriptedClient(responses)
+    return model
+
+
+def _clusters(n: int) -> list[Cluster]:
+    return [
+        Cluster(
+            name=f"c{i}",
+            description="d",
+            slug=f"c{i}",
+            chat_ids=[str(i)],
+            parent_id=None,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_labels_use_fuzzy_matching():
+    model = _model([{0: "Write Python code", 1: "Plan travel itineraries."}])
+
+    labels = await model.label_cluster_batch(_clusters(2), CANDIDATES)
+
+    assert [label["label"] for label in labels] == CANDIDATES
+    assert model.client.completions.batches == [["c0", "c1"]]
+
+
+@pytest.mark.asyncio
+async def test_only_failed_items_are_retried():
+    model = _model(
+        [
+            # c1 gets an invalid label and c2 is missing from the response
+            {0: "Write Python code", 1: "Cooking", 3: "Plan travel itineraries"},
+            {0: "Plan travel itineraries", 1: "Write Python code"},
+        ]
+    )
+
+    labels = await model.label_cluster_batch(_clusters(4), CANDIDATES)
+
+    assert model.client.completions.batches == [["c0", "c1", "c2", "c3"], ["c1", "c2"]]
+    assert [label["label"] for label in labels] == [
+        "Write Python code",
+        "Plan travel itineraries",
+        "Write Python code",
+        "Plan travel itineraries",
+    ]
+    assert model.errors == []
+
+
+@pytest.mark.asyncio
+async def test_items_failing_every_retry_get_placeholder():
+    clusters = _clusters(2)
+    model = _model(
+        [{0: "Write Python code"}, RuntimeError("boom"), {}],
+        max_label_retries=2,
+    )
+
+    labels = await model.label_cluster_batch(clusters, CANDIDATES)
+
+    assert labels[0]["label"] == "Write Python code"
+    assert labels[1]["label"] == f"unlabeled_{clusters[1].id}"
+    assert [e.cluster_ids for e in model.errors] == [[clusters[1].id]]
+
+
+@pytest.mark.asyncio
+async def test_labelling_jobs_chunk_by_batch_size():
+    clusters = _clusters(30)
+    model = _model(
+        [{i: CANDIDATES[i % 2] for i in range(12)}] * 2
+        + [{i: CANDIDATES[i % 2] for i in range(6)}]
+    )
+
+    jobs = model._labelling_jobs(clusters, CANDIDATES)
+    results = [label for job in jobs for label in await job]
+
+    assert len(jobs) == 3
+    assert [r["cluster"] for r in results] == clusters
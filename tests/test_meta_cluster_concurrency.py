@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+from rich.console import Console
+
+from kura.meta_cluster import MetaClusterModel
+from kura.types import Cluster
+
+
+class SlowMetaClusterModel(MetaClusterModel):
+    """Replaces the LLM calls with sleeps and records how many overlap."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _track(self, delay: float):
+        async with self.sem:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(delay)
+            self.in_flight -= 1
+
+    async def generate_candidate_clusters(self, clusters, sem):
+        return ["Group A", "Group B"]
+
+    async def label_cluster(self, cluster, candidate_clusters):
+        # Later clusters finish first so completion order differs from input order
+        await self._track(0.01 * (10 - int(cluster.name)))
+        label = candidate_clusters[int(cluster.name) % 2]
+        return {"cluster": cluster, "label": label}
+
+    async def rename_cluster_group(self, clusters):
+        await self._track(0.01)
+        parent = Cluster(
+            name="Parent",
+            description="Parent cluster",
+            slug="parent",
+            chat_ids=[chat_id for c in clusters for chat_id in c.chat_ids],
+            parent_id=None,
+        )
+        return [parent] + [
+            c.model_copy(update={"parent_id": parent.id}) for c in clusters
+        ]
+
+
+def _clusters(n: int) -> list[Cluster]:
+    return [
+        Cluster(
+            name=str(i),
+            description="d",
+            slug=f"c{i}",
+            chat_ids=[str(i)],
+            parent_id=None,
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_rich_path_labels_concurrently():
+    model = SlowMetaClusterModel(max_concurrent_requests=4, console=Console(quiet=True))
+
+    result = await model.generate_meta_clusters(_clusters(8))
+
+    assert model.max_in_flight == 4
+    parents = [c for c in result if c.parent_id is None]
+    assert len(parents) == 2
+    children = [c for c in result if c.parent_id is not None]
+    assert sorted(c.name for c in children) == [str(i) for i in range(8)]
+
+
+@pytest.mark.asyncio
+async def test_rich_path_matches_fallback_grouping():
+    clusters = _clusters(6)
+    rich = await SlowMetaClusterModel(
+        max_concurrent_requests=3, console=Console(quiet=True)
+    ).generate_meta_clusters(clusters)
+    plain = await SlowMetaClusterModel(
+        max_concurrent_requests=3
+    ).generate_meta_clusters(clusters)
+
+    def groups(result):
+        return [c.name for c in result if c.parent_id is not None]
+
+    assert groups(rich) == groups(plain)
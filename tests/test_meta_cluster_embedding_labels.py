@@ -0,0 +1,90 @@
+import pytest
+
+from kura.base_classes import BaseEmbeddingModel
+from kura.meta_cluster import MetaClusterModel
+from kura.types import Cluster
+
+VECTORS = {
+    "Write Python code": [1.0, 0.0, 0.0],
+    "Plan travel itineraries": [0.0, 1.0, 0.0],
+    "python": [0.9, 0.1, 0.0],
+    "travel": [0.1, 0.95, 0.0],
+    "both": [0.5, 0.5, 0.7],
+}
+
+
+class KeywordEmbeddingModel(BaseEmbeddingModel):
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [next(v for key, v in VECTORS.items() if key in text) for text in texts]
+
+    def slug(self) -> str:
+        return "keyword"
+
+
+class RecordingMetaClusterModel(MetaClusterModel):
+    def __init__(self, **kwargs):
+        super().__init__(embedding_model=KeywordEmbeddingModel(), **kwargs)
+        self.llm_labelled: list[str] = []
+
+    async def generate_candidate_clusters(self, clusters, sem):
+        return ["Write Python code", "Plan travel itineraries"]
+
+    async def label_cluster(self, cluster, candidate_clusters):
+        self.llm_labelled.append(cluster.name)
+        return {"cluster": cluster, "label": candidate_clusters[0]}
+
+    async def rename_cluster_group(self, clusters):
+        parent = Cluster(
+            name=f"Parent of {clusters[0].name}",
+            description="p",
+            slug="p",
+            chat_ids=[i for c in clusters for i in c.chat_ids],
+            parent_id=None,
+        )
+        return [parent] + [
+            c.model_copy(update={"parent_id": parent.id}) for c in clusters
+        ]
+
+
+def _cluster(name: str) -> Cluster:
+    return Cluster(
+        name=name, description=name, slug=name, chat_ids=[name], parent_id=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_ambiguous_clusters_reach_the_llm():
+    clusters = [_cluster("python"), _cluster("both"), _cluster("travel")]
+    model = RecordingMetaClusterModel(embedding_label_margin=0.1)
+
+    assigned, ambiguous = await model.assign_labels_by_embedding(
+        clusters, await model.generate_candidate_clusters(clusters, None)
+    )
+
+    assert [(a["cluster"].name, a["label"]) for a in assigned] == [
+        ("python", "Write Python code"),
+        ("travel", "Plan travel itineraries"),
+    ]
+    assert ambiguous == [clusters[1]]
+
+
+@pytest.mark.asyncio
+async def test_generate_meta_clusters_uses_embedding_fast_path():
+    clusters = [_cluster("python"), _cluster("both"), _cluster("travel")]
+    model = RecordingMetaClusterModel(embedding_label_margin=0.1)
+
+    result = await model.generate_meta_clusters(clusters, show_preview=False)
+
+    assert model.llm_labelled == ["both"]
+    children = {c.name: c.parent_id for c in result if c.parent_id is not None}
+    assert children["python"] == children["both"] != children["travel"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default():
+    clusters = [_cluster("python"), _cluster("travel")]
+    model = RecordingMetaClusterModel()
+
+    await model.generate_meta_clusters(clusters, show_preview=False)
+
+    assert model.llm_labelled == ["python", "travel"]
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import time
+import urllib.request
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from kura.base_classes import BaseClusterModel, BaseSummaryModel
+from kura.types import Cluster, Conversation, ConversationSummary, Message
+from kura.utils.metrics import (
+    Histogram,
+    InstrumentedClient,
+    MetricsRegistry,
+    collect_metrics,
+    inc,
+    monitor_event_loop_lag,
+    start_metrics_server,
+    timed_stage,
+)
+from kura.v1.kura import CheckpointManager, run_pipeline
+
+
+def _series(snapshot, kind, name, **labels):
+    return [
+        s
+        for s in snapshot[kind].get(name, [])
+        if all(s["labels"].get(k) == v for k, v in labels.items())
+    ]
+
+
+def test_histogram_summary():
+    histogram = Histogram(buckets=(1.0, 2.0, 5.0))
+    for value in (0.5, 1.5, 1.5, 4.0):
+        histogram.observe(value)
+
+    data = histogram.to_dict()
+    assert data["count"] == 4
+    assert data["sum"] == pytest.approx(7.5)
+    assert data["buckets"] == {"1.0": 1, "2.0": 3, "5.0": 4}
+    assert 1.0 <= data["p50"] <= 2.0
+    assert data["p99"] <= 4.0
+
+
+def test_prometheus_format():
+    registry = MetricsRegistry()
+    registry.inc("kura_llm_requests_total", model='gpt "4"', outcome="success")
+    registry.set_gauge("kura_queue_depth", 3, queue="summaries")
+    registry.observe("kura_stage_seconds", 0.2, stage="summarise")
+
+    text = registry.to_prometheus()
+    assert "# TYPE kura_llm_requests_total counter" in text
+    assert 'kura_llm_requests_total{model="gpt \\"4\\"",outcome="success"} 1' in text
+    assert 'kura_queue_depth{queue="summaries"} 3' in text
+    assert 'kura_stage_seconds_bucket{stage="summarise",le="0.25"} 1' in text
+    assert 'kura_stage_seconds_bucket{stage="summarise",le="+Inf"} 1' in text
+    assert 'kura_stage_seconds_count{stage="summarise"} 1' in text
+
+
+def test_collectors_are_scoped():
+    with collect_metrics() as outer:
+        inc("kura_test_total")
+        with collect_metrics() as inner:
+            inc("kura_test_total")
+    inc("kura_test_total")
+
+    assert outer.counters["kura_test_total"][()] == 2
+    assert inner.counters["kura_test_total"][()] == 1
+
+
+class FakeCompletions:
+    def __init__(self, hooks):
+        self.hooks = hooks
+
+    async def create(self, **kwargs):
+        # Two attempts, as instructor makes when the first response fails to parse
+        for _ in range(2):
+            for handler in self.hooks.get("completion:kwargs", []):
+                handler(**kwargs)
+            usage = SimpleNamespace(prompt_tokens=10, completion_tokens=4)
+            for handler in self.hooks.get("completion:response", []):
+                handler(SimpleNamespace(usage=usage))
+        if kwargs.get("fail"):
+            raise RuntimeError("boom")
+        return "ok"
+
+
+class FakeInstructorClient:
+    def __init__(self):
+        self.hooks = {}
+        self.chat = SimpleNamespace(completions=FakeCompletions(self.hooks))
+
+    def on(self, name, handler):
+        self.hooks.setdefault(name, []).append(handler)
+
+
+@pytest.mark.asyncio
+async def test_instrumented_client_records_calls():
+    client = InstrumentedClient(
+        FakeInstructorClient(), model="test-model", operation="summarise"
+    )
+
+    with collect_metrics() as registry:
+        assert await client.chat.completions.create(messages=[]) == "ok"
+        with pytest.raises(RuntimeError):
+            await client.chat.completions.create(messages=[], fail=True)
+
+    snapshot = registry.snapshot()
+    labels = {"model": "test-model", "operation": "summarise"}
+    latency = _series(snapshot, "histograms", "kura_llm_request_seconds", **labels)
+    assert latency[0]["count"] == 2
+    outcomes = {
+        s["labels"]["outcome"]: s["value"]
+        for s in _series(snapshot, "counters", "kura_llm_requests_total", **labels)
+    }
+    assert outcomes == {"success": 1, "error": 1}
+    assert _series(snapshot, "counters", "kura_llm_retries_total")[0]["value"] == 2
+    tokens = {
+        s["labels"]["direction"]: s["value"]
+        for s in _series(snapshot, "counters", "kura_llm_tokens_total", **labels)
+    }
+    assert tokens == {"input": 40, "output": 16}
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_is_observed():
+    with collect_metrics() as registry:
+        async with monitor_event_loop_lag(interval=0.01):
+            await asyncio.sleep(0.02)
+            time.sleep(0.05)  # blocks the loop
+            await asyncio.sleep(0.02)
+
+    lag = registry.histograms["kura_event_loop_lag_seconds"][()]
+    assert lag.max >= 0.03
+
+
+def test_metrics_server_serves_prometheus_text():
+    registry = MetricsRegistry()
+    registry.inc("kura_test_total", 5)
+    server = start_metrics_server(port=0, registry=registry)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+            assert "kura_test_total 5" in resp.read().decode()
+    finally:
+        server.shutdown()
+
+
+class EchoSummaryModel(BaseSummaryModel):
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(self, conversations):
+        return [
+            ConversationSummary(chat_id=c.chat_id, summary="s", metadata={})
+            for c in conversations
+        ]
+
+    async def summarise_conversation(self, conversation):  # pragma: no cover
+        raise NotImplementedError
+
+    async def apply_hooks(self, conversation):  # pragma: no cover
+        return {}
+
+
+class OneClusterModel(BaseClusterModel):
+    @property
+    def checkpoint_filename(self) -> str:
+        return "clusters.jsonl"
+
+    async def cluster_summaries(
+        self,
+        summaries,
+        *,
+        processed_keys=None,
+        batch_size=100,
+        sleep_seconds=0.0,
+        on_batch_complete=None,
+    ):
+        return [
+            Cluster(
+                id="all",
+                name="All",
+                description="d",
+                slug="all",
+                chat_ids=[s.chat_id for s in summaries],
+                parent_id=None,
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_writes_a_metrics_report(tmp_path):
+    conversations = [
+        Conversation(
+            chat_id=str(i),
+            created_at=datetime(2024, 1, 1),
+            messages=[
+                Message(created_at=datetime(2024, 1, 1), role="user", content="hi")
+            ],
+            metadata={},
+        )
+        for i in range(3)
+    ]
+
+    @timed_stage("custom")
+    async def noop():
+        return None
+
+    await noop()
+    await run_pipeline(
+        conversations,
+        summary_model=EchoSummaryModel(),
+        cluster_model=OneClusterModel(),
+        checkpoint_manager=CheckpointManager(str(tmp_path)),
+    )
+
+    with open(tmp_path / "metrics.json") as f:
+        report = json.load(f)
+    stages = {s["labels"]["stage"] for s in report["histograms"]["kura_stage_seconds"]}
+    # Only the stages of this run are in its report
+    assert stages == {"pipeline", "summarise", "cluster"}
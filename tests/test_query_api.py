@@ -0,0 +1,124 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+
+from kura.cli.api import CheckpointIndex, router
+from kura.types import Cluster, Conversation, ConversationSummary, Message
+from kura.v1.kura import CheckpointManager
+
+
+def _cluster(id: str, chat_ids: list[str], parent_id=None) -> Cluster:
+    return Cluster(
+        id=id,
+        name=f"Cluster {id}",
+        description="d",
+        slug=id,
+        chat_ids=chat_ids,
+        parent_id=parent_id,
+    )
+
+
+@pytest.fixture
+def client(tmp_path):
+    chat_ids = [f"chat-{i}" for i in range(120)]
+    manager = CheckpointManager(str(tmp_path))
+    manager.save_checkpoint(
+        "meta_clusters.jsonl",
+        [
+            _cluster("root", chat_ids),
+            _cluster("left", chat_ids[:100], "root"),
+            _cluster("right", chat_ids[100:], "root"),
+        ],
+    )
+    manager.save_checkpoint(
+        "summaries.jsonl",
+        [
+            ConversationSummary(
+                chat_id=chat_id,
+                summary=f"summary {chat_id}",
+                metadata={},
+                embedding=[0.1],
+            )
+            for chat_id in chat_ids
+        ],
+    )
+    Conversation.generate_conversation_dump(
+        [
+            Conversation(
+                chat_id="chat-0",
+                created_at=datetime(2024, 1, 1),
+                messages=[
+                    Message(
+                        created_at=datetime(2024, 1, 1), role="user", content="hello"
+                    )
+                ],
+                metadata={},
+            )
+        ],
+        str(tmp_path / "conversations.json"),
+    )
+
+    app = FastAPI()
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    app.include_router(router)
+    app.state.index = CheckpointIndex(str(tmp_path))
+    return TestClient(app)
+
+
+def test_lists_root_clusters_without_chat_ids(client):
+    body = client.get("/api/clusters").json()
+
+    assert body["total"] == 1
+    root = body["items"][0]
+    assert root["id"] == "root"
+    assert root["count"] == 120
+    assert root["child_count"] == 2 and root["subtree_size"] == 3
+    assert "chat_ids" not in root
+
+
+def test_children_and_unknown_cluster(client):
+    children = client.get("/api/clusters/root/children").json()["items"]
+
+    assert [c["id"] for c in children] == ["left", "right"]
+    assert client.get("/api/clusters/missing/children").status_code == 404
+
+
+def test_cluster_conversations_are_paginated(client):
+    body = client.get("/api/clusters/left/conversations?page=2&page_size=30").json()
+
+    assert body["total"] == 100
+    assert [s["chat_id"] for s in body["items"]] == [f"chat-{i}" for i in range(30, 60)]
+    assert "embedding" not in body["items"][0]
+    assert client.get("/api/clusters/left/conversations?page=0").status_code == 422
+
+
+def test_summary_and_conversation_lookup(client):
+    assert client.get("/api/summaries/chat-7").json()["summary"] == "summary chat-7"
+    assert client.get("/api/summaries/nope").status_code == 404
+    conversation = client.get("/api/conversations/chat-0").json()
+    assert conversation["messages"][0]["content"] == "hello"
+
+
+def test_etag_and_gzip(client):
+    response = client.get(
+        "/api/clusters/root/conversations?page_size=100",
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+
+    cached = client.get(
+        "/api/clusters/root/conversations?page_size=100",
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+
+
+def test_missing_index_is_unavailable():
+    app = FastAPI()
+    app.include_router(router)
+
+    assert TestClient(app).get("/api/clusters").status_code == 503
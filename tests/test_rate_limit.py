@@ -0,0 +1,155 @@
+import types
+
+import httpx
+import pytest
+
+import kura.utils.rate_limit as rate_limit
+from kura.embedding import OpenAIEmbeddingModel
+from kura.utils.openai_utils import create_http_client
+from kura.utils.rate_limit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0, slept=[])
+    monkeypatch.setattr(
+        rate_limit, "time", types.SimpleNamespace(monotonic=lambda: clock.now)
+    )
+
+    async def fake_sleep(seconds):
+        clock.slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    return clock
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_budget(clock):
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter.requests.available = 1
+
+    await limiter.acquire()
+    assert clock.slept == []
+
+    await limiter.acquire()
+    assert clock.slept == [pytest.approx(1.0)]
+
+
+@pytest.mark.asyncio
+async def test_tokens_per_minute_budget(clock):
+    limiter = RateLimiter(tokens_per_minute=600, completion_tokens_estimate=0)
+
+    await limiter.acquire(600)
+    await limiter.acquire(100)
+
+    # 600 tokens per minute refills 10 tokens per second
+    assert sum(clock.slept) == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_headers_set_and_tighten_budget(clock):
+    limiter = RateLimiter()
+
+    await limiter.on_response(
+        FakeResponse(
+            200,
+            {
+                "x-ratelimit-limit-requests": "500",
+                "x-ratelimit-remaining-requests": "0",
+            },
+        )
+    )
+
+    assert limiter.requests.capacity == 500
+    await limiter.acquire()
+    assert sum(clock.slept) == pytest.approx(60 / 500)
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_requests(clock):
+    limiter = RateLimiter(initial_backoff_seconds=2)
+
+    await limiter.on_response(FakeResponse(429, {}))
+    await limiter.acquire()
+    await limiter.on_response(FakeResponse(429, {"retry-after": "1m0s"}))
+    await limiter.acquire()
+
+    assert clock.slept == [pytest.approx(2.0), pytest.approx(60.0)]
+    assert limiter.rate_limited_count == 2
+
+
+@pytest.mark.asyncio
+async def test_wrapped_client_estimates_prompt_tokens(clock):
+    limiter = RateLimiter(completion_tokens_estimate=0)
+    acquired = []
+
+    async def fake_acquire(tokens=0):
+        acquired.append(tokens)
+
+    limiter.acquire = fake_acquire
+
+    class Completions:
+        async def create(self, **kwargs):
+            return "ok"
+
+    client = types.SimpleNamespace(
+        chat=types.SimpleNamespace(completions=Completions())
+    )
+    assert limiter.wrap_client(client, "openai/gpt-4o") is client
+    wrapped = limiter.wrap_client(client, "anthropic/claude-3-5-haiku")
+
+    result = await wrapped.chat.completions.create(
+        messages=[{"role": "user", "content": "x" * 400}], context={"a": "y" * 40}
+    )
+
+    assert result == "ok"
+    assert acquired == [110]
+
+
+@pytest.mark.asyncio
+async def test_every_http_request_takes_budget(clock):
+    limiter = RateLimiter(completion_tokens_estimate=50)
+    acquired = []
+
+    async def fake_acquire(tokens=0, *, completion_tokens=None):
+        acquired.append((tokens, completion_tokens))
+
+    limiter.acquire = fake_acquire
+    assert create_http_client(rate_limiter=limiter).event_hooks["request"] == [
+        limiter.on_request
+    ]
+    http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+        event_hooks={"request": [limiter.on_request]},
+    )
+
+    # A retried completion sends the same request twice
+    for _ in range(2):
+        await http_client.post("https://api.test/v1/chat/completions", content="x" * 40)
+    await http_client.post("https://api.test/v1/embeddings", content="y" * 80)
+
+    assert acquired == [(10, None), (10, None), (20, 0)]
+
+
+def test_embedding_model_uses_the_limiter(monkeypatch):
+    import kura.embedding as embedding
+
+    limiters = []
+
+    def fake_http_client(**kwargs):
+        limiters.append(kwargs["rate_limiter"])
+        return None
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(embedding, "create_http_client", fake_http_client)
+    limiter = RateLimiter()
+
+    assert OpenAIEmbeddingModel(rate_limiter=limiter).client is not None
+    assert limiters == [limiter]
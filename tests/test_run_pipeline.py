@@ -0,0 +1,188 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from kura.base_classes import BaseClusterModel, BaseEmbeddingModel, BaseSummaryModel
+from kura.dedup import ConversationDeduplicator
+from kura.types import Cluster, Conversation, ConversationSummary, Message
+from kura.v1.kura import CheckpointManager, run_pipeline
+
+
+def _conversations(n: int) -> list[Conversation]:
+    return [
+        Conversation(
+            chat_id=str(i),
+            created_at=datetime(2024, 1, 1),
+            messages=[
+                Message(created_at=datetime(2024, 1, 1), role="user", content="hi")
+            ],
+            metadata={},
+        )
+        for i in range(n)
+    ]
+
+
+class SlowSummaryModel(BaseSummaryModel):
+    def __init__(self, events: list[str]):
+        self.events = events
+        self.errors = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(self, conversations):
+        await asyncio.sleep(0.01)
+        self.events.append(f"summarised {conversations[-1].chat_id}")
+        return [
+            ConversationSummary(chat_id=c.chat_id, summary=f"s{c.chat_id}", metadata={})
+            for c in conversations
+        ]
+
+    async def summarise_conversation(self, conversation):  # pragma: no cover
+        raise NotImplementedError
+
+    async def apply_hooks(self, conversation):  # pragma: no cover
+        return {}
+
+
+class RecordingEmbeddingModel(BaseEmbeddingModel):
+    def __init__(self, events: list[str]):
+        self.events = events
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.events.append(f"embedded {len(texts)}")
+        return [[float(len(text))] for text in texts]
+
+    def slug(self) -> str:
+        return "recording"
+
+
+class PrecomputedClusterModel(BaseClusterModel):
+    def __init__(self, embedding_model=None):
+        self.embedding_model = embedding_model
+        self.received_embeddings = None
+        self.received_summaries = None
+        self.errors = []
+
+    @property
+    def checkpoint_filename(self) -> str:
+        return "clusters.jsonl"
+
+    async def cluster_summaries(
+        self,
+        summaries,
+        *,
+        processed_keys=None,
+        batch_size=100,
+        sleep_seconds=0.0,
+        on_batch_complete=None,
+        embeddings=None,
+    ):
+        self.received_embeddings = embeddings
+        self.received_summaries = summaries
+        return [
+            Cluster(
+                name="all",
+                description="d",
+                slug="all",
+                chat_ids=[s.chat_id for s in summaries],
+                parent_id=None,
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_embedding_overlaps_summarisation():
+    events: list[str] = []
+    cluster_model = PrecomputedClusterModel(RecordingEmbeddingModel(events))
+
+    result = await run_pipeline(
+        _conversations(6),
+        summary_model=SlowSummaryModel(events),
+        cluster_model=cluster_model,
+        batch_size=2,
+    )
+
+    assert events.index("embedded 2") < events.index("summarised 5")
+    assert events.count("embedded 2") == 3
+    assert [s.chat_id for s in result.summaries] == [str(i) for i in range(6)]
+    assert len(cluster_model.received_embeddings) == 6
+    assert result.clusters[0].chat_ids == [str(i) for i in range(6)]
+    assert result.meta_clusters is None and result.projected_clusters is None
+
+
+@pytest.mark.asyncio
+async def test_models_without_embedding_stage_get_all_summaries():
+    cluster_model = PrecomputedClusterModel()
+
+    result = await run_pipeline(
+        _conversations(3),
+        summary_model=SlowSummaryModel([]),
+        cluster_model=cluster_model,
+        batch_size=2,
+    )
+
+    assert cluster_model.received_embeddings is None
+    assert result.clusters[0].chat_ids == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_cached_summaries_are_embedded(tmp_path):
+    manager = CheckpointManager(str(tmp_path))
+    await run_pipeline(
+        _conversations(2),
+        summary_model=SlowSummaryModel([]),
+        cluster_model=PrecomputedClusterModel(),
+        checkpoint_manager=manager,
+    )
+    (tmp_path / "clusters.jsonl").unlink()
+
+    events: list[str] = []
+    cluster_model = PrecomputedClusterModel(RecordingEmbeddingModel(events))
+    await run_pipeline(
+        _conversations(3),
+        summary_model=SlowSummaryModel(events),
+        cluster_model=cluster_model,
+        checkpoint_manager=manager,
+    )
+
+    assert events == ["embedded 2", "summarised 2", "embedded 1"]
+    assert len(cluster_model.received_embeddings) == 3
+
+
+@pytest.mark.asyncio
+async def test_embedding_failure_stops_the_pipeline():
+    class FailingEmbeddingModel(RecordingEmbeddingModel):
+        async def embed(self, texts):
+            raise RuntimeError("embedding down")
+
+    with pytest.raises(RuntimeError, match="embedding down"):
+        await run_pipeline(
+            _conversations(10),
+            summary_model=SlowSummaryModel([]),
+            cluster_model=PrecomputedClusterModel(FailingEmbeddingModel([])),
+            batch_size=1,
+            queue_size=1,
+        )
+
+
+@pytest.mark.asyncio
+async def test_clustered_summaries_carry_duplicate_group_sizes():
+    events: list[str] = []
+    cluster_model = PrecomputedClusterModel(RecordingEmbeddingModel(events))
+
+    result = await run_pipeline(
+        _conversations(4),
+        summary_model=SlowSummaryModel(events),
+        cluster_model=cluster_model,
+        batch_size=2,
+        deduplicator=ConversationDeduplicator(),
+    )
+
+    # The first batch was embedded before the later duplicates were seen
+    clustered = cluster_model.received_summaries
+    assert [s.chat_id for s in clustered] == ["0", "1", "2", "3"]
+    assert [s.metadata["duplicate_group_size"] for s in clustered] == [4] * 4
+    assert clustered == result.summaries
@@ -0,0 +1,211 @@
+import threading
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from kura.base_classes import BaseClusterModel, BaseSummaryModel
+from kura.cli.api import SQLiteIndex, load_index, router
+from kura.sqlite_store import SQLiteStore
+from kura.types import Cluster, Conversation, ConversationSummary, Message
+from kura.v1.kura import run_pipeline
+from kura.v1.visualization import visualise_clusters
+
+
+def _conversation(chat_id: str, **metadata) -> Conversation:
+    return Conversation(
+        chat_id=chat_id,
+        created_at=datetime(2024, 1, 1),
+        messages=[
+            Message(
+                created_at=datetime(2024, 1, 1), role="user", content=f"hi {chat_id}"
+            ),
+            Message(created_at=datetime(2024, 1, 2), role="assistant", content="hello"),
+        ],
+        metadata=metadata,
+    )
+
+
+def _summary(chat_id: str, **metadata) -> ConversationSummary:
+    return ConversationSummary(
+        chat_id=chat_id,
+        summary=f"summary {chat_id}",
+        metadata=metadata,
+        embedding=[1.0],
+    )
+
+
+def _cluster(id: str, chat_ids: list[str], parent_id=None) -> Cluster:
+    return Cluster(
+        id=id,
+        name=f"Cluster {id}",
+        description="d",
+        slug=id,
+        chat_ids=chat_ids,
+        parent_id=parent_id,
+    )
+
+
+@pytest.fixture
+def store(tmp_path) -> SQLiteStore:
+    store = SQLiteStore(str(tmp_path / "kura.db"))
+    store.add_conversations(
+        [
+            _conversation("a", language=["python", "sql"], source="web"),
+            _conversation("b", language="python"),
+            _conversation("c", priority=1),
+        ]
+    )
+    store.add_summaries([_summary("a"), _summary("b", priority="1")])
+    store.set_clusters(
+        [
+            _cluster("root", ["a", "b", "c"]),
+            _cluster("left", ["a", "b"], "root"),
+            _cluster("right", ["c"], "root"),
+        ]
+    )
+    return store
+
+
+def test_round_trips_conversations_and_summaries(store):
+    conversation = store.conversation("a")
+
+    assert [m.content for m in conversation.messages] == ["hi a", "hello"]
+    assert conversation.metadata == {"language": ["python", "sql"], "source": "web"}
+    assert store.summary("b").summary == "summary b"
+    assert store.summary("b").embedding is None
+    assert store.conversation("missing") is None
+    assert [s.chat_id for s in store.summaries(["b", "missing", "a"])] == ["b", "a"]
+
+
+def test_replaces_existing_rows(store):
+    store.add_conversations([_conversation("a", source="api")])
+
+    assert store.conversation("a").metadata == {"source": "api"}
+    assert len(store.conversation("a").messages) == 2
+    assert store.chat_ids_where("language", "python") == ["b"]
+
+
+def test_metadata_lookups(store):
+    assert sorted(store.chat_ids_where("language", "python")) == ["a", "b"]
+    assert store.chat_ids_where("language", "sql") == ["a"]
+    # Values are matched with their type
+    assert store.chat_ids_where("priority", 1) == ["c"]
+    assert store.chat_ids_where("priority", "1") == ["b"]
+    assert store.chat_ids_where("priority", 1, source="summary") == []
+
+
+def test_cluster_lookups(store):
+    assert [c.id for c in store.clusters()] == ["root"]
+    assert [c.id for c in store.clusters("root", offset=1)] == ["right"]
+    assert store.count_clusters("root") == 2
+    assert store.cluster("root").subtree_size == 3
+    assert store.cluster_chat_ids("left", limit=1) == ["a"]
+    assert sorted(store.clusters_for_chat("a")) == ["left", "root"]
+
+
+def test_cluster_tree_has_counts_without_chat_ids(store, capsys):
+    tree = store.cluster_tree()
+    assert tree.counts == [3, 2, 1]
+    assert all(not c.chat_ids for c in tree.clusters)
+
+    visualise_clusters(store=store)
+    assert "╠══ Cluster left (2 conversations)" in capsys.readouterr().out
+
+
+def test_server_queries_the_store(store, tmp_path):
+    app = FastAPI()
+    app.include_router(router)
+    app.state.index = load_index(str(tmp_path))
+    assert isinstance(app.state.index, SQLiteIndex)
+    client = TestClient(app)
+
+    children = client.get("/api/clusters/root/children?page_size=1").json()
+    assert children["total"] == 2
+    assert [c["id"] for c in children["items"]] == ["left"]
+
+    conversations = client.get("/api/clusters/root/conversations").json()
+    assert [s["chat_id"] for s in conversations["items"]] == ["a", "b", "c"]
+    assert "summary" not in conversations["items"][2]
+
+    assert client.get("/api/conversations/c").json()["metadata"] == {"priority": 1}
+    assert client.get("/api/clusters/nope").status_code == 404
+
+
+class EchoSummaryModel(BaseSummaryModel):
+    @property
+    def checkpoint_filename(self) -> str:
+        return "summaries.jsonl"
+
+    async def summarise(self, conversations):
+        return [_summary(c.chat_id) for c in conversations]
+
+    async def summarise_conversation(self, conversation):  # pragma: no cover
+        raise NotImplementedError
+
+    async def apply_hooks(self, conversation):  # pragma: no cover
+        return {}
+
+
+class OneClusterModel(BaseClusterModel):
+    @property
+    def checkpoint_filename(self) -> str:
+        return "clusters.jsonl"
+
+    async def cluster_summaries(
+        self,
+        summaries,
+        *,
+        processed_keys=None,
+        batch_size=100,
+        sleep_seconds=0.0,
+        on_batch_complete=None,
+    ):
+        return [_cluster("all", [s.chat_id for s in summaries])]
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_fills_the_store(tmp_path):
+    store = SQLiteStore(str(tmp_path / "kura.db"))
+
+    async def conversations():
+        for i in range(5):
+            yield _conversation(str(i))
+
+    await run_pipeline(
+        conversations(),
+        summary_model=EchoSummaryModel(),
+        cluster_model=OneClusterModel(),
+        batch_size=2,
+        sqlite_store=store,
+    )
+
+    assert store.conversation("4") is not None
+    assert store.summary("0").summary == "summary 0"
+    assert store.cluster_chat_ids("all") == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_writes_to_the_store_off_the_event_loop(tmp_path):
+    store = SQLiteStore(str(tmp_path / "kura.db"))
+    loop_thread = threading.get_ident()
+    writer_threads = set()
+    add_conversations = store.add_conversations
+
+    def record_thread(conversations):
+        writer_threads.add(threading.get_ident())
+        add_conversations(conversations)
+
+    store.add_conversations = record_thread
+
+    await run_pipeline(
+        [_conversation(str(i)) for i in range(5)],
+        summary_model=EchoSummaryModel(),
+        cluster_model=OneClusterModel(),
+        batch_size=2,
+        sqlite_store=store,
+    )
+
+    assert store.conversation("4") is not None
+    assert writer_threads and loop_thread not in writer_threads
@@ -0,0 +1,108 @@
+import asyncio
+import importlib.util
+import threading
+from datetime import datetime
+
+import pytest
+
+import kura.summarisation as summarisation
+from kura.summarisation import SummaryModel
+from kura.types import Conversation, Message
+from kura.types.summarisation import GeneratedSummary
+
+
+class FakeCompletions:
+    async def create(self, **kwargs):
+        return GeneratedSummary(summary="ok")
+
+
+class FakeClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": FakeCompletions()})()
+
+
+class FakeHttpClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def created(monkeypatch):
+    created = {"clients": [], "http_clients": []}
+
+    def fake_http_client(**kwargs):
+        http_client = FakeHttpClient()
+        created["http_clients"].append(http_client)
+        return http_client
+
+    def fake_instructor_client(model, **kwargs):
+        client = FakeClient()
+        created["clients"].append(client)
+        return client
+
+    monkeypatch.setattr(summarisation, "create_http_client", fake_http_client)
+    monkeypatch.setattr(
+        summarisation, "create_instructor_client", fake_instructor_client
+    )
+    return created
+
+
+def _conversations(n: int) -> list[Conversation]:
+    return [
+        Conversation(
+            chat_id=str(i),
+            created_at=datetime.now(),
+            messages=[Message(created_at=datetime.now(), role="user", content="hi")],
+            metadata={},
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_summary_model_reuses_one_client(created):
+    async with SummaryModel() as model:
+        summaries = await model.summarise(_conversations(5))
+
+    assert len(summaries) == 5
+    assert len(created["clients"]) == 1
+    assert created["http_clients"][0].closed
+
+
+def test_summary_model_rebinds_client_to_new_loop(created):
+    model = SummaryModel()
+
+    asyncio.run(model.summarise(_conversations(2)))
+    asyncio.run(model.summarise(_conversations(2)))
+
+    assert len(created["clients"]) == 2
+
+
+def test_summary_model_closes_pool_of_a_running_loop(created):
+    model = SummaryModel()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        asyncio.run_coroutine_threadsafe(
+            model.summarise(_conversations(1)), other_loop
+        ).result()
+        asyncio.run(model.summarise(_conversations(1)))
+
+        # The first pool is closed on its own loop, which is still running
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop).result()
+        assert created["http_clients"][0].closed
+        assert not created["http_clients"][1].closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+
+def test_http2_requires_h2(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    with pytest.raises(ImportError, match="h2"):
+        SummaryModel(http2=True)